@@ -0,0 +1,266 @@
+"""Asyncio based transport for CephNode.
+
+CephNode executes every command on a paramiko channel and relies on a thread
+per concurrent operation (see ceph.parallel). AsyncCephNode wraps an existing
+CephNode and executes commands over asyncssh instead, so thousands of remote
+operations can be in flight from a single thread.
+
+The blocking `exec_command` keeps the CephNode contract and the `await`able
+`aexec_command` and `aexec_commands` variants are meant for the scale tests::
+
+    nodes = [AsyncCephNode(node) for node in cluster.get_nodes()]
+    results = run_coroutine(
+        gather_bounded(
+            [n.aexec_command(cmd="ceph -s", sudo=True) for n in nodes],
+            limit=256,
+        )
+    )
+
+The backend is optional, asyncssh has to be installed to make use of it.
+"""
+
+import asyncio
+import threading
+import time
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover
+    asyncssh = None
+
+from ceph.ceph import MAX_PIPELINED_CHANNELS, CephNode, CommandFailed
+from utility.log import Log
+
+log = Log(__name__)
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """Returns the event loop shared by the blocking API, starting it if required."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="cephci-asyncio", daemon=True
+            ).start()
+
+    return _loop
+
+
+def run_coroutine(coro, timeout=None):
+    """Execute the coroutine on the shared event loop and wait for its result.
+
+    Args:
+        coro (coroutine): coroutine to be executed
+        timeout (int): maximum time to wait for the result
+
+    Returns:
+        the result of the coroutine
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result(timeout)
+
+
+async def gather_bounded(coros, limit=128, return_exceptions=False):
+    """Await the coroutines with at most `limit` of them running at once.
+
+    Args:
+        coros (list): coroutines to be awaited
+        limit (int): maximum number of coroutines in flight
+        return_exceptions (bool): return the exceptions instead of raising them
+
+    Returns:
+        list of results in the order of the coroutines
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(
+        *[_bounded(coro) for coro in coros], return_exceptions=return_exceptions
+    )
+
+
+class AsyncCephNode:
+    """asyncssh backed command execution for a CephNode.
+
+    Attributes not related to command execution (hostname, role, volumes...)
+    are looked up on the wrapped node, so the object can be passed wherever a
+    CephNode is used to execute commands.
+    """
+
+    def __init__(self, node, max_sessions=MAX_PIPELINED_CHANNELS, known_hosts=None):
+        """Initialize the async node.
+
+        Args:
+            node (CephNode): node providing the address and credentials
+            max_sessions (int): concurrent sessions per SSH connection, bound by
+                MaxSessions of the remote sshd
+            known_hosts: asyncssh known_hosts, host keys are not verified by
+                default like the paramiko based connections
+        """
+        if asyncssh is None:
+            raise ImportError("asyncssh is required to use AsyncCephNode")
+
+        self.node = node
+        self.max_sessions = max_sessions
+        self.known_hosts = known_hosts
+        # Connections and semaphores are bound to the loop they were created in
+        self._connections = dict()
+        self._semaphores = dict()
+        self._locks = dict()
+
+    def __getattr__(self, item):
+        if item == "node":
+            raise AttributeError(item)
+
+        return getattr(self.node, item)
+
+    def _credentials(self, sudo):
+        node = self.node
+        if sudo:
+            username, password = node.root_username, node.root_passwd
+        else:
+            username, password = node.username, node.password
+
+        kw = {
+            "host": node.ip_address,
+            "username": username,
+            "known_hosts": self.known_hosts,
+        }
+        if node.private_key_path:
+            kw["client_keys"] = [node.private_key_path]
+            kw["passphrase"] = node.private_key_password
+        else:
+            kw["password"] = password
+            if not node.look_for_key:
+                kw["client_keys"] = None
+
+        return kw
+
+    async def connect(self, sudo=False):
+        """Returns the SSH connection of the user, establishing it if required."""
+        key = (asyncio.get_running_loop(), bool(sudo))
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            conn = self._connections.get(key)
+            if conn is None or conn.is_closed():
+                log.debug(f"Opening async SSH connection to {self.node.ip_address}")
+                conn = await asyncssh.connect(
+                    keepalive_interval=15, **self._credentials(sudo)
+                )
+                self._connections[key] = conn
+                self._semaphores[key] = asyncio.Semaphore(self.max_sessions)
+
+        return conn, self._semaphores[key]
+
+    async def _run(self, cmd, sudo=False, timeout=None):
+        conn, semaphore = await self.connect(sudo=sudo)
+        async with semaphore:
+            log.info(
+                "Execute %s on %s [%s]", cmd, self.node.hostname, self.node.ip_address
+            )
+            _start = time.time()
+            try:
+                result = await asyncio.wait_for(
+                    conn.run(cmd, check=False), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                log.error("%s failed to execute within %ds.", cmd, timeout)
+                raise CommandFailed(f"{cmd} failed to execute within {timeout}s")
+
+            _time = time.time() - _start
+            log.info(
+                "Execution of %s took %s seconds on %s [%s]",
+                cmd,
+                str(_time),
+                self.node.hostname,
+                self.node.ip_address,
+            )
+
+        # Commands terminated by a signal do not report an exit status
+        _exit = result.exit_status if result.exit_status is not None else -1
+        return result.stdout or "", result.stderr or "", _exit, _time
+
+    def _raise_failed(self, cmd, _err, _exit):
+        raise CommandFailed(
+            f"{cmd} returned {_err} and code {_exit} on "
+            f"{self.node.hostname} [{self.node.ip_address}]"
+        )
+
+    async def aexec_command(self, **kw):
+        """Execute the given command on the remote host.
+
+        Same arguments, return values and exceptions as CephNode.exec_command.
+        """
+        cmd = kw["cmd"]
+        _out, _err, _exit, _time = await self._run(
+            cmd,
+            sudo=kw.get("sudo", False),
+            timeout=CephNode._get_command_timeout(**kw),
+        )
+
+        if kw.get("verbose", False):
+            return _out, _err, _exit, _time
+
+        if kw.get("long_running", False):
+            if kw.get("check_ec", False) and _exit != 0:
+                self._raise_failed(cmd, _err, _exit)
+
+            return _exit
+
+        if kw.get("check_ec", True) and _exit != 0:
+            self._raise_failed(cmd, _err, _exit)
+
+        return _out, _err
+
+    async def aexec_commands(self, cmds, **kw):
+        """Execute independent commands concurrently over a single connection.
+
+        Same arguments, return values and exceptions as CephNode.exec_commands.
+        """
+        timeout = CephNode._get_command_timeout(**kw)
+        sudo = kw.get("sudo", False)
+        results = await gather_bounded(
+            [self._run(cmd, sudo=sudo, timeout=timeout) for cmd in cmds],
+            limit=kw.get("max_channels", self.max_sessions),
+        )
+
+        if kw.get("check_ec", True):
+            for cmd, (_, _err, _exit, _) in zip(cmds, results):
+                if _exit != 0:
+                    self._raise_failed(cmd, _err, _exit)
+
+        return results
+
+    def exec_command(self, **kw):
+        """Blocking variant of aexec_command executed on the shared loop."""
+        return run_coroutine(self.aexec_command(**kw))
+
+    def exec_commands(self, cmds, **kw):
+        """Blocking variant of aexec_commands executed on the shared loop."""
+        return run_coroutine(self.aexec_commands(cmds, **kw))
+
+    async def aclose(self):
+        """Close the connections opened within the running loop."""
+        loop = asyncio.get_running_loop()
+        for key in [k for k in self._connections if k[0] is loop]:
+            conn = self._connections.pop(key)
+            conn.close()
+            await conn.wait_closed()
+
+    def close(self):
+        """Close the connections opened by the blocking API."""
+        if _loop is not None and not _loop.is_closed():
+            run_coroutine(self.aclose())
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        d["_connections"] = dict()
+        d["_semaphores"] = dict()
+        d["_locks"] = dict()
+        return d
@@ -8,8 +8,12 @@ import os
 import pickle
 import random
 import re
+import select
 import socket
 import subprocess
+import tempfile
+import threading
+from collections import deque
 from time import sleep, time
 
 import cryptography
@@ -19,6 +23,7 @@ import yaml
 from looseversion import LooseVersion
 
 from ceph.parallel import parallel
+from ceph.waiter import WaitUntil
 from cli.ceph.ceph import Ceph as CephCli
 from utility import lvm_utils
 from utility.log import Log
@@ -26,6 +31,38 @@ from utility.utils import custom_ceph_config
 
 logger = Log(__name__)
 
+# Upper bound on how long a command loop blocks before re-checking the clock.
+CHANNEL_POLL_INTERVAL = 1.0
+
+# Once EOF is received the channel stays readable, poll faster for its status.
+CHANNEL_EOF_POLL_INTERVAL = 0.05
+
+# Kernel TCP keepalive configuration applied when connecting to a node.
+NODE_TCP_KEEPALIVE = {
+    "tcp_keepalive_time": 120,
+    "tcp_keepalive_intvl": 60,
+    "tcp_keepalive_probes": 20,
+}
+
+# Prefix of the node details reported by the connect setup script.
+NODE_INFO_PREFIX = "__cephci_node_info_"
+
+# Pre-opened sessions held by every connection. sshd defaults to MaxSessions 10
+# which is shared between idle pooled channels and running commands, hence a
+# single one by default. Set CEPHCI_SSH_CHANNEL_POOL_SIZE to 0 to disable it.
+CHANNEL_POOL_SIZE = int(os.environ.get("CEPHCI_SSH_CHANNEL_POOL_SIZE", 1))
+MAX_PIPELINED_CHANNELS = 8
+
+# Channel reads start small and grow while the stream keeps them full.
+READ_CHUNK_SIZE = 32 * 1024
+MAX_READ_CHUNK_SIZE = 1024 * 1024
+
+# Command output held in memory before spilling to a temporary file.
+OUTPUT_SPILL_SIZE = 64 * 1024 * 1024
+
+# Command output logged per stream, the remaining output is not logged.
+OUTPUT_LOG_LIMIT = 1024 * 1024
+
 
 class SocketTimeoutException(Exception):
     pass
@@ -1183,6 +1220,96 @@ def check_timeout(end_time, timeout):
         raise TimeoutException("Command exceed the allocated execution time.")
 
 
+class OutputBuffer(object):
+    """Command output accumulated in memory and spilled to disk when large.
+
+    Data is appended as bytes and decoded only when the output is consumed,
+    either as a whole using getvalue or line by line using lines.
+    """
+
+    def __init__(self, spill_size=OUTPUT_SPILL_SIZE):
+        """
+        Args:
+          spill_size: bytes held in memory before moving to a temporary file.
+        """
+        self._file = tempfile.SpooledTemporaryFile(max_size=spill_size, mode="w+b")
+        self.size = 0
+
+    @property
+    def spilled(self):
+        return self._file._rolled
+
+    def write(self, data):
+        self._file.write(data)
+        self.size += len(data)
+
+    def getvalue(self):
+        """Returns the whole output as a string."""
+        self._file.seek(0)
+        return self._file.read().decode("utf-8", errors="replace")
+
+    def lines(self):
+        """Yields the lines of the output without loading it at once."""
+        self._file.seek(0)
+        _reader = codecs.getreader("utf-8")(self._file, errors="replace")
+        for _line in _reader:
+            yield _line.rstrip("\n")
+
+    def close(self):
+        self._file.close()
+
+    def __str__(self):
+        return self.getvalue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def stream_to(output, channel, end_time, timeout, stderr=False, log=True):
+    """Reads the data from the given channel into the output buffer.
+
+    Reads grow up to MAX_READ_CHUNK_SIZE while the stream fills them and the
+    data is logged once per read rather than once per line.
+
+    Args:
+      output: OutputBuffer the data is appended to.
+      channel: the paramiko.Channel object to be used for reading.
+      end_time: maximum allocated time for reading from the channel.
+      timeout: Flag to check if timeout must be enforced.
+      stderr: read from the stderr stream. Default is False.
+      log: log the output. Default is True.
+
+    Raises:
+      TimeoutException: if reading from the channel exceeds the allocated time.
+    """
+    _stream = channel.recv_stderr if stderr else channel.recv
+    _log = logger.error if stderr else logger.debug
+    _decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    _size = READ_CHUNK_SIZE
+    _logged = 0
+
+    _data = _stream(_size)
+    while _data:
+        output.write(_data)
+        if log and _logged < OUTPUT_LOG_LIMIT:
+            _text = _decoder.decode(_data).rstrip("\n")
+            if _text:
+                _log(_text)
+
+            _logged += len(_data)
+            if _logged >= OUTPUT_LOG_LIMIT:
+                _log(f"Output logging stopped after {_logged} bytes.")
+
+        if len(_data) == _size:
+            _size = min(_size * 2, MAX_READ_CHUNK_SIZE)
+
+        check_timeout(end_time, timeout)
+        _data = _stream(_size)
+
+
 def read_stream(channel, end_time, timeout, stderr=False, log=True):
     """Reads the data from the given channel.
 
@@ -1199,26 +1326,52 @@ def read_stream(channel, end_time, timeout, stderr=False, log=True):
     Raises:
       TimeoutException: if reading from the channel exceeds the allocated time.
     """
-    _output = bytearray()
-    _stream = channel.recv_stderr if stderr else channel.recv
-    _decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with OutputBuffer() as _output:
+        stream_to(_output, channel, end_time, timeout, stderr=stderr, log=log)
+        return _output.getvalue()
 
-    _data = _stream(2048)
-    while _data:
-        _output.extend(_data)
-        if log:
-            for _ln in _data.splitlines():
-                _log = logger.error if stderr else logger.debug
-                _log(_decoder.decode(_ln, final=False))
 
-        check_timeout(end_time, timeout)
-        _data = _stream(2048)
+def wait_for_channels(channels, interval=CHANNEL_POLL_INTERVAL):
+    """Blocks until one of the channels has activity or the interval elapses.
+
+    Paramiko channels expose a pollable file descriptor which is signalled on
+    stdout/stderr data and on EOF, hence select is used instead of sleeping.
+
+    Args:
+      channels: list of paramiko.Channel objects to be watched.
+      interval: maximum time in seconds to block.
+    """
+    pending = [_ch for _ch in channels if not _ch.eof_received]
+    if len(pending) != len(channels):
+        interval = min(interval, CHANNEL_EOF_POLL_INTERVAL)
+
+    if not pending:
+        channels[0].status_event.wait(interval)
+        return
 
-    try:
-        return _decoder.decode(_output, final=True)  # Final decode
-    except UnicodeDecodeError as e:
-        logger.error(f"Decoding failed: {e}. Replacing invalid characters.")
-        return _output.decode("utf-8", errors="replace")  # Fallback to safe decode
+    select.select(pending, [], [], interval)
+
+
+def read_available(channel, stderr=False):
+    """Reads the data already buffered in the channel without blocking.
+
+    Args:
+      channel: the paramiko.Channel object to be used for reading.
+      stderr: read from the stderr stream. Default is False.
+
+    Returns:
+      bytes read from the channel.
+    """
+    _ready = channel.recv_stderr_ready if stderr else channel.recv_ready
+    _stream = channel.recv_stderr if stderr else channel.recv
+    _output = bytearray()
+    while _ready():
+        _data = _stream(32768)
+        if not _data:
+            break
+        _output.extend(_data)
+
+    return bytes(_output)
 
 
 class RolesContainer(object):
@@ -1294,6 +1447,104 @@ class NodeVolume(object):
         self.path = path
 
 
+class ChannelPool(object):
+    """Pool of pre-opened session channels for a single SSH transport.
+
+    Opening a session requires a round trip to the remote host. Keeping a few
+    sessions open ahead of time allows a command to be started immediately.
+    Session channels are single use, hence acquired channels are never
+    returned to the pool; the pool is refilled in the background instead.
+    """
+
+    def __init__(self, size=CHANNEL_POOL_SIZE):
+        self.size = size
+        self._channels = deque()
+        self._transport = None
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def acquire(self, transport, timeout=None):
+        """Returns an unused session channel of the given transport.
+
+        Args:
+          transport: the active paramiko.Transport of the connection.
+          timeout: time to wait for a new session to be opened.
+
+        Returns:
+          paramiko.Channel
+        """
+        channel = None
+        with self._lock:
+            if transport is not self._transport:
+                self._drop()
+                self._transport = transport
+
+            while self._channels:
+                _ch = self._channels.popleft()
+                if _ch.active and not (_ch.closed or _ch.eof_received):
+                    channel = _ch
+                    break
+
+        if self.size:
+            self._schedule_refill()
+
+        if channel is None:
+            channel = transport.open_session(timeout=timeout)
+
+        return channel
+
+    def clear(self):
+        """Closes the pooled channels."""
+        with self._lock:
+            self._drop()
+            self._transport = None
+
+    def _drop(self):
+        while self._channels:
+            try:
+                self._channels.popleft().close()
+            except Exception:
+                pass
+
+    def _schedule_refill(self):
+        with self._lock:
+            if self._refilling or len(self._channels) >= self.size:
+                return
+            self._refilling = True
+
+        threading.Thread(target=self._refill, daemon=True).start()
+
+    def _refill(self):
+        try:
+            while True:
+                with self._lock:
+                    transport = self._transport
+                    if len(self._channels) >= self.size:
+                        return
+
+                if not (transport and transport.is_active()):
+                    return
+
+                channel = transport.open_session(timeout=30)
+                with self._lock:
+                    if transport is not self._transport:
+                        channel.close()
+                        return
+
+                    self._channels.append(channel)
+        except Exception as e:
+            logger.debug("Unable to pre-open a session channel: %s", e)
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def __getstate__(self):
+        return {"size": self.size}
+
+    def __setstate__(self, state):
+        self.__init__(size=state.get("size", CHANNEL_POOL_SIZE))
+
+
 class SSHConnectionManager(object):
     def __init__(
         self,
@@ -1304,6 +1555,7 @@ class SSHConnectionManager(object):
         private_key_file_path="",
         private_key_password=None,
         outage_timeout=600,
+        channel_pool_size=CHANNEL_POOL_SIZE,
     ):
         self.ip_address = ip_address
         self.username = username
@@ -1324,6 +1576,7 @@ class SSHConnectionManager(object):
         self.__transport = None
         self.__outage_start_time = None
         self.outage_timeout = datetime.timedelta(seconds=outage_timeout)
+        self.channel_pool = ChannelPool(size=channel_pool_size)
 
     @property
     def client(self):
@@ -1396,6 +1649,7 @@ class SSHConnectionManager(object):
 
     def close(self):
         """Close the SSH connection."""
+        self.channel_pool.clear()
         try:
             if self.__client:
                 self.__client.close()
@@ -1499,6 +1753,17 @@ class SSHConnectionManager(object):
         self.__transport = self.client.get_transport()
         return self.__transport
 
+    def open_channel(self, timeout=None):
+        """Returns a session channel, preferring a pre-opened one.
+
+        Args:
+          timeout: time to wait for a new session to be opened.
+
+        Returns:
+          paramiko.Channel
+        """
+        return self.channel_pool.acquire(self.get_transport(), timeout=timeout)
+
     def __getstate__(self):
         pickle_dict = self.__dict__.copy()
         if pickle_dict.get("_SSHConnectionManager__transport"):
@@ -1515,6 +1780,8 @@ class SSHConnectionManager(object):
         self.__client = paramiko.SSHClient()
         self.__client.set_missing_host_key_policy(paramiko.MissingHostKeyPolicy())
         self.__transport = None
+        if "channel_pool" not in state:
+            self.channel_pool = ChannelPool()
         key_path = getattr(self, "_private_key_file_path", "") or ""
         self.pkey = (
             self._get_ssh_key(key_path) if self.look_for_keys and key_path else None
@@ -1616,6 +1883,7 @@ class CephNode(object):
                 CephObjectFactory(self).create_ceph_object("osd")
             )
 
+        self.channel_pool_size = kw.get("channel_pool_size", CHANNEL_POOL_SIZE)
         self.root_connection = SSHConnectionManager(
             self.ip_address,
             self.root_username,
@@ -1623,6 +1891,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=self.private_key_password,
+            channel_pool_size=self.channel_pool_size,
         )
         self.connection = SSHConnectionManager(
             self.ip_address,
@@ -1631,6 +1900,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=self.private_key_password,
+            channel_pool_size=self.channel_pool_size,
         )
         self.rssh = self.root_connection.get_client
         self.rssh_transport = self.root_connection.get_transport
@@ -1856,6 +2126,7 @@ class CephNode(object):
             self.password = ""
             self.look_for_key = True
             _key_pw = getattr(self, "private_key_password", None)
+            _pool_size = getattr(self, "channel_pool_size", CHANNEL_POOL_SIZE)
             root_mgr = SSHConnectionManager(
                 self.ip_address,
                 "root",
@@ -1863,6 +2134,7 @@ class CephNode(object):
                 look_for_keys=True,
                 private_key_file_path=key_path,
                 private_key_password=_key_pw,
+                channel_pool_size=_pool_size,
             )
             cephuser_mgr = SSHConnectionManager(
                 self.ip_address,
@@ -1871,6 +2143,7 @@ class CephNode(object):
                 look_for_keys=True,
                 private_key_file_path=key_path,
                 private_key_password=_key_pw,
+                channel_pool_size=_pool_size,
             )
             self.root_connection = root_mgr
             self.connection = cephuser_mgr
@@ -1898,56 +2171,82 @@ class CephNode(object):
                     else:
                         raise
 
+        # The node preparation steps are batched into one script per user to
+        # avoid a round trip for every step.
         sudo_prefix = "sudo " if self.username != "root" else ""
+        root_cmds = []
         if self.password:
-            _, stdout, stderr = self.rssh().exec_command(
+            root_cmds.append(
                 f"echo '{self.username}:{self.password}' | {sudo_prefix}chpasswd"
             )
-            logger.info(stdout.readlines())
         if self.root_passwd:
-            _, stdout, stderr = self.rssh().exec_command(
-                f"echo 'root:{self.root_passwd}' | {sudo_prefix}chpasswd"
-            )
-            logger.info(stdout.readlines())
+            root_cmds.append(f"echo 'root:{self.root_passwd}' | {sudo_prefix}chpasswd")
         # TCP keepalive (applies to both IPv4 and IPv6 on Linux)
-        self.rssh().exec_command(
-            f"echo 120 | {sudo_prefix}tee /proc/sys/net/ipv4/tcp_keepalive_time"
-        )
-        self.rssh().exec_command(
-            f"echo 60 | {sudo_prefix}tee /proc/sys/net/ipv4/tcp_keepalive_intvl"
-        )
-        self.rssh().exec_command(
-            f"echo 20 | {sudo_prefix}tee /proc/sys/net/ipv4/tcp_keepalive_probes"
+        for param, value in NODE_TCP_KEEPALIVE.items():
+            root_cmds.append(
+                f"echo {value} | {sudo_prefix}tee /proc/sys/net/ipv4/{param}"
+            )
+        _, stdout, _ = self.rssh().exec_command(" ; ".join(root_cmds))
+        logger.info(stdout.readlines())
+
+        vm_node = getattr(self, "vm_node", None)
+        hostname_cmd = (
+            "hostname -s"
+            if vm_node and getattr(vm_node, "node_type", None) == "baremetal"
+            else "hostname"
         )
-        self.exec_command(cmd="ls / ; uptime ; date")
+        setup_cmds = [
+            "ls / > /dev/null && uptime && date",
+            f'echo "{NODE_INFO_PREFIX}hostname=$({hostname_cmd})"',
+            f'echo "{NODE_INFO_PREFIX}internal_ip=$(/sbin/ifconfig eth0 2> /dev/null'
+            " | grep 'inet ' | awk '{ print $2}')\"",
+            "grep -q 'TMOUT' ~/.bashrc || echo '[[ -z \"${TMOUT+x}\" ]] && export TMOUT=600' >> ~/.bashrc",
+            f"[ -f /etc/redhat-release ] && echo {NODE_INFO_PREFIX}pkg_type=rpm"
+            f" || echo {NODE_INFO_PREFIX}pkg_type=deb",
+        ]
+        out, _ = self.exec_command(cmd=" ; ".join(setup_cmds))
         self.ssh_transport().set_keepalive(15)
-        vm_node = getattr(self, "vm_node", None)
-        if vm_node and getattr(vm_node, "node_type", None) == "baremetal":
-            out, err = self.exec_command(cmd="hostname -s")
-        else:
-            out, err = self.exec_command(cmd="hostname")
-        self.hostname = out.strip()
+
+        info = dict()
+        for line in out.splitlines():
+            if line.startswith(NODE_INFO_PREFIX):
+                key, _, value = line[len(NODE_INFO_PREFIX) :].partition("=")
+                info[key] = value.strip()
+
+        self.hostname = info["hostname"]
 
         shortname = self.hostname.split(".")
         self.shortname = shortname[0]
         logger.info(
             "hostname and shortname set to %s and %s", self.hostname, self.shortname
         )
-        self.set_internal_ip()
-        self.exec_command(
-            cmd="grep -q 'TMOUT' ~/.bashrc || echo '[[ -z \"${TMOUT+x}\" ]] && export TMOUT=600' >> ~/.bashrc",
-            check_ec=False,
-        )
-        self.exec_command(cmd="[ -f /etc/redhat-release ]", check_ec=False)
-
-        if self.exit_status == 0:
-            self.pkg_type = "rpm"
-        else:
-            self.pkg_type = "deb"
+        self.internal_ip = info.get("internal_ip", "")
+        self.pkg_type = info.get("pkg_type", "deb")
 
         logger.info("finished connect")
         self.run_once = True
 
+    def wait_for_ssh(self, timeout=600, port=22):
+        """Wait until the node accepts TCP connections and presents an SSH banner.
+
+        Args:
+          timeout: maximum time in seconds to wait for the node.
+          port: SSH port of the node.
+
+        Raises:
+          AssertionError: when the node is not reachable within the timeout.
+        """
+        for _ in WaitUntil(timeout=timeout, interval=2, backoff=1.5, max_interval=10):
+            try:
+                with socket.create_connection((self.ip_address, port), timeout=10) as s:
+                    if s.recv(64).startswith(b"SSH-"):
+                        logger.info("%s is accepting SSH connections", self.ip_address)
+                        return
+            except OSError as e:
+                logger.debug("%s is not reachable yet: %s", self.ip_address, e)
+
+        raise AssertionError(f"{self.ip_address} did not start SSH in {timeout}s")
+
     def set_internal_ip(self):
         """
         set the internal ip of the vm which differs from floating ip
@@ -1989,16 +2288,15 @@ class CephNode(object):
         cmd = kw["cmd"]
         _end_time = None
         _verbose = kw.get("verbose", False)
-        ssh = self.rssh if kw.get("sudo") else self.ssh
+        connection = self.root_connection if kw.get("sudo") else self.connection
         long_running = kw.get("long_running", False)
-        if "timeout" in kw:
-            timeout = None if kw["timeout"] == "notimeout" else kw["timeout"]
-        else:
-            # Set defaults if long_running then 1h else 5m
-            timeout = 3600 if kw.get("long_running", False) else 600
+        timeout = self._get_command_timeout(**kw)
 
+        channel = None
+        # Output buffers closed once the command is done, unless handed over
+        _buffers = []
         try:
-            channel = ssh().get_transport().open_session(timeout=timeout)
+            channel = connection.open_channel(timeout=timeout)
             channel.settimeout(timeout)
 
             logger.info(
@@ -2015,22 +2313,23 @@ class CephNode(object):
                     seconds=timeout
                 )
 
-            _out = ""
-            _err = ""
+            _out = OutputBuffer()
+            _err = OutputBuffer()
+            _buffers = [_out, _err]
             while not channel.exit_status_ready():
-                # Prevent high resource consumption
-                sleep(1)
+                # Block until the channel has activity instead of sleeping
+                wait_for_channels([channel])
 
                 # Check the streams for data and log in debug mode only if it
                 # is a long running command else don't log.
                 # Fixme: logging must happen in debug irrespective of type.
                 _verbose = True if long_running else _verbose
                 if channel.recv_ready():
-                    _out += read_stream(channel, _end_time, timeout, log=_verbose)
+                    stream_to(_out, channel, _end_time, timeout, log=_verbose)
 
                 if channel.recv_stderr_ready():
-                    _err += read_stream(
-                        channel, _end_time, timeout, stderr=True, log=_verbose
+                    stream_to(
+                        _err, channel, _end_time, timeout, stderr=True, log=_verbose
                     )
 
                 check_timeout(_end_time, timeout)
@@ -2050,25 +2349,144 @@ class CephNode(object):
             #   - race condition between data read and exit ready
             try:
                 _new_timeout = datetime.datetime.now() + datetime.timedelta(seconds=10)
-                _out += read_stream(channel, _new_timeout, timeout=True)
-                _err += read_stream(channel, _new_timeout, timeout=True, stderr=True)
+                stream_to(_out, channel, _new_timeout, timeout=True)
+                stream_to(_err, channel, _new_timeout, timeout=True, stderr=True)
             except CommandFailed:
                 logger.debug("Encountered a timeout during read post execution.")
             except BaseException as be:
                 logger.debug("Encountered an unknown exception during last read.\n", be)
 
             _exit = channel.recv_exit_status()
-            return _out, _err, _exit, _time
+            if kw.get("stream"):
+                _buffers.remove(_out)
+                return _out, _err.getvalue(), _exit, _time
+
+            return _out.getvalue(), _err.getvalue(), _exit, _time
         except socket.timeout as terr:
             logger.error("%s failed to execute within %d seconds.", cmd, timeout)
             raise SocketTimeoutException(terr)
         except TimeoutException as tex:
-            channel.close()
             logger.error("%s failed to execute within %ds.", cmd, timeout)
             raise CommandFailed(tex)
         except BaseException as be:  # noqa
             logger.exception(be)
             raise CommandFailed(be)
+        finally:
+            for _buffer in _buffers:
+                _buffer.close()
+
+            # Release the channel and its polling descriptors
+            if channel is not None:
+                channel.close()
+
+    @staticmethod
+    def _get_command_timeout(**kw):
+        """Returns the execution timeout based on the command configuration."""
+        if "timeout" in kw:
+            return None if kw["timeout"] == "notimeout" else kw["timeout"]
+
+        # Set defaults if long_running then 1h else 5m
+        return 3600 if kw.get("long_running", False) else 600
+
+    def exec_commands(self, cmds, **kw):
+        """Execute independent commands concurrently over a single connection.
+
+        Every command is run on its own session channel multiplexed over the
+        same SSH transport, so the total time is bound by the slowest command
+        instead of the sum of all of them.
+
+        Args:
+          cmds: list of commands to be executed on the remote host.
+          sudo: Bool flag to execute the commands as root.
+          check_ec: Bool flag to raise when any command returns non-zero.
+          timeout: Max time to wait for all commands. Default is 600 seconds.
+          max_channels: Max number of commands running at the same time.
+
+        Returns:
+          List of (stdout, stderr, exit code, duration) in the order of cmds.
+
+        Raises:
+          CommandFailed: when an exit code is non-zero and check_ec is enabled.
+
+        Examples:
+            self.exec_commands(["ceph -s -f json", "ceph osd tree -f json"])
+        """
+        connection = self.root_connection if kw.get("sudo") else self.connection
+        timeout = self._get_command_timeout(**kw)
+        max_channels = kw.get("max_channels", MAX_PIPELINED_CHANNELS)
+        _end_time = None
+        if timeout:
+            _end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+
+        queue = deque(enumerate(cmds))
+        results = [None] * len(cmds)
+        running = dict()
+        try:
+            while queue or running:
+                while queue and len(running) < max_channels:
+                    index, cmd = queue.popleft()
+                    channel = connection.open_channel(timeout=timeout)
+                    logger.info(
+                        "Execute %s on %s [%s]", cmd, self.hostname, self.ip_address
+                    )
+                    channel.exec_command(cmd)
+                    running[channel] = (
+                        index,
+                        cmd,
+                        datetime.datetime.now(),
+                        bytearray(),
+                        bytearray(),
+                    )
+
+                wait_for_channels(list(running))
+                for channel in list(running):
+                    index, cmd, _start, _out, _err = running[channel]
+                    _out.extend(read_available(channel))
+                    _err.extend(read_available(channel, stderr=True))
+                    if not (
+                        channel.closed
+                        or (channel.eof_received and channel.exit_status_ready())
+                    ):
+                        continue
+
+                    # the output received along with the EOF
+                    _out.extend(read_available(channel))
+                    _err.extend(read_available(channel, stderr=True))
+                    _time = (datetime.datetime.now() - _start).total_seconds()
+                    _exit = channel.recv_exit_status()
+                    channel.close()
+                    del running[channel]
+
+                    logger.info(
+                        "Execution of %s took %s seconds on %s [%s]",
+                        cmd,
+                        str(_time),
+                        self.hostname,
+                        self.ip_address,
+                    )
+                    results[index] = (
+                        _out.decode("utf-8", errors="replace"),
+                        _err.decode("utf-8", errors="replace"),
+                        _exit,
+                        _time,
+                    )
+
+                check_timeout(_end_time, timeout)
+        except TimeoutException as tex:
+            logger.error("Commands failed to execute within %ds.", timeout)
+            raise CommandFailed(tex)
+        finally:
+            for channel in running:
+                channel.close()
+
+        if kw.get("check_ec", True):
+            for cmd, (_, _err, _exit, _) in zip(cmds, results):
+                if _exit != 0:
+                    raise CommandFailed(
+                        f"{cmd} returned {_err} and code {_exit} on {self.hostname} [{self.ip_address}]"
+                    )
+
+        return results
 
     def exec_command(self, **kw):
         """Execute the given command on the remote host.
@@ -2080,6 +2498,8 @@ class CephNode(object):
           timeout: Max time to wait for command to complete. Default is 600 seconds.
           pretty_print: Bool flag to indicate if the output should be pretty printed.
           verbose: Bool flag to indicate if the command output should be printed.
+          stream: Bool flag to return stdout as an OutputBuffer, which spills to
+                  disk when large and can be consumed line by line.
 
         Returns:
           Exit code when long_running is used
@@ -2094,6 +2514,10 @@ class CephNode(object):
             self.exec_cmd(cmd='uptime')
           or
             self.exec_cmd(cmd='background_cmd', check_ec=False)
+          or
+            out, _ = self.exec_command(cmd='ceph pg dump', stream=True)
+            for line in out.lines():
+                ...
         """
         if self.run_once:
             self.ssh_transport().set_keepalive(15)
@@ -2108,7 +2532,9 @@ class CephNode(object):
             msg += f"\nDuration:   {_time} seconds"
             msg += f"\nExit Code:  {_exit}"
 
-            if _out:
+            if isinstance(_out, OutputBuffer):
+                msg += f"\nStdout:     {_out.size} bytes"
+            elif _out:
                 msg += f"\nStdout:     {_out}"
 
             if _err:
@@ -2124,6 +2550,10 @@ class CephNode(object):
         # Fixme: Ensure the method returns a tuple of
         #        (stdout, stderr, exit_code, time_taken)
         if kw.get("long_running", False):
+            # The streamed output is not handed over to the caller
+            if isinstance(_out, OutputBuffer):
+                _out.close()
+
             if kw.get("check_ec", False) and _exit != 0:
                 raise CommandFailed(
                     f"{cmd} returned {_err} and code {_exit} on {self.hostname} [{self.ip_address}]"
@@ -2132,6 +2562,9 @@ class CephNode(object):
             return _exit
 
         if kw.get("check_ec", True) and _exit != 0:
+            if isinstance(_out, OutputBuffer):
+                _out.close()
+
             raise CommandFailed(
                 f"{cmd} returned {_err} and code {_exit} on {self.hostname} [{self.ip_address}]"
             )
@@ -2185,6 +2618,7 @@ class CephNode(object):
     def __setstate__(self, pickle_dict):
         self.__dict__.update(pickle_dict)
         key_pw = getattr(self, "private_key_password", None)
+        pool_size = getattr(self, "channel_pool_size", CHANNEL_POOL_SIZE)
         self.root_connection = SSHConnectionManager(
             self.ip_address,
             "root",
@@ -2192,6 +2626,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=key_pw,
+            channel_pool_size=pool_size,
         )
         self.connection = SSHConnectionManager(
             self.ip_address,
@@ -2200,6 +2635,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=key_pw,
+            channel_pool_size=pool_size,
         )
         self.rssh = self.root_connection.get_client
         self.ssh = self.connection.get_client
@@ -2679,6 +3115,132 @@ class CephNode(object):
         client = self.rssh if sudo else self.ssh
         client().open_sftp().get(src, dst)
 
+    def download_command_output(self, cmd, dst, stdin=None, sudo=False, timeout=3600):
+        """Stream the stdout of a command into a local file.
+
+        The output is written as it is received, which allows archives to be
+        produced on the fly (e.g. `tar -cf - ... | zstd`) without a temporary
+        copy on the remote disk.
+
+        Args:
+            cmd (str): Command producing the data
+            dst (str): File destination location
+            stdin (bytes): Data sent to the standard input of the command
+            sudo (bool): Use root access
+            timeout (int): Max time to wait for the command to complete
+
+        Returns:
+            tuple of exit status and stderr of the command
+
+        Raises:
+            CommandFailed: when the command does not complete within timeout
+        """
+        connection = self.root_connection if sudo else self.connection
+        _end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+        _err = bytearray()
+        _stdin = stdin or b""
+        _sent = 0
+        channel = connection.open_channel(timeout=timeout)
+        try:
+            logger.info("Execute %s on %s [%s]", cmd, self.hostname, self.ip_address)
+            channel.exec_command(cmd)
+            if not _stdin:
+                channel.shutdown_write()
+
+            with open(dst, "wb") as fp:
+                while not (channel.eof_received and channel.exit_status_ready()):
+                    if channel.closed:
+                        break
+
+                    # The input is written as the window allows while the output
+                    # is drained, the command stalls once its stdout is not read
+                    if _sent < len(_stdin) and channel.send_ready():
+                        _sent += channel.send(_stdin[_sent : _sent + READ_CHUNK_SIZE])
+                        if _sent == len(_stdin):
+                            channel.shutdown_write()
+                    elif _sent < len(_stdin):
+                        wait_for_channels([channel], CHANNEL_EOF_POLL_INTERVAL)
+                    else:
+                        wait_for_channels([channel])
+
+                    fp.write(read_available(channel))
+                    _err.extend(read_available(channel, stderr=True))
+                    check_timeout(_end_time, timeout)
+
+                fp.write(read_available(channel))
+                _err.extend(read_available(channel, stderr=True))
+
+            return channel.recv_exit_status(), _err.decode("utf-8", errors="replace")
+        except TimeoutException as tex:
+            logger.error("%s failed to execute within %ds.", cmd, timeout)
+            raise CommandFailed(tex)
+        finally:
+            channel.close()
+
+    def iter_command_output(
+        self, cmd, delimiter=b"\n", sudo=False, timeout=3600, check_ec=True
+    ):
+        """Yield the stdout records of a command as they are received.
+
+        Only the records not yet consumed are kept in memory, which allows
+        commands listing millions of entries to be processed as a stream.
+
+        Args:
+            cmd (str): Command to execute
+            delimiter (bytes): Record separator, like b"\\0" for `find -print0`
+            sudo (bool): Use root access
+            timeout (int): Max time to wait for the command to complete
+            check_ec (bool): Raise CommandFailed on a non zero exit status
+
+        Yields:
+            records of the output, decoded and without the delimiter
+
+        Raises:
+            CommandFailed: when the command fails or does not complete within timeout
+        """
+        connection = self.root_connection if sudo else self.connection
+        _end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+        _out = bytearray()
+        _err = bytearray()
+        channel = connection.open_channel(timeout=timeout)
+        try:
+            logger.info("Execute %s on %s [%s]", cmd, self.hostname, self.ip_address)
+            channel.exec_command(cmd)
+            channel.shutdown_write()
+
+            while True:
+                done = channel.closed or (
+                    channel.eof_received and channel.exit_status_ready()
+                )
+                if not done:
+                    wait_for_channels([channel])
+                _out.extend(read_available(channel))
+                _err.extend(read_available(channel, stderr=True))
+
+                *records, rest = _out.split(delimiter)
+                del _out[: len(_out) - len(rest)]
+                for record in records:
+                    yield record.decode("utf-8", errors="replace")
+
+                if done:
+                    break
+                check_timeout(_end_time, timeout)
+
+            if _out:
+                yield _out.decode("utf-8", errors="replace")
+
+            _exit = channel.recv_exit_status()
+            if check_ec and _exit != 0:
+                raise CommandFailed(
+                    f"{cmd} returned {_err.decode('utf-8', errors='replace')} "
+                    f"and code {_exit} on {self.hostname} [{self.ip_address}]"
+                )
+        except TimeoutException as tex:
+            logger.error("%s failed to execute within %ds.", cmd, timeout)
+            raise CommandFailed(tex)
+        finally:
+            channel.close()
+
     def create_dirs(self, dir_path, sudo=False):
         """Create directory on node
         Args:
@@ -2796,6 +3358,18 @@ class CephObject(object):
         """
         self.node.download_file(src=src, dst=dst, sudo=sudo)
 
+    def iter_command_output(self, cmd, **kw):
+        """
+        Proxy to node's iter_command_output
+        Args:
+            cmd (str): command to execute
+            **kw: options
+
+        Returns:
+            node's iter_command_output generator
+        """
+        return self.node.iter_command_output(cmd, **kw)
+
 
 class CephDemon(CephObject):
     def __init__(self, role, node):
@@ -4,6 +4,7 @@ Contains helper functions that can used across the module.
 
 import json
 import os
+import re
 import tempfile
 from datetime import datetime, timedelta
 from os.path import dirname
@@ -16,6 +17,7 @@ from looseversion import LooseVersion
 
 from ceph.ceph import CommandFailed
 from ceph.utils import get_node_by_id, get_nodes_by_ids
+from ceph.waiter import WaitUntil, watch_until
 from utility.log import Log
 from utility.ssl_certs import CertificateGenerator
 from utility.utils import generate_self_signed_certificate
@@ -1188,7 +1190,6 @@ def check_service_exists(
         Boolean: True if the service and the list of daemons are running else False.
 
     """
-    end_time = datetime.now() + timedelta(seconds=timeout)
     cmd_args = ["cephadm", "shell", "--", "ceph", "orch", "ls"]
     if service_name:
         cmd_args += ["--service_name", service_name]
@@ -1200,10 +1201,25 @@ def check_service_exists(
     else:
         cmd_args += ["--service_type", service_type, "--format", "json", "--refresh"]
 
+    # cephadm logs the daemons of the service it deploys, removes or reconfigures
+    watch_cmd = "cephadm shell -- ceph -W cephadm"
+    daemon_event = re.compile(
+        rf"daemon {re.escape(service_name or service_type)}[.\s]"
+    ).search
+
     _retries = 3  # cross-verification retries
     _count = 0
-    while end_time > datetime.now():
-        sleep(interval)
+    _converged = None  # outcome of the previous check
+    for w in WaitUntil(timeout=timeout, interval=0):
+        _wait = max(0, min(interval, timeout - w.elapsed))
+        if _converged is False and _wait >= 1:
+            # Check again as soon as cephadm reports a daemon of the service
+            watch_until(installer, watch_cmd, daemon_event, timeout=_wait)
+        elif _converged is not None:
+            # The cross-verification relies on checks spaced by the full interval
+            sleep(_wait)
+
+        _converged = False
         out, _ = installer.exec_command(
             sudo=True, cmd=" ".join(cmd_args), check_ec=True
         )
@@ -1219,6 +1235,8 @@ def check_service_exists(
         if count + running < 1:
             continue
 
+        _converged = count == running
+
         if count == running and _count == count:
             if _retries < 1:
                 return True
@@ -3,6 +3,8 @@
 from copy import deepcopy
 from typing import Dict, List
 
+from ceph.rados.state_cache import invalidate_state_cache, is_read_only
+from cli.cephadm.shell_session import get_shell_session
 from utility.log import Log
 
 from .common import config_dict_to_string
@@ -37,29 +39,49 @@ class ShellMixin:
             print_output (Bool): Flag to decide whether the output should be printed in log or not
             pretty_print (Bool): When enabled, output/error will be pretty printed. Default false.
 
+        When `persistent_shell` is enabled in the test configuration, commands
+        without base_cmd_args are executed within a long-lived shell container.
+
         Returns:
             out (Str), err (Str) stdout and stderr response
             rc (Int) exit status code if long_running command
 
         """
-        cmd = deepcopy(BASE_CMD)
-
-        if base_cmd_args:
-            cmd.append(config_dict_to_string(base_cmd_args))
-
-        cmd.append("--")
-        cmd.extend(args)
-
-        out = self.installer.exec_command(
-            sudo=True,
-            cmd=" ".join(cmd),
-            timeout=timeout,
-            check_ec=check_status,
-            long_running=long_running,
-            pretty_print=pretty_print,
-        )
-
-        if isinstance(out, tuple):
-            if print_output:
-                LOG.debug(out[0])
-        return out
+        try:
+            if self.config.get("persistent_shell") and not base_cmd_args:
+                out = get_shell_session(self.installer).run(
+                    " ".join(args),
+                    timeout=timeout,
+                    check_ec=check_status,
+                    long_running=long_running,
+                    pretty_print=pretty_print,
+                )
+                if isinstance(out, tuple) and print_output:
+                    LOG.debug(out[0])
+                return out
+
+            cmd = deepcopy(BASE_CMD)
+
+            if base_cmd_args:
+                cmd.append(config_dict_to_string(base_cmd_args))
+
+            cmd.append("--")
+            cmd.extend(args)
+
+            out = self.installer.exec_command(
+                sudo=True,
+                cmd=" ".join(cmd),
+                timeout=timeout,
+                check_ec=check_status,
+                long_running=long_running,
+                pretty_print=pretty_print,
+            )
+
+            if isinstance(out, tuple):
+                if print_output:
+                    LOG.debug(out[0])
+            return out
+        finally:
+            # Commands changing the cluster drop its cached state
+            if not is_read_only(" ".join(args)):
+                invalidate_state_cache(self.cluster)
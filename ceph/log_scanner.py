@@ -0,0 +1,238 @@
+"""
+Incremental scanner of the daemon logs, used to verify events by their logs.
+
+A scanner follows one log of a node, either a systemd journal unit, like the
+`ceph-<fsid>@<daemon>.service` unit read by `cephadm logs`, or a log file. The
+position reached in the log is kept as a cursor, a journal cursor or the inode
+and offset of the file, so every scan only reads the entries written since the
+previous one.
+
+All the watched patterns are matched in a single pass on the node by one grep
+process, fixed strings being matched with the Aho-Corasick like multi-string
+search of grep, and only the matching lines are transferred. The matches are
+kept with their timestamp, which allows "did X appear since T" to be answered
+without reading the log again. A pattern watched for the first time is
+searched once in the history of the log.
+
+Scanners are shared per node and log, refer get_log_scanner.
+"""
+
+import re
+import shlex
+import threading
+from datetime import datetime
+
+from utility.log import Log
+
+log = Log(__name__)
+
+CURSOR_MARKER = "-- cursor: "
+
+# Maximum number of matching lines kept per pattern.
+MAX_MATCHES = 10000
+
+_TIMESTAMP = re.compile(r"(\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d)")
+
+_scanners = dict()
+_scanners_lock = threading.Lock()
+
+
+def daemon_unit(fsid, daemon_name):
+    """Returns the systemd unit of a cephadm daemon, like osd.1 or nfs.foo.0.host."""
+    return f"ceph-{fsid}@{daemon_name}.service"
+
+
+def grep_command(patterns, regex=False):
+    """Returns a grep matching any of the patterns and the cursor lines."""
+    expressions = [re.escape(CURSOR_MARKER) if regex else CURSOR_MARKER]
+    expressions.extend(patterns)
+    args = " ".join(f"-e {shlex.quote(expr)}" for expr in expressions)
+    return f"grep -a {'-E' if regex else '-F'} {args}"
+
+
+def parse_timestamp(value):
+    """Returns the naive datetime of a log line or a time like '2022-07-20 09:40:10'."""
+    if value is None or isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value else None
+
+    match = _TIMESTAMP.search(value)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1).replace("T", " "), "%Y-%m-%d %H:%M:%S")
+
+
+class LogScanner:
+    """Cursor based scanner of a journal unit or a log file of a node."""
+
+    def __init__(self, node, unit=None, path=None, regex=False):
+        """
+        Initializes the scanner, the log is not read until the first scan
+        Args:
+            node: CephNode hosting the log
+            unit: systemd unit of the journal to be scanned
+            path: log file to be scanned, when unit is not given
+            regex: patterns are extended regular expressions instead of strings
+        """
+        if not (unit or path):
+            raise ValueError("Either the journal unit or the log file is required")
+
+        self.node = node
+        self.unit = unit
+        self.path = path
+        self.regex = regex
+        self.cursor = None
+        self._patterns = dict()
+        self._matches = dict()
+        self._scanned = set()
+        self._history = True
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"LogScanner({self.node.hostname}, {self.unit or self.path})"
+
+    def _read_command(self, patterns, cursor=None, since=None):
+        if self.unit:
+            cmd = f"journalctl -u {shlex.quote(self.unit)} -o short-iso --no-pager --show-cursor"
+            if cursor:
+                cmd += f" --after-cursor {shlex.quote(cursor)}"
+            elif since:
+                cmd += f" --since '{since.strftime('%Y-%m-%d %H:%M:%S')}'"
+            return f"{cmd} | {grep_command(patterns, self.regex)}"
+
+        # The cursor of a file is its inode and the offset read up to, the
+        # file is read from its start once rotated or truncated
+        inode, offset = (cursor or "0:0").split(":")
+        path = shlex.quote(self.path)
+        return (
+            f"[ -f {path} ] && set -- $(stat -c '%i %s' {path}) && off={offset} && "
+            f"{{ [ $1 = {inode} ] && [ $2 -ge $off ] || off=0; }} && "
+            f'echo "{CURSOR_MARKER}$1:$2" && '
+            f"tail -c +$((off + 1)) {path} | head -c $(($2 - off)) | "
+            f"{grep_command(patterns, self.regex)}"
+        )
+
+    def _run(self, patterns, cursor=None, since=None):
+        """Reads the matching lines, returns the new cursor and the lines."""
+        out, _ = self.node.exec_command(
+            cmd=self._read_command(patterns, cursor, since),
+            sudo=True,
+            check_ec=False,
+        )
+        new_cursor = cursor
+        lines = []
+        for line in out.splitlines():
+            if line.startswith(CURSOR_MARKER):
+                new_cursor = line[len(CURSOR_MARKER) :].strip()
+            elif line.strip():
+                lines.append(line)
+        return new_cursor, lines
+
+    def _record(self, lines, patterns):
+        for line in lines:
+            for pattern in patterns:
+                if self._patterns[pattern].search(line):
+                    matches = self._matches[pattern]
+                    if line not in matches and len(matches) < MAX_MATCHES:
+                        matches[line] = parse_timestamp(line)
+
+    def watch(self, *patterns):
+        """Adds patterns to the set matched by the scans."""
+        with self._lock:
+            for pattern in patterns:
+                if pattern not in self._patterns:
+                    self._patterns[pattern] = re.compile(
+                        pattern if self.regex else re.escape(pattern)
+                    )
+                    self._matches[pattern] = dict()
+
+    def mark(self):
+        """Moves the cursor to the end of the log, the history is not scanned."""
+        with self._lock:
+            if self.unit:
+                cmd = (
+                    f"journalctl -u {shlex.quote(self.unit)} -n 1 -o cat "
+                    f"--no-pager --show-cursor"
+                )
+            else:
+                cmd = f"stat -c '{CURSOR_MARKER}%i:%s' {shlex.quote(self.path)}"
+            out, _ = self.node.exec_command(cmd=cmd, sudo=True, check_ec=False)
+            for line in out.splitlines():
+                if line.startswith(CURSOR_MARKER):
+                    self.cursor = line[len(CURSOR_MARKER) :].strip()
+            # the history is not searched for the patterns watched from now on
+            self._history = False
+
+    def scan(self, since=None):
+        """
+        Reads the log written since the previous scan and matches the patterns
+        Args:
+            since: time the first scan of the log starts at, the whole log
+                   is read otherwise
+        Returns:
+            dict of the patterns and their new matching lines
+        """
+        since = parse_timestamp(since)
+        with self._lock:
+            patterns = list(self._patterns)
+            if not patterns:
+                return dict()
+
+            before = {p: set(self._matches[p]) for p in patterns}
+            fresh = [p for p in patterns if p not in self._scanned]
+            if self.cursor and fresh and self._history:
+                # patterns watched after the previous scans are searched once
+                # in the log read until then
+                _, lines = self._run(fresh, since=since)
+                self._record(lines, fresh)
+
+            self.cursor, lines = self._run(patterns, self.cursor, since)
+            self._record(lines, patterns)
+            self._scanned = set(patterns)
+
+            return {
+                p: [line for line in self._matches[p] if line not in before[p]]
+                for p in patterns
+                if len(self._matches[p]) > len(before[p])
+            }
+
+    def _found(self, pattern, since):
+        since = parse_timestamp(since)
+        return [
+            line
+            for line, timestamp in self._matches[pattern].items()
+            if since is None or (timestamp and timestamp >= since)
+        ]
+
+    def found(self, pattern, since=None):
+        """
+        Returns the lines matching the pattern logged since the given time
+        Args:
+            pattern: string, or regular expression for regex scanners
+            since: datetime or time string like '2022-07-20 09:40:10', the
+                   lines of the whole log are returned when None
+        """
+        self.watch(pattern)
+        self.scan()
+        return self._found(pattern, since)
+
+    def search(self, patterns, since=None):
+        """
+        Scans the log once for all the patterns
+        Args:
+            patterns: list of patterns
+            since: time the lines are considered from, refer found
+        Returns:
+            dict of every pattern and its matching lines
+        """
+        self.watch(*patterns)
+        self.scan()
+        return {pattern: self._found(pattern, since) for pattern in patterns}
+
+
+def get_log_scanner(node, unit=None, path=None, regex=False):
+    """Returns the scanner of the log, shared by the callers following it."""
+    with _scanners_lock:
+        key = (node.hostname, unit, path, regex)
+        if key not in _scanners:
+            _scanners[key] = LogScanner(node, unit=unit, path=path, regex=regex)
+        return _scanners[key]
@@ -21,12 +21,19 @@ class NVMeGWCLIV2(BaseCLI):
             node (CephNode): Gateway node instance.
             shell: Cephadm shell instance (orch.shell or cephadm.shell).
             mtls (bool, optional): Enable/disable mTLS. Defaults to False.
+            grpc (bool, optional): Send the supported operations over a
+                persistent gRPC channel to the gateway, unless mtls is
+                enabled. Defaults to False.
+            port (int, optional): Gateway control port. Defaults to 5500.
         """
         shell = kwargs.get("shell")
         if shell is None:
             raise ValueError("`cephadm.shell` is required for NVMeGWCLIV2")
 
-        super().__init__(node, shell)
+        # The gRPC helper opens insecure channels, mTLS gateways use the CLI
+        grpc = kwargs.get("grpc") and not kwargs.get("mtls")
+        grpc_port = (kwargs.get("port") or 5500) if grpc else None
+        super().__init__(node, shell, grpc_port=grpc_port)
 
         self.node = node
         self.shell = shell
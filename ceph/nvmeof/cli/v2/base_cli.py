@@ -1,11 +1,40 @@
+import json
 import re
+import threading
 
 from ceph.ceph_admin.common import config_dict_to_string
 from ceph.nvmeof.cli.v2.common import substitute_keys
+from ceph.nvmeof.cli.v2.grpc_client import GatewayGrpcSession, to_grpc_request
 from utility.log import Log
 
 LOG = Log(__name__)
 
+# Ceph version of the gateways, probed once per gateway node until forgotten
+_CEPH_VERSIONS = dict()
+_CEPH_VERSIONS_LOCK = threading.Lock()
+
+# First build using --server-address instead of --traddr for the gateway address
+SERVER_ADDRESS_VERSION = (20, 1, 0, 145)
+
+
+def _version_tuple(version):
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def forget_ceph_versions(nodes=None):
+    """Forget the probed Ceph version of the gateways, e.g. once upgraded.
+
+    Args:
+        nodes: gateway nodes (CephNode), all the gateways when None
+    """
+    with _CEPH_VERSIONS_LOCK:
+        if nodes is None:
+            _CEPH_VERSIONS.clear()
+            return
+
+        for node in nodes:
+            _CEPH_VERSIONS.pop(node.hostname, None)
+
 
 KEY_MAP = {
     "subsystem": "nqn",
@@ -43,31 +72,66 @@ class BaseCLI:
 
     BASE_CMD = "ceph nvmeof"
 
-    def __init__(self, node, shell) -> None:
+    def __init__(self, node, shell, grpc_port=None) -> None:
         """Initialize the Shell.
 
         Args:
             node: Gateway Node instance (CephNode)
             shell: Cephadm shell instance (orch.shell or cephadm.shell)
+            grpc_port: gateway control port, operations are sent over a
+                persistent gRPC channel when set
         """
         self.node = node
         self.shell = shell
-        self.ceph_version = None
+        self.grpc_session = None
+        if grpc_port:
+            self.grpc_session = GatewayGrpcSession.get(node, grpc_port)
 
     def __local_mtls_cert_path(self) -> str:
         """Currently mtls is not supported in Ceph NVMe CLI."""
         return ""
 
+    @property
+    def ceph_version(self):
+        return _CEPH_VERSIONS.get(self.node.hostname)
+
     def get_ceph_version(self):
-        if self.ceph_version is None:
-            out, _ = self.shell(args=["ceph", "--format", "json", "version"])
-            match = re.search(r"[0-9]+(\.[-0-9]+)*", out)
-            if not match:
-                raise ValueError("Ceph version not found.")
+        """Return the Ceph version, probed once per gateway node."""
+        with _CEPH_VERSIONS_LOCK:
+            if self.node.hostname not in _CEPH_VERSIONS:
+                out, _ = self.shell(args=["ceph", "--format", "json", "version"])
+                match = re.search(r"[0-9]+(\.[-0-9]+)*", out)
+                if not match:
+                    raise ValueError("Ceph version not found.")
+
+                _CEPH_VERSIONS[self.node.hostname] = match.group()
+
+        return _CEPH_VERSIONS[self.node.hostname]
+
+    def uses_server_address(self):
+        """Return True when the gateway address is passed as --server-address."""
+        return _version_tuple(self.get_ceph_version()) > SERVER_ADDRESS_VERSION
 
-            self.ceph_version = match.group()
+    def run_grpc(self, entity, action, cmd_args):
+        """Run the operation over the gateway gRPC channel.
 
-        return self.ceph_version
+        Returns:
+            tuple of the json output and error like the CLI, None when the
+            operation has no gRPC translation or is not supported by the gateway
+        """
+        request = to_grpc_request(entity, action, cmd_args)
+        if request is None or request[0] in self.grpc_session.unsupported:
+            return None
+
+        method, fields = request
+        try:
+            response = self.grpc_session.call(method, **fields)
+        except NotImplementedError as err:
+            LOG.warning(f"{err}, using the CLI for {method}")
+            self.grpc_session.unsupported.add(method)
+            return None
+
+        return json.dumps(response, indent=4), ""
 
     @substitute_keys(KEY_MAP)
     def run_nvme_cli(self, entity, action, **kwargs):
@@ -81,6 +145,14 @@ class BaseCLI:
 
         cmd_args = kwargs.get("args", {})
 
+        # The gRPC responses are the json output of the CLI, the helper only
+        # opens insecure channels hence mTLS gateways use the CLI
+        use_grpc = self.grpc_session and not self.mtls
+        if use_grpc and base_cmd_args.get("format") == "json":
+            result = self.run_grpc(entity, action, cmd_args)
+            if result is not None:
+                return result
+
         # Gateway group
         if not cmd_args.get("gw_group"):
             cmd_args["gw_group"] = self.gateway_group
@@ -88,7 +160,7 @@ class BaseCLI:
         # Gateway address
         # TODO: Remove this once we have a proper way to determine right argument for the command.
         if not cmd_args.get("traddr") or not cmd_args.get("server_address"):
-            if self.get_ceph_version() > "20.1.0-145":
+            if self.uses_server_address():
                 cmd_args["server_address"] = self.node.ip_address
             else:
                 cmd_args["traddr"] = self.node.ip_address
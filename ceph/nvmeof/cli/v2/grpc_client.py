@@ -0,0 +1,315 @@
+"""Ceph-NVMeoF gateway gRPC client module.
+
+Gateway operations are sent to the gateway control port over one gRPC channel
+kept open per gateway, instead of starting a `cephadm shell` container for
+every command. The channel is held by utility/nvmeof_grpc_helper.py running in
+the gateway container, which ships the stubs matching the gateway version.
+The helper is driven through a single SSH session.
+
+CLI arguments are translated into the gRPC request fields of the operations
+listed in GRPC_METHODS, the other operations use the CLI.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+from ceph.ceph import CommandFailed, read_available, wait_for_channels
+from utility.log import Log
+
+LOG = Log(__name__)
+
+GRPC_HELPER_SCRIPT = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+    ),
+    "utility",
+    "nvmeof_grpc_helper.py",
+)
+GRPC_HELPER_REMOTE_PATH = "/tmp/nvmeof_grpc_helper.py"
+
+# Timeout of a gateway call in seconds
+GRPC_TIMEOUT = 300
+
+# Requests sent per batch and calls in flight within a batch
+GRPC_BATCH_SIZE = 500
+GRPC_BATCH_CONCURRENCY = 32
+
+# (entity, action) -> (gRPC method, {CLI argument: request field})
+GRPC_METHODS = {
+    ("subsystem", "add"): (
+        "create_subsystem",
+        {
+            "nqn": "subsystem_nqn",
+            "serial_number": "serial_number",
+            "max_namespaces": "max_namespaces",
+            "no-group-append": "no_group_append",
+            "dhchap-key": "dhchap_key",
+        },
+    ),
+    ("subsystem", "del"): (
+        "delete_subsystem",
+        {"nqn": "subsystem_nqn", "force": "force", "force=true": "force"},
+    ),
+    ("subsystem", "list"): (
+        "list_subsystems",
+        {"nqn": "subsystem_nqn", "serial_number": "serial_number"},
+    ),
+    ("ns", "add"): (
+        "namespace_add",
+        {
+            "nqn": "subsystem_nqn",
+            "rbd_pool": "rbd_pool_name",
+            "rbd_image_name": "rbd_image_name",
+            "rbd_image_size": "size",
+            "rbd-image-size": "size",
+            "nsid": "nsid",
+            "uuid": "uuid",
+            "block_size": "block_size",
+            "load_balancing_group": "anagrpid",
+            "create-image": "create_image",
+            "force": "force",
+            "no-auto-visible": "no_auto_visible",
+            "trash-image": "trash_image",
+            "disable-auto-resize": "disable_auto_resize",
+            "read-only": "read_only",
+            "rados_namespace": "rados_namespace_name",
+        },
+    ),
+    ("ns", "del"): (
+        "namespace_delete",
+        {"nqn": "subsystem_nqn", "nsid": "nsid", "uuid": "uuid"},
+    ),
+    ("ns", "list"): (
+        "list_namespaces",
+        {"nqn": "subsystem", "nsid": "nsid", "uuid": "uuid"},
+    ),
+    ("host", "add"): (
+        "add_host",
+        {"nqn": "subsystem_nqn", "host_nqn": "host_nqn", "dhchap-key": "dhchap_key"},
+    ),
+    ("listener", "add"): (
+        "create_listener",
+        {
+            "nqn": "nqn",
+            "host_name": "host_name",
+            "traddr": "traddr",
+            "trsvcid": "trsvcid",
+            "adrfam": "adrfam",
+        },
+    ),
+}
+
+# CLI arguments handled by the gateway session itself
+_SESSION_ARGS = ("gw_group", "server_address", "traddr")
+
+_SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+def _size_in_bytes(size):
+    match = re.fullmatch(r"(\d+)\s*([KMGT]?)(i?B)?", str(size).strip(), re.I)
+    if not match:
+        raise ValueError(f"Invalid size {size}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def _value(field, value):
+    # flags are passed to the CLI with empty values, the other values are
+    # converted by the helper to the types of the request fields
+    if value == "":
+        return True
+    if field == "size":
+        return _size_in_bytes(value)
+    return value
+
+
+def to_grpc_request(entity, action, cmd_args):
+    """Translate the CLI arguments of an operation into a gRPC request.
+
+    Args:
+        entity: CLI entity, like subsystem or ns
+        action: CLI action, like add or del
+        cmd_args: CLI arguments after the key substitution
+
+    Returns:
+        tuple of the gRPC method and the request fields, None when the
+        operation or one of its arguments has no gRPC translation
+    """
+    method, fields = GRPC_METHODS.get((entity, action), (None, None))
+    if method is None:
+        return None
+
+    request = dict()
+    for key, value in cmd_args.items():
+        if key in _SESSION_ARGS and not (entity == "listener" and key == "traddr"):
+            continue
+        if key not in fields:
+            return None
+        request[fields[key]] = _value(fields[key], value)
+
+    return method, request
+
+
+class GatewayGrpcSession:
+    """gRPC channel to a gateway, kept open and shared by the gateway CLIs."""
+
+    _sessions = dict()
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, node, port):
+        """Initialize the session, the channel is opened on the first request.
+
+        Args:
+            node: Gateway Node instance (CephNode)
+            port: gateway control port
+        """
+        self.node = node
+        self.port = port
+        self.unsupported = set()
+        self._channel = None
+        self._buffer = bytearray()
+        self._stderr = bytearray()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, node, port):
+        """Return the session of the gateway, opened once per gateway."""
+        with cls._sessions_lock:
+            key = (node.ip_address, int(port))
+            if key not in cls._sessions:
+                cls._sessions[key] = cls(node, port)
+            return cls._sessions[key]
+
+    def _container(self):
+        out, _ = self.node.exec_command(
+            cmd="podman ps --filter name=nvmeof --format '{{.Names}}'", sudo=True
+        )
+        names = out.split()
+        if not names:
+            raise CommandFailed(
+                f"NVMeoF gateway container not found on {self.node.hostname}"
+            )
+        return names[0]
+
+    def _start(self):
+        with open(GRPC_HELPER_SCRIPT) as script:
+            remote = self.node.remote_file(
+                sudo=True, file_name=GRPC_HELPER_REMOTE_PATH, file_mode="w"
+            )
+            remote.write(script.read())
+            remote.flush()
+            remote.close()
+
+        cmd = (
+            f"podman exec -i {self._container()} python3 -u -c "
+            f'"$(cat {GRPC_HELPER_REMOTE_PATH})" {self.node.ip_address}:{self.port}'
+        )
+        LOG.info(f"Opening gRPC session to {self.node.ip_address}:{self.port}")
+        self._buffer.clear()
+        self._stderr.clear()
+        self._channel = self.node.root_connection.open_channel(timeout=GRPC_TIMEOUT)
+        self._channel.exec_command(cmd)
+
+    def _readline(self, timeout):
+        end_time = datetime.now() + timedelta(seconds=timeout)
+        while b"\n" not in self._buffer:
+            if self._channel.exit_status_ready() and not self._channel.recv_ready():
+                self.close()
+                raise CommandFailed(
+                    f"gRPC session to {self.node.ip_address} exited: "
+                    f"{self._stderr.decode(errors='replace')}"
+                )
+            if datetime.now() > end_time:
+                self.close()
+                raise CommandFailed(
+                    f"gRPC session to {self.node.ip_address} timed out after {timeout}s"
+                )
+
+            wait_for_channels([self._channel])
+            self._buffer.extend(read_available(self._channel))
+            self._stderr.extend(read_available(self._channel, stderr=True))
+
+        line, _, rest = bytes(self._buffer).partition(b"\n")
+        self._buffer[:] = rest
+        return json.loads(line)
+
+    def request(self, payload, timeout=GRPC_TIMEOUT):
+        """Send a request to the helper and return its response."""
+        with self._lock:
+            if self._channel is None or self._channel.closed:
+                self._start()
+            payload = dict(payload, timeout=timeout)
+            self._channel.sendall((json.dumps(payload) + "\n").encode())
+            return self._readline(timeout + GRPC_TIMEOUT)
+
+    def call(self, method, timeout=GRPC_TIMEOUT, **fields):
+        """Call a gateway method.
+
+        Args:
+            method: gRPC method, like namespace_add
+            timeout: timeout of the call in seconds
+            fields: request fields
+
+        Returns:
+            the response as a dict, like the CLI json output
+
+        Raises:
+            NotImplementedError: when the gateway does not support the request
+            CommandFailed: when the call fails
+        """
+        result = self.request({"method": method, "request": fields}, timeout)
+        if result.get("unsupported"):
+            raise NotImplementedError(result["error"])
+        if not result["ok"]:
+            raise CommandFailed(
+                f"{method} failed on gateway {self.node.ip_address}: {result['error']}"
+            )
+        return result["response"]
+
+    def batch(
+        self,
+        method,
+        requests,
+        concurrency=GRPC_BATCH_CONCURRENCY,
+        batch_size=GRPC_BATCH_SIZE,
+        timeout=GRPC_TIMEOUT,
+    ):
+        """Call a gateway method with many requests.
+
+        The requests are streamed to the gateway in batches of batch_size,
+        with up to concurrency calls in flight on the channel.
+
+        Args:
+            method: gRPC method, like namespace_add
+            requests: list of request fields
+            concurrency: calls in flight
+            batch_size: requests sent at once to the helper
+            timeout: timeout of a call in seconds
+
+        Returns:
+            list of results in request order, dicts with ok, response and error
+        """
+        results = []
+        for start in range(0, len(requests), batch_size):
+            chunk = requests[start : start + batch_size]
+            response = self.request(
+                {"method": method, "batch": chunk, "concurrency": concurrency},
+                timeout=timeout * (len(chunk) // concurrency + 1),
+            )
+            results.extend(response["results"])
+            LOG.info(
+                f"{method}: {len(results)}/{len(requests)} requests sent to "
+                f"{self.node.ip_address}"
+            )
+
+        return results
+
+    def close(self):
+        """Close the channel, the helper exits with it."""
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
@@ -1,4 +1,9 @@
+import json
+
+from ceph.ceph import CommandFailed
+from ceph.nvmeof.cli.v2.base_cli import KEY_MAP as BASE_KEY_MAP
 from ceph.nvmeof.cli.v2.base_cli import BaseCLI
+from ceph.nvmeof.cli.v2.grpc_client import GRPC_BATCH_CONCURRENCY, to_grpc_request
 
 from .common import substitute_keys
 
@@ -27,6 +32,59 @@ class Namespace:
         """Adds namespace for subsystem."""
         return self.base.run_nvme_cli(self.name, "add", **kwargs)
 
+    def add_bulk(self, namespaces, concurrency=GRPC_BATCH_CONCURRENCY):
+        """Adds many namespaces at once.
+
+        The namespaces are streamed over the gateway gRPC channel when enabled,
+        added one by one with the CLI otherwise.
+
+        Args:
+            namespaces: list of namespace add args, like the args of add
+            concurrency: namespaces added at once over gRPC
+
+        Returns:
+            list of the namespace add responses, in the given order
+        """
+        session = self.base.grpc_session
+        requests = []
+        for args in namespaces:
+            args = {BASE_KEY_MAP.get(k, k): v for k, v in args.items()}
+            args = {KEY_MAP.get(k, k): v for k, v in args.items()}
+            requests.append(to_grpc_request(self.name, "add", args))
+
+        results = None
+        if (
+            session
+            and not self.base.mtls
+            and None not in requests
+            and "namespace_add" not in session.unsupported
+        ):
+            results = session.batch(
+                "namespace_add", [fields for _, fields in requests], concurrency
+            )
+            if all(result.get("unsupported") for result in results):
+                session.unsupported.add("namespace_add")
+
+        # the namespaces the gateway could not take over gRPC are added by the CLI
+        results = results or [None] * len(namespaces)
+        for index, (args, result) in enumerate(zip(namespaces, results)):
+            if result is None or result.get("unsupported"):
+                out, _ = self.add(base_cmd_args={"format": "json"}, args=dict(args))
+                results[index] = {"ok": True, "response": json.loads(out)}
+
+        failed = [
+            (args, result["error"])
+            for args, result in zip(namespaces, results)
+            if not result["ok"]
+        ]
+        if failed:
+            raise CommandFailed(
+                f"{len(failed)}/{len(namespaces)} namespaces could not be added, "
+                f"first failures: {failed[:5]}"
+            )
+
+        return [result["response"] for result in results]
+
     @substitute_keys(FORCE_KEY_MAP)
     def add_host(self, **kwargs):
         """Add a host to a namespace."""
@@ -16,6 +16,8 @@ threads when an exception is encountered.
 Changelog:
     Version 1.0 used gevent module for parallel method execution.
     Version 2.0 uses concurrent.futures module instead of gevent.
+    Version 3.0 waits on the futures instead of polling them and runs the
+    threads on a shared pool of workers reused across the parallel blocks.
 
 You add functions to be run with the spawn method::
 
@@ -41,21 +43,175 @@ You can also specify the maximum number of worker threads/processes:
         for foo in bar:
             p.spawn(quux, foo, baz=True)
 
+Results can also be streamed in the order of completion::
+
+    with parallel() as p:
+        for foo in bar:
+            p.spawn(quux, foo, baz=True)
+        for result in p.as_completed():
+            print result
+
+A single task can be bound by its own timeout, measured from its start::
+
+    with parallel() as p:
+        p.spawn_with_timeout(300, quux, foo, baz=True)
+
 If one of the spawned functions throws an exception, it will be thrown
 when iterating over the results, or when the with block ends.
 
 When the scope of with block changes, the main thread waits until all
 spawned functions have completed within the given timeout. On timeout,
-all pending threads/processes are issued shutdown command.
+TimeoutError is raised; running threads cannot be interrupted and are left
+to complete in the background. When shutdown_cancel_pending is enabled, a
+timeout or the first exception cancels the tasks that have not started yet.
+An exception raised within the with block always cancels them.
+
+The time spent by every task in the queue and in execution is available
+with the timings property once the with block ends.
 """
 
+import contextvars
 import logging
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from datetime import datetime, timedelta
-from time import sleep
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ProcessPoolExecutor,
+)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed, wait
+from itertools import count
+from time import monotonic, time
 
 logger = logging.getLogger(__name__)
 
+# Default number of tasks of a parallel block running at the same time,
+# which is the default of ThreadPoolExecutor.
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Time an idle worker thread of the shared pool is kept around.
+WORKER_IDLE_TIMEOUT = 60
+
+# Interval to check for tasks with a timeout that are yet to start.
+TASK_POLL_INTERVAL = 1.0
+
+
+class _Task:
+    """A function spawned within a parallel block along with its timing."""
+
+    def __init__(self, fun, args, kwargs, timeout=None):
+        self.fun = fun
+        self.args = args
+        self.kwargs = kwargs
+        self.name = getattr(fun, "__qualname__", repr(fun))
+        self.timeout = timeout
+        self.future = Future()
+        self.queued = time()
+        self.started = None
+        self.finished = None
+        self.timed_out = False
+        # Run in the context of the spawning thread, e.g. the test it works for
+        self.context = contextvars.copy_context()
+
+    def run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        self.started = time()
+        try:
+            result = self.context.run(self.fun, *self.args, **self.kwargs)
+        except BaseException as e:
+            self.finished = time()
+            self.future.set_exception(e)
+        else:
+            self.finished = time()
+            self.future.set_result(result)
+        finally:
+            # Release the references held by the task
+            self.fun = self.args = self.kwargs = self.context = None
+
+    def expired(self, now):
+        """Returns True when the task is running beyond its timeout."""
+        if not (self.timeout and self.started) or self.future.done():
+            return False
+
+        return now - self.started > self.timeout
+
+    @property
+    def status(self):
+        if self.timed_out:
+            return "timeout"
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.started else "pending"
+
+        return "failed" if self.future.exception() else "done"
+
+    @property
+    def timing(self):
+        _end = self.finished or time()
+        return {
+            "name": self.name,
+            "status": self.status,
+            "queued": (self.started or _end) - self.queued,
+            "duration": _end - self.started if self.started else 0.0,
+        }
+
+
+class _SharedThreadPool:
+    """Worker threads reused by all the parallel blocks of the process.
+
+    A worker is started only when no idle worker is available and exits after
+    being idle for WORKER_IDLE_TIMEOUT. The pool itself is unbounded so that
+    nested parallel blocks can never starve each other; every parallel block
+    bounds the number of its own tasks submitted at the same time.
+    """
+
+    def __init__(self, idle_timeout=WORKER_IDLE_TIMEOUT):
+        self._idle_timeout = idle_timeout
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._ids = count()
+
+    def submit(self, task):
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                threading.Thread(
+                    target=self._worker,
+                    name=f"parallel-worker-{next(self._ids)}",
+                    daemon=True,
+                ).start()
+
+        self._queue.put(task)
+
+    def _worker(self):
+        while True:
+            try:
+                task = self._queue.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # Exit unless a task has been handed to the idle workers
+                    if self._idle:
+                        self._idle -= 1
+                        return
+                continue
+
+            task.run()
+            del task
+            with self._lock:
+                self._idle += 1
+
+
+_shared_pool = _SharedThreadPool()
+
 
 class parallel:
     """This class is a context manager for concurrent method execution."""
@@ -73,25 +229,34 @@ class parallel:
             thread_pool (bool)          Whether to use threads or processes.
             timeout (int | float)       Maximum allowed time.
             shutdown_cancel_pending (bool) If enabled, it would cancel pending tasks.
+            max_workers (int)           Maximum number of tasks running at once.
         """
-        if thread_pool:
-            self._executor = ThreadPoolExecutor(max_workers=max_workers)
-        else:
+        self._executor = None
+        if not thread_pool:
             self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._max_workers = max_workers or DEFAULT_MAX_WORKERS
         self._timeout = timeout
         self._cancel_pending = shutdown_cancel_pending
-        self._futures = list()
+        self._tasks = list()
+        self._backlog = deque()
+        self._running = 0
+        self._lock = threading.Lock()
         self._results = list()
         self._iter_index = 0
 
     @property
     def count(self):
-        return len(self._futures)
+        return len(self._tasks)
 
     @property
     def results(self):
         return self._results
 
+    @property
+    def timings(self):
+        """Returns the queue and execution time of the tasks in spawn order."""
+        return [task.timing for task in self._tasks]
+
     def spawn(self, fun, *args, **kwargs):
         """Triggers the first class method.
 
@@ -101,34 +266,140 @@ class parallel:
             kwargs      A dictionary of named variables.
 
         Returns:
-            None
+            Future of the function execution
         """
-        _future = self._executor.submit(fun, *args, **kwargs)
-        self._futures.append(_future)
+        return self._spawn(_Task(fun, args, kwargs))
 
-    def __enter__(self):
-        return self
+    def spawn_with_timeout(self, timeout, fun, *args, **kwargs):
+        """Triggers the method, failing it when it runs longer than timeout.
 
-    def __exit__(self, exc_type, exc_value, trackback):
-        _not_done = self._futures[:]
-        _end_time = datetime.now() + timedelta(
-            seconds=self._timeout if self._timeout else 3600
-        )
-
-        # Wait for all futures to complete within the given time or 1 hour.
-        while datetime.now() < _end_time:
-            # if the list is empty break
-            if len(_not_done) == 0:
+        Args:
+            timeout:    Maximum execution time of the function in seconds.
+            func:       Function to be executed.
+            args:       A list of variables to be passed to the function.
+            kwargs      A dictionary of named variables.
+
+        Returns:
+            Future of the function execution
+        """
+        return self._spawn(_Task(fun, args, kwargs, timeout=timeout))
+
+    def _spawn(self, task):
+        self._tasks.append(task)
+        if self._executor:
+            task.future = self._executor.submit(task.fun, *task.args, **task.kwargs)
+            task.started = task.queued
+            task.future.add_done_callback(lambda _: setattr(task, "finished", time()))
+            return task.future
+
+        with self._lock:
+            self._backlog.append(task)
+        self._submit_backlog()
+        return task.future
+
+    def _submit_backlog(self):
+        """Hand the queued tasks to the shared pool within max_workers."""
+        while True:
+            with self._lock:
+                if not self._backlog or self._running >= self._max_workers:
+                    return
+                task = self._backlog.popleft()
+                if task.future.cancelled():
+                    continue
+                self._running += 1
+
+            task.future.add_done_callback(self._task_done)
+            _shared_pool.submit(task)
+
+    def _task_done(self, _):
+        with self._lock:
+            self._running -= 1
+        self._submit_backlog()
+
+    def _cancel(self):
+        """Cancel the tasks that have not started yet."""
+        # Futures of the tasks not handed to the pool are never picked up by a
+        # worker, hence the waiters are notified of the cancellation here.
+        with self._lock:
+            for task in self._backlog:
+                if task.future.cancel():
+                    task.future.set_running_or_notify_cancel()
+            self._backlog.clear()
+
+        for task in self._tasks:
+            task.future.cancel()
+
+    def _wait(self):
+        """Wait for the tasks to complete within the timeouts.
+
+        Returns:
+            list of tasks not completed within the parallel block timeout
+        """
+        pending = {task.future: task for task in self._tasks}
+        _end_time = monotonic() + self._timeout if self._timeout else None
+        return_when = FIRST_EXCEPTION if self._cancel_pending else ALL_COMPLETED
+
+        while pending:
+            _now, _wall = monotonic(), time()
+            for task in list(pending.values()):
+                if task.expired(_wall):
+                    logger.error(
+                        "%s did not complete within %ss", task.name, task.timeout
+                    )
+                    task.timed_out = True
+                    del pending[task.future]
+
+            if _end_time and _now >= _end_time:
                 break
 
-            sleep(2.0)
-            for _f in _not_done:
-                if _f.done():
-                    _not_done.remove(_f)
+            # Wake up at the closest deadline of the block or of a task
+            _timeouts = [_end_time - _now] if _end_time else []
+            for task in pending.values():
+                if task.timeout and task.started:
+                    _timeouts.append(task.started + task.timeout - _wall)
+                elif task.timeout:
+                    _timeouts.append(min(TASK_POLL_INTERVAL, task.timeout))
+
+            done, _ = wait(
+                list(pending),
+                timeout=max(0, min(_timeouts)) if _timeouts else None,
+                return_when=return_when,
+            )
+            for _f in done:
+                del pending[_f]
+
+            if self._cancel_pending and any(
+                not _f.cancelled() and _f.exception() for _f in done
+            ):
+                self._cancel()
+
+        return list(pending.values())
 
-        # Graceful shutdown of running threads
-        if _not_done:
-            self._executor.shutdown(wait=False, cancel_futures=self._cancel_pending)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, trackback):
+        # Do not start the remaining tasks when the block failed
+        if exc_value is not None:
+            self._cancel()
+
+        _not_done = self._wait()
+        if _not_done and self._cancel_pending:
+            self._cancel()
+
+        if self._executor:
+            self._executor.shutdown(
+                wait=not _not_done, cancel_futures=self._cancel_pending
+            )
+
+        for _timing in self.timings:
+            logger.debug(
+                "%s %s after %.2fs in queue and %.2fs in execution",
+                _timing["name"],
+                _timing["status"],
+                _timing["queued"],
+                _timing["duration"],
+            )
 
         if exc_value is not None:
             logger.exception(trackback)
@@ -136,15 +407,43 @@ class parallel:
 
         # Check for any exceptions and raise
         # At this point, all threads/processes should have completed or cancelled
+        # The failure causing the cancellation of other tasks is raised first
         try:
-            for _f in self._futures:
-                self._results.append(_f.result())
+            for task in sorted(self._tasks, key=lambda t: t.future.cancelled()):
+                self._task_result(task, _not_done)
         except Exception:
             logger.exception("Encountered an exception during parallel execution.")
             raise
 
+        self._results.extend(task.future.result() for task in self._tasks)
         return True
 
+    def _task_result(self, task, not_done):
+        if task.timed_out:
+            raise FutureTimeoutError(
+                f"{task.name} did not complete within {task.timeout}s"
+            )
+
+        if task in not_done:
+            raise FutureTimeoutError(
+                f"{task.name} did not complete within {self._timeout}s"
+            )
+
+        return task.future.result()
+
+    def as_completed(self):
+        """Yields the results in the order the tasks complete.
+
+        Like iterating over the object, exceptions are returned as results.
+        """
+        _timeout = self._timeout if self._timeout else 3600
+        for _f in as_completed([task.future for task in self._tasks], _timeout):
+            try:
+                yield _f.result()
+            except Exception as e:
+                logger.exception(e)
+                yield e
+
     def __iter__(self):
         return self
 
@@ -156,7 +455,7 @@ class parallel:
         try:
             # Keeping timeout consistent when called within the context
             _timeout = self._timeout if self._timeout else 3600
-            out = self._futures[self._iter_index].result(timeout=_timeout)
+            out = self._tasks[self._iter_index].future.result(timeout=_timeout)
         except Exception as e:
             logger.exception(e)
             out = e
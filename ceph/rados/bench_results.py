@@ -0,0 +1,388 @@
+"""
+Module to parse the rados bench results and compare them with previous runs.
+
+`rados bench` executed with `--format json` prints a summary holding the
+bandwidth, IOPS and latency of the run. The summary is parsed into a
+BenchResult and recorded in a SQLite baseline store shared by the runs, keyed
+by suite, cluster configuration, operation, object size and concurrency.
+
+A result is flagged as a regression when one of its metrics is worse than the
+last runs of the same key by more than the run to run variation, i.e. outside
+the one sided 95% prediction interval of the previous samples, and by more
+than REGRESSION_MIN_CHANGE.
+
+rados bench only reports the average, standard deviation, minimum and maximum
+of the latency, latency percentiles are not available.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from utility.log import Log
+
+log = Log(__name__)
+
+BASELINE_DB = "rados_bench_baseline.db"
+
+# Number of previous runs compared with a new result
+BASELINE_RUNS = 10
+
+# Minimum number of previous runs needed to detect a regression
+BASELINE_MIN_RUNS = 3
+
+# Minimum relative change of a metric reported as a regression
+REGRESSION_MIN_CHANGE = 0.05
+
+# Metrics compared with the baseline and whether higher values are better
+REGRESSION_METRICS = {
+    "bandwidth_mb_sec": True,
+    "average_iops": True,
+    "average_latency": False,
+    "max_latency": False,
+}
+
+# One sided 95% t-distribution critical values by degrees of freedom
+_T_CRITICAL = {
+    1: 6.314,
+    2: 2.920,
+    3: 2.353,
+    4: 2.132,
+    5: 2.015,
+    6: 1.943,
+    7: 1.895,
+    8: 1.860,
+    9: 1.833,
+    10: 1.812,
+    15: 1.753,
+    20: 1.725,
+    30: 1.697,
+}
+
+# Summary lines of the plain output mapped to the keys of the json output
+_TEXT_KEYS = {
+    "Total time run": "total_time_run",
+    "Total writes made": "total_writes_made",
+    "Total reads made": "total_reads_made",
+    "Write size": "write_size",
+    "Read size": "read_size",
+    "Object size": "object_size",
+    "Bandwidth (MB/sec)": "bandwidth_MB_sec",
+    "Stddev Bandwidth": "stddev_bandwidth",
+    "Max bandwidth (MB/sec)": "max_bandwidth_MB_sec",
+    "Min bandwidth (MB/sec)": "min_bandwidth_MB_sec",
+    "Average IOPS": "average_iops",
+    "Stddev IOPS": "stddev_iops",
+    "Max IOPS": "max_iops",
+    "Min IOPS": "min_iops",
+    "Average Latency(s)": "average_latency",
+    "Stddev Latency(s)": "stddev_latency",
+    "Max latency(s)": "max_latency",
+    "Min latency(s)": "min_latency",
+}
+
+
+@dataclass
+class BenchResult:
+    """
+    Summary of a rados bench run.
+
+    Attributes:
+        op: bench mode, write, seq or rand
+        bandwidth_mb_sec: average bandwidth in MB/sec
+        average_iops: average operations per second
+        average_latency: average latency in seconds
+        run_name: bench run name used to read back or cleanup the objects
+        raw: summary as reported by rados bench
+        regressions: metrics worse than the previous runs, refer check_regression
+    """
+
+    op: str
+    bandwidth_mb_sec: float = 0.0
+    stddev_bandwidth: float = 0.0
+    max_bandwidth_mb_sec: float = 0.0
+    min_bandwidth_mb_sec: float = 0.0
+    average_iops: float = 0.0
+    stddev_iops: float = 0.0
+    max_iops: float = 0.0
+    min_iops: float = 0.0
+    average_latency: float = 0.0
+    stddev_latency: float = 0.0
+    max_latency: float = 0.0
+    min_latency: float = 0.0
+    total_time_run: float = 0.0
+    total_ops: int = 0
+    op_size: int = 0
+    object_size: int = 0
+    concurrent_ops: int = 0
+    run_name: str = None
+    raw: dict = field(default_factory=dict, repr=False)
+    regressions: list = field(default_factory=list)
+
+    @property
+    def metrics(self):
+        """Return the numeric metrics of the result."""
+        return {
+            k: v
+            for k, v in asdict(self).items()
+            if k not in ("op", "run_name", "raw", "regressions")
+        }
+
+    @classmethod
+    def from_summary(cls, op, summary, **kw):
+        """
+        Build the result from the summary of rados bench
+        Args:
+            op: bench mode, write, seq or rand
+            summary: summary keys and values as printed using --format json
+            kw: additional attributes, like run_name
+        """
+
+        def _num(*keys, cast=float):
+            for key in keys:
+                if summary.get(key) not in (None, ""):
+                    return cast(float(summary[key]))
+            return cast(0)
+
+        return cls(
+            op=op,
+            bandwidth_mb_sec=_num("bandwidth_MB_sec"),
+            stddev_bandwidth=_num("stddev_bandwidth"),
+            max_bandwidth_mb_sec=_num("max_bandwidth_MB_sec"),
+            min_bandwidth_mb_sec=_num("min_bandwidth_MB_sec"),
+            average_iops=_num("average_iops"),
+            stddev_iops=_num("stddev_iops"),
+            max_iops=_num("max_iops"),
+            min_iops=_num("min_iops"),
+            average_latency=_num("average_latency"),
+            stddev_latency=_num("stddev_latency"),
+            max_latency=_num("max_latency"),
+            min_latency=_num("min_latency"),
+            total_time_run=_num("total_time_run"),
+            total_ops=_num("total_writes_made", "total_reads_made", cast=int),
+            op_size=_num("write_size", "read_size", cast=int),
+            object_size=_num("object_size", cast=int),
+            concurrent_ops=_num("concurrent_ops", cast=int),
+            raw=summary,
+            **kw,
+        )
+
+
+def parse_bench_output(out, op, **kw):
+    """
+    Parse the output of rados bench into a BenchResult
+
+    The json summary printed using `--format json` is preferred, the summary
+    lines of the plain output are parsed otherwise.
+
+    Args:
+        out: output of the rados bench command
+        op: bench mode, write, seq or rand
+        kw: additional attributes of the result, like run_name
+    Returns:
+        BenchResult
+    Raises:
+        ValueError when the output does not hold a summary
+    """
+    summary = None
+    for line in out.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and "bandwidth_MB_sec" in data:
+            summary = data
+
+    if summary is None:
+        summary = dict()
+        for line in out.splitlines():
+            key, sep, value = line.partition(":")
+            if sep and key.strip() in _TEXT_KEYS:
+                value = re.match(r"\s*(-?[\d.]+(e-?\d+)?)", value)
+                if value:
+                    summary[_TEXT_KEYS[key.strip()]] = value.group(1)
+
+    if "bandwidth_MB_sec" not in summary:
+        raise ValueError(f"rados bench {op} summary not found in the output")
+
+    return BenchResult.from_summary(op, summary, **kw)
+
+
+def baseline_store_path(run_dir):
+    """
+    Return the baseline store shared by the runs of the given run directory.
+
+    The store is placed in the parent of the run directory, so the runs logged
+    to the same location are compared with each other.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(run_dir)), BASELINE_DB)
+
+
+def _t_critical(dof):
+    """Return the critical value, conservatively rounding down the degrees of freedom."""
+    if dof > 30:
+        return 1.645
+    return _T_CRITICAL[max(k for k in _T_CRITICAL if k <= max(dof, 1))]
+
+
+class BaselineStore:
+    """SQLite store of the rados bench results of the previous runs."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rados_bench (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created REAL NOT NULL,
+            suite TEXT NOT NULL,
+            build TEXT,
+            cluster_conf TEXT NOT NULL,
+            op TEXT NOT NULL,
+            object_size INTEGER NOT NULL,
+            concurrent_ops INTEGER NOT NULL,
+            metrics TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS rados_bench_key ON rados_bench (
+            suite, cluster_conf, op, object_size, concurrent_ops, created
+        );
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the store, creating it when required
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(self._SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=60)
+
+    @staticmethod
+    def _key(result, suite, cluster_conf):
+        return (
+            suite,
+            cluster_conf or "",
+            result.op,
+            result.object_size,
+            result.concurrent_ops,
+        )
+
+    def record(self, result, suite, build=None, cluster_conf=None):
+        """
+        Record the result of a run
+        Args:
+            result: BenchResult to be recorded
+            suite: name of the suite or test executing the benchmark
+            build: ceph build under test
+            cluster_conf: name of the cluster configuration
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO rados_bench (created, suite, build, cluster_conf, op, "
+                "object_size, concurrent_ops, metrics) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), suite, build)
+                + self._key(result, suite, cluster_conf)[1:]
+                + (json.dumps(result.metrics),),
+            )
+
+    def history(self, result, suite, cluster_conf=None, limit=BASELINE_RUNS):
+        """
+        Return the metrics of the last runs matching the result, newest first
+        Args:
+            result: BenchResult used to select the runs
+            suite: name of the suite or test executing the benchmark
+            cluster_conf: name of the cluster configuration
+            limit: maximum number of runs returned
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT build, metrics FROM rados_bench WHERE suite = ? AND "
+                "cluster_conf = ? AND op = ? AND object_size = ? AND "
+                "concurrent_ops = ? ORDER BY created DESC LIMIT ?",
+                self._key(result, suite, cluster_conf) + (limit,),
+            ).fetchall()
+
+        return [dict(json.loads(metrics), build=build) for build, metrics in rows]
+
+    def check_regression(self, result, suite, cluster_conf=None, limit=BASELINE_RUNS):
+        """
+        Compare the result with the last runs of the same suite
+        Args:
+            result: BenchResult to be compared
+            suite: name of the suite or test executing the benchmark
+            cluster_conf: name of the cluster configuration
+            limit: number of previous runs compared with
+        Returns:
+            list of regressions, a dict per metric with the value, the mean and
+            standard deviation of the previous runs and the relative change
+        """
+        runs = self.history(result, suite, cluster_conf, limit=limit)
+        if len(runs) < BASELINE_MIN_RUNS:
+            log.info(
+                f"Only {len(runs)} previous rados bench {result.op} runs of {suite}, "
+                f"at least {BASELINE_MIN_RUNS} are needed to detect regressions"
+            )
+            return []
+
+        regressions = []
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            samples = [run[metric] for run in runs if run.get(metric)]
+            value = getattr(result, metric)
+            if len(samples) < BASELINE_MIN_RUNS or not value:
+                continue
+
+            mean = statistics.mean(samples)
+            stdev = statistics.stdev(samples)
+            margin = (
+                _t_critical(len(samples) - 1) * stdev * math.sqrt(1 + 1 / len(samples))
+            )
+            change = (value - mean) / mean
+            worse = -change if higher_is_better else change
+            if worse > REGRESSION_MIN_CHANGE and abs(value - mean) > margin:
+                regressions.append(
+                    {
+                        "metric": metric,
+                        "value": value,
+                        "mean": mean,
+                        "stdev": stdev,
+                        "change": change,
+                        "runs": len(samples),
+                    }
+                )
+
+        for regression in regressions:
+            log.error(
+                f"rados bench {result.op} regression on {suite}: {regression['metric']} "
+                f"{regression['value']:.3f} vs {regression['mean']:.3f} "
+                f"(stdev {regression['stdev']:.3f}) over the last {regression['runs']} "
+                f"runs, {regression['change']:+.1%}"
+            )
+
+        return regressions
+
+    def compare_and_record(self, result, suite, build=None, cluster_conf=None):
+        """
+        Check the result for regressions and record it
+        Args:
+            result: BenchResult of the run
+            suite: name of the suite or test executing the benchmark
+            build: ceph build under test
+            cluster_conf: name of the cluster configuration
+        Returns:
+            list of regressions, refer check_regression
+        """
+        regressions = self.check_regression(result, suite, cluster_conf)
+        self.record(result, suite, build=build, cluster_conf=cluster_conf)
+        return regressions
@@ -22,8 +22,11 @@ from typing import Optional
 
 from ceph.ceph import CommandFailed, SocketTimeoutException, TimeoutException
 from ceph.ceph_admin import CephAdmin
+from ceph.log_scanner import daemon_unit, grep_command
 from ceph.parallel import parallel
 from ceph.rados import utils as osd_utils
+from ceph.rados.state_cache import get_state_cache
+from ceph.waiter import WaitUntil
 from tests.rados.rados_test_util import wait_for_device_rados
 from utility import utils
 from utility.log import Log
@@ -49,6 +52,7 @@ class RadosOrchestrator:
         self.ceph_cluster = node.cluster
         self.client = node.cluster.get_nodes(role="client")[0]
         self.rhbuild = node.config.get("rhbuild")
+        self.state_cache = get_state_cache(self.ceph_cluster)
 
     def change_recovery_flags(self, action, flags: list = None):
         """Sets and unsets the recovery flags on the cluster
@@ -90,7 +94,7 @@ class RadosOrchestrator:
         """
         log.debug(f"Checking the PG state for PG ID : {pgid} ")
         cmd = "ceph pg dump pgs"
-        pg_stats = self.run_ceph_command(cmd)
+        pg_stats = self.run_ceph_command(cmd, fresh=True)
         for pg in pg_stats["pg_stats"]:
             if pg["pgid"] == pgid:
                 return pg["state"]
@@ -167,24 +171,31 @@ class RadosOrchestrator:
         client_exec: bool = False,
         print_output: bool = False,
         return_err: bool = False,
+        fresh: bool = False,
     ):
         """
         Runs ceph commands with json tag for the action specified otherwise treats action as command
         and returns formatted output
+
+        Read-only queries like `ceph osd tree` or `ceph pg dump` are served from the
+        cluster state cache when issued again shortly, see ceph.rados.state_cache.
         Args:
             print_output: bool to print output and error
             cmd: Command that needs to be run
             timeout: Maximum time allowed for execution.
             client_exec: Selection if true, runs the command on the client node
+            fresh: bypass the cluster state cache, for assertions needing current data
         Returns: dictionary of the output
         """
 
-        cmd = f"{cmd} -f json"
-        try:
+        def _run(_cmd):
+            _cmd = f"{_cmd} -f json"
             if client_exec:
-                out, err = self.client.exec_command(cmd=cmd, sudo=True, timeout=timeout)
-            else:
-                out, err = self.node.shell([cmd], timeout=timeout, print_output=False)
+                return self.client.exec_command(cmd=_cmd, sudo=True, timeout=timeout)
+            return self.node.shell([_cmd], timeout=timeout, print_output=False)
+
+        try:
+            out, err = self.state_cache.get(cmd, _run, fresh=fresh)
         except Exception as er:
             log.error(f"Exception hit while command execution. {er}")
             raise
@@ -447,6 +458,7 @@ class RadosOrchestrator:
                 - background (bool) -> run rados bench as background process and continue with test execution
                 - nocleanup (bool) -> if false, the nocleanup flag will not be added and the objects would be deleted
                 - timeout (int) -> user defined timeout for rados bench process
+                - output_file (str) -> file storing the json summary of a background run
         Returns: True -> pass, False -> fail
         """
         duration = kwargs.get("rados_write_duration", 200)
@@ -467,7 +479,10 @@ class RadosOrchestrator:
             cmd = f"{cmd} --max-objects {max_objs}"
         if kwargs.get("background"):
             check_ec = False
-            cmd = f"{cmd} &> /dev/null &"
+            if kwargs.get("output_file"):
+                cmd = f"{cmd} --format json > {kwargs['output_file']} 2> /dev/null &"
+            else:
+                cmd = f"{cmd} &> /dev/null &"
         log.info(f"check_ec: {check_ec}")
 
         try:
@@ -732,6 +747,20 @@ class RadosOrchestrator:
         )
         return out["up"]
 
+    def exec_mutation(self, cmd: str, **kwargs):
+        """
+        Runs a command changing the cluster state on the client node, the cached
+        cluster state is dropped so that the follow-up queries see the change
+        Args:
+            cmd: Command that needs to be run
+            kwargs: other args passed to exec_command
+        Returns: output of exec_command
+        """
+        try:
+            return self.client.exec_command(cmd=cmd, sudo=True, **kwargs)
+        finally:
+            self.state_cache.invalidate()
+
     def run_scrub(self, **kwargs):
         """
         Run scrub on the given OSD or on all OSD's
@@ -754,7 +783,7 @@ class RadosOrchestrator:
         else:
             # scrubbing all the OSD's
             cmd = "ceph osd scrub all"
-        self.client.exec_command(cmd=cmd, sudo=True)
+        self.exec_mutation(cmd=cmd)
 
     def run_deep_scrub(self, **kwargs):
         """
@@ -778,7 +807,7 @@ class RadosOrchestrator:
         else:
             # scrubbing all the OSD's
             cmd = "ceph osd deep-scrub all"
-        self.client.exec_command(cmd=cmd, sudo=True)
+        self.exec_mutation(cmd=cmd)
 
     def collect_osd_daemon_ids(self, osd_node) -> list:
         """
@@ -1202,7 +1231,7 @@ class RadosOrchestrator:
         """
         # setting config is set to allow pool deletion
         cmd = "ceph config set mon mon_allow_pool_delete true"
-        self.client.exec_command(cmd=cmd, sudo=True)
+        self.exec_mutation(cmd=cmd)
 
         existing_pools = self.run_ceph_command(cmd="ceph df", client_exec=True)
         if pool not in [ele["name"] for ele in existing_pools["pools"]]:
@@ -1230,7 +1259,7 @@ class RadosOrchestrator:
                 rule_list = self.get_crush_rule_names()
                 if pool in rule_list:
                     cmd = f"ceph osd crush rule rm {pool}"
-                    self.client.exec_command(cmd=cmd, sudo=True)
+                    self.exec_mutation(cmd=cmd)
             except Exception as err:
                 log.error(
                     f"hit issue while deleting crush rule and profile for the EC pool"
@@ -2060,7 +2089,7 @@ class RadosOrchestrator:
         return out.strip()
 
     def get_journalctl_log(
-        self, start_time, end_time, daemon_type: str, daemon_id: str
+        self, start_time, end_time, daemon_type: str, daemon_id: str, patterns=None
     ) -> str:
         """
         Retrieve logs for the requested daemon using journalctl command
@@ -2072,20 +2101,24 @@ class RadosOrchestrator:
             end_time: time to stop reading the journalctl logs - format ('2022-07-20 10:58:49')
             daemon_type: ceph service type (mon, mgr ...)
             daemon_id: Name of the service, OSD ID in case of OSDs
+            patterns: list of strings, only the lines holding one of them are
+                      returned, filtered on the host in a single grep pass
         Returns:  journal_logs
         """
         fsid = self.run_ceph_command(cmd="ceph fsid")["fsid"]
         host = self.fetch_host_node(daemon_type=daemon_type, daemon_id=daemon_id)
         if daemon_type == "osd" or daemon_type == "mgr":
-            systemctl_name = f"ceph-{fsid}@{daemon_type}.{daemon_id}.service"
+            daemon_name = f"{daemon_type}.{daemon_id}"
         elif daemon_type == "mon":
-            systemctl_name = f"ceph-{fsid}@{daemon_type}.{host.hostname}.service"
+            daemon_name = f"{daemon_type}.{host.hostname}"
         else:
-            systemctl_name = f"ceph-{fsid}@{daemon_type}.{host.shortname}.service"
+            daemon_name = f"{daemon_type}.{host.shortname}"
+        systemctl_name = daemon_unit(fsid, daemon_name)
+        cmd = f"sudo journalctl -u {systemctl_name} --since '{start_time.strip()}' --until '{end_time.strip()}'"
+        if patterns:
+            cmd += f" | {grep_command(patterns)}"
         try:
-            log_lines, err = host.exec_command(
-                cmd=f"sudo journalctl -u {systemctl_name} --since '{start_time.strip()}' --until '{end_time.strip()}'"
-            )
+            log_lines, err = host.exec_command(cmd=cmd, check_ec=not patterns)
         except Exception as er:
             log.error(f"Exception hit while command execution. {er}")
             raise
@@ -3442,7 +3475,7 @@ EOF"""
 
         # restart each service for the input daemon
         for service in daemon_services:
-            self.client.exec_command(cmd=f"ceph orch restart {service}", sudo=True)
+            self.exec_mutation(cmd=f"ceph orch restart {service}")
 
         end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
         # wait for each daemon to restart
@@ -3837,9 +3870,8 @@ EOF"""
         else:
             log.debug("Initiated scheduled scrub")
 
-        start_time = datetime.datetime.now()
-        while datetime.datetime.now() <= start_time + datetime.timedelta(
-            seconds=wait_time
+        for _ in WaitUntil(
+            timeout=wait_time, interval=5, backoff=1.5, max_interval=30, jitter=0.1
         ):
             pool_pg_dump = self.get_ceph_pg_dump(pg_id=pg_id)
             log.debug("=" * 70)
@@ -3873,12 +3905,11 @@ EOF"""
                     f" {current_scrub_stamp - init_scrub_stamp}"
                 )
                 log.info(
-                    f"scrub is yet to complete, pg state: {pool_pg_dump['state']}. Sleeping for 30 secs"
+                    f"scrub is yet to complete, pg state: {pool_pg_dump['state']}."
                 )
-                time.sleep(30)
-        else:
-            log.error(f"PG :{pg_id} could not be scrubbed in time")
-            raise Exception("Objects not scrubbed error")
+
+        log.error(f"PG :{pg_id} could not be scrubbed in time")
+        raise Exception("Objects not scrubbed error")
 
     def start_check_deep_scrub_complete(
         self, pg_id, pg_dump=None, user_initiated: bool = True, wait_time: int = 900
@@ -5261,7 +5292,7 @@ EOF"""
                 service_type=service_type, unmanaged=True
             )
         cmd_set_unmanaged_flag = f"ceph orch set-unmanaged {service_name}"
-        self.client.exec_command(sudo=True, cmd=cmd_set_unmanaged_flag)
+        self.exec_mutation(cmd=cmd_set_unmanaged_flag)
         base_cmd = "ceph orch ls"
         cmd = f"{base_cmd} {service_type} {service_name}"
         duration = 300  # 5 minutes
@@ -5302,7 +5333,7 @@ EOF"""
             )
             return True
         cmd_set_managed_flag = f"ceph orch set-managed {service_name}"
-        self.client.exec_command(sudo=True, cmd=cmd_set_managed_flag)
+        self.exec_mutation(cmd=cmd_set_managed_flag)
         base_cmd = "ceph orch ls"
         cmd = f"{base_cmd} {service_type} {service_name}"
         duration = 300  # 5 minutes
@@ -5606,7 +5637,7 @@ EOF"""
             log.debug(f"Contents of {service_type} spec file : {out}")
             apply_cmd = f"ceph orch apply -i {file_name}"
             log.info(f"Applying the spec file via cmd : {apply_cmd}")
-            self.client.exec_command(cmd=apply_cmd, sudo=True)
+            self.exec_mutation(cmd=apply_cmd)
             time.sleep(10)
         out = self.list_orch_services(service_type=service_type, export=True)
         for _service in out:
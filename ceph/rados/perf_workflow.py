@@ -7,6 +7,7 @@ import time
 from math import floor
 
 from ceph.ceph_admin import CephAdmin
+from ceph.rados.bench_results import parse_bench_output
 from ceph.rados.core_workflows import RadosOrchestrator
 from utility.log import Log
 from utility.utils import method_should_succeed
@@ -28,6 +29,7 @@ class PerfWorkflows:
         self.rados_obj = RadosOrchestrator(node=node)
         self.cluster = node.cluster
         self.clients = node.cluster.get_nodes(role="client")
+        self.bench_outputs = []
 
     def create_pool_per_config(self, **pool_config):
         """
@@ -133,6 +135,15 @@ class PerfWorkflows:
         Returns:
             PID of radosbench process triggered in the node
         """
+        if bench_cfg.get("background"):
+            bench_cfg.setdefault(
+                "output_file",
+                f"/tmp/radosbench-{_pool_name}-{node.hostname}-{int(time.time())}.json",
+            )
+            # bench_write runs rados bench from the client of the orchestrator,
+            # the output file of every trigger is read back from that node
+            self.bench_outputs.append((self.rados_obj.client, bench_cfg["output_file"]))
+
         if not self.rados_obj.bench_write(pool_name=_pool_name, **bench_cfg):
             log.error(f"radosbench failed for config: {bench_cfg}")
             raise Exception(f"radosbench failed on node: {node.hostname}")
@@ -158,3 +169,38 @@ class PerfWorkflows:
             )
             raise ValueError(f"Process ID for rados bench on {node.hostname} not found")
         return pid
+
+    def collect_radosbench_results(self, baseline=None) -> list:
+        """
+        Method to parse the results of the radosbench runs triggered
+        in the background, once they are completed
+        Args:
+            baseline: dictionary object used to record the results and
+            check them for regressions, refer RadosBench.run_bench
+        Returns:
+            list of BenchResult of the completed runs
+        """
+        results = []
+        for node, output_file in self.bench_outputs:
+            out, _ = node.exec_command(
+                cmd=f"cat {output_file}", sudo=True, check_ec=False
+            )
+            try:
+                result = parse_bench_output(out, "write")
+            except ValueError:
+                log.error(
+                    f"radosbench result not found in {output_file} on {node.hostname}"
+                )
+                continue
+
+            log.info(
+                f"radosbench on {node.hostname}: {result.bandwidth_mb_sec} MB/sec, "
+                f"{result.average_iops} IOPS, {result.average_latency}s average latency"
+            )
+            if baseline:
+                _baseline = dict(baseline)
+                store = _baseline.pop("store")
+                result.regressions = store.compare_and_record(result, **_baseline)
+            results.append(result)
+
+        return results
@@ -5,7 +5,10 @@ Module to change pool attributes
 """
 
 import datetime
+import json
+import os
 import random
+import re
 import time
 import traceback
 
@@ -13,9 +16,27 @@ from ceph.ceph_admin import CephAdmin
 from ceph.rados.core_workflows import RadosOrchestrator
 from ceph.rados.rados_scrub import RadosScrubber
 from utility.log import Log
+from utility.utils import generate_unique_id
 
 log = Log(__name__)
 
+BULK_IO_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "utility",
+    "rados_bulk_io.py",
+)
+BULK_IO_REMOTE_PATH = "/tmp/rados_bulk_io.py"
+BULK_IO_CONCURRENCY = 16
+OMAP_WRITE_CONCURRENCY = 16
+# Exit code of the bulk IO script when librados cannot be used on the client
+BULK_IO_UNAVAILABLE = 2
+
+
+class BulkIOUnavailable(Exception):
+    """Raised when librados cannot be used for bulk IO on the client."""
+
+    pass
+
 
 class PoolFunctions:
     """
@@ -31,6 +52,7 @@ class PoolFunctions:
         self.rados_obj = RadosOrchestrator(node=node)
         self.scrub_obj = RadosScrubber(node=node)
         self.node = node
+        self._bulk_io_clients = set()
 
     def verify_target_ratio_set(self, pool_name, ratio):
         """
@@ -92,6 +114,7 @@ class PoolFunctions:
                 3. num_keys_obj: Number of KW pairs to be added to each object
                 4. retain_script: flag to control deletion of omap script
                 5. verify_omap_count: flag to enable/disable OMAP count verification (default: True)
+                6. concurrency: number of writes in flight (default: 16)
 
         Returns: True -> pass, False -> fail
         """
@@ -125,23 +148,29 @@ class PoolFunctions:
             f"Writing {(obj_end - obj_start) * num_keys_obj} Key pairs"
             f" to increase the omap entries on pool {pool_name}"
         )
-        lx = "https://raw.githubusercontent.com/red-hat-storage/cephci/refs/heads/main/utility/generate_omap_entries.py"
+        lx = "https://raw.githubusercontent.com/red-hat-storage/cephci/refs/heads/main/utility"
+        # the script imports the shared helpers of rados_aio.py from its directory
         client_node.exec_command(
             sudo=True,
-            cmd=f"curl -k {lx} -O",
+            cmd=f"curl -k {lx}/generate_omap_entries.py -O {lx}/rados_aio.py -O",
         )
         # Setup Script pre-requisites : docopt
         client_node.exec_command(
             sudo=True, cmd="pip3 install docopt", long_running=True
         )
 
-        cmd_options = f"--pool {pool_name} --start {obj_start} --end {obj_end} --key-count {num_keys_obj}"
+        cmd_options = (
+            f"--pool {pool_name} --start {obj_start} --end {obj_end} --key-count {num_keys_obj}"
+            f" --concurrency {kwargs.get('concurrency', OMAP_WRITE_CONCURRENCY)}"
+        )
         cmd = f"python3 generate_omap_entries.py {cmd_options}"
         client_node.exec_command(sudo=True, cmd=cmd, long_running=True)
 
         # removing the py file copied
         if not kwargs.get("retain_script", False):
-            client_node.exec_command(sudo=True, cmd="rm -rf generate_omap_entries.py")
+            client_node.exec_command(
+                sudo=True, cmd="rm -rf generate_omap_entries.py rados_aio.py"
+            )
 
         # Check if OMAP count verification is enabled (default: True)
         verify_omap_count = kwargs.get("verify_omap_count", True)
@@ -235,6 +264,23 @@ class PoolFunctions:
         Returns:
             0 -> pass, 1 -> fail
         """
+        if nobj > 1:
+            objects = []
+            _offset = offset
+            for i in range(nobj):
+                _name = f"obj{i}" if obj_name is None else f"{obj_name}-{i}"
+                objects.append([_name, _offset])
+                if obj_name is not None and _offset:
+                    _offset += _offset
+            try:
+                self.bulk_rados_put(client, pool, objects, size=size, timeout=timeout)
+                return 0
+            except BulkIOUnavailable as err:
+                log.warning(f"librados unavailable, using rados put instead: {err}")
+            except Exception as err:
+                log.error(f"Bulk write failed on pool {pool}: {err}")
+                return 1
+
         infile = self.prepare_static_data(client, size)
         log.debug(f"Input file is {infile}")
 
@@ -257,6 +303,134 @@ class PoolFunctions:
                 return 1
         return 0
 
+    @staticmethod
+    def _size_in_bytes(size) -> int:
+        """Converts sizes like 4M, as accepted by truncate, to bytes."""
+        match = re.fullmatch(r"(\d+)([KMGT]?)(i?B)?", str(size).strip(), re.I)
+        if not match:
+            raise ValueError(f"Invalid size {size}")
+
+        exponent = " KMGT".index(match.group(2).upper() or " ")
+        return int(match.group(1)) * 1024**exponent
+
+    def _setup_bulk_io(self, client):
+        """Copies the bulk IO worker to the client, once per client."""
+        if client.hostname in self._bulk_io_clients:
+            return
+
+        with open(BULK_IO_SCRIPT) as script:
+            remote = client.remote_file(
+                sudo=True, file_name=BULK_IO_REMOTE_PATH, file_mode="w"
+            )
+            remote.write(script.read())
+            remote.flush()
+            remote.close()
+
+        # Setup Script pre-requisites : docopt
+        try:
+            client.exec_command(
+                sudo=True,
+                cmd="python3 -c 'import docopt' || pip3 install docopt",
+                long_running=True,
+            )
+        except Exception as err:
+            raise BulkIOUnavailable(f"Could not setup bulk IO: {err}")
+        self._bulk_io_clients.add(client.hostname)
+
+    def _run_bulk_io(self, client, op, pool, objects, timeout, concurrency, args=""):
+        self._setup_bulk_io(client)
+        # concurrent runs on the same pool and client use their own manifest
+        manifest = f"/tmp/rados_bulk_io_{op}_{pool}_{generate_unique_id(8)}.json"
+        remote = client.remote_file(sudo=True, file_name=manifest, file_mode="w")
+        remote.write(json.dumps(objects))
+        remote.flush()
+        remote.close()
+
+        cmd = (
+            f"python3 {BULK_IO_REMOTE_PATH} {op} --pool {pool} --manifest {manifest}"
+            f" --concurrency {concurrency} {args}"
+        )
+        out, _, rc, _ = client.exec_command(
+            sudo=True, cmd=cmd, timeout=timeout, check_ec=False, verbose=True
+        )
+        client.exec_command(sudo=True, cmd=f"rm -f {manifest}", check_ec=False)
+        if rc == BULK_IO_UNAVAILABLE:
+            raise BulkIOUnavailable(out)
+
+        try:
+            stats = json.loads(out.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            raise Exception(f"Bulk {op} failed on pool {pool}: {out}")
+
+        log.info(
+            f"Bulk {op} of {len(stats['objects'])} objects on pool {pool}: "
+            f"{stats['ops_per_sec']:.1f} ops/s, {stats['mb_per_sec']:.1f} MB/s"
+        )
+        if rc != 0 or stats["errors"]:
+            raise Exception(f"Bulk {op} failed on pool {pool}: {stats['errors']}")
+
+        return stats
+
+    def bulk_rados_put(
+        self,
+        client,
+        pool: str,
+        objects: list,
+        size: str = "4M",
+        timeout: int = 600,
+        concurrency: int = BULK_IO_CONCURRENCY,
+    ) -> dict:
+        """
+        Writes the static data of prepare_static_data to many objects using a
+        single librados process on the client with asynchronous writes
+        Args:
+            client: client node
+            pool: pool name to which data needs to added
+            objects: object names or [name, offset] pairs to be written
+            size: size of the data written to each object, e.g. 4M
+            timeout: timeout for the whole execution
+            concurrency: number of writes in flight
+        Returns:
+            dictionary with the md5 checksum of every object in "objects", and
+            the "bytes", "elapsed", "ops_per_sec" and "mb_per_sec" statistics
+        Raises:
+            Exception when any of the objects could not be written
+        """
+        return self._run_bulk_io(
+            client,
+            "put",
+            pool,
+            objects,
+            timeout,
+            concurrency,
+            args=f"--size {self._size_in_bytes(size)}",
+        )
+
+    def bulk_rados_get(
+        self,
+        client,
+        pool: str,
+        objects: list,
+        timeout: int = 600,
+        concurrency: int = BULK_IO_CONCURRENCY,
+    ) -> dict:
+        """
+        Reads many objects using a single librados process on the client with
+        asynchronous reads
+        Args:
+            client: client node
+            pool: pool name holding the objects
+            objects: object names to be read
+            timeout: timeout for the whole execution
+            concurrency: number of reads in flight
+        Returns:
+            dictionary with the md5 checksum of every object in "objects", and
+            the "bytes", "elapsed", "ops_per_sec" and "mb_per_sec" statistics
+        Raises:
+            Exception when any of the objects could not be read
+        """
+        return self._run_bulk_io(client, "get", pool, objects, timeout, concurrency)
+
     def do_rados_get(self, pool, read_count) -> bool:
         """
         Perform read operations on the cluster
@@ -281,6 +455,18 @@ class PoolFunctions:
             if read_count == "all":
                 read_count = len(objlist)
 
+            try:
+                self.bulk_rados_get(
+                    self.rados_obj.client, pool, objlist[: int(read_count)]
+                )
+                log.info(f"Completed reading {read_count} objects on the cluster")
+                return True
+            except BulkIOUnavailable as err:
+                log.warning(f"librados unavailable, using rados get instead: {err}")
+            except Exception as err:
+                log.error(f"Bulk read failed on pool {pool}: {err}")
+                return False
+
             for obj in objlist:
                 file_name = f"/tmp/{obj}"
                 get_cmd = f"rados -p {pool} get {obj} {file_name}"
@@ -10,6 +10,7 @@ from concurrent.futures import ALL_COMPLETED, ThreadPoolExecutor, wait
 from time import time
 
 from ceph.ceph_admin.common import config_dict_to_string
+from ceph.rados.bench_results import parse_bench_output
 from utility.log import Log
 
 LOG = Log(__name__)
@@ -129,6 +130,46 @@ class RadosBench:
                 return client
         raise ClientLookupFailure(f"{node} client node not found")
 
+    @staticmethod
+    def run_bench(client, cmd, mode, baseline=None, **kw):
+        """
+        Execute the rados bench command and parse its summary
+
+        Args:
+            client (CephNode): client node
+            cmd (Str): rados bench command
+            mode (Str): bench mode, write, seq or rand
+            baseline (Dict): record the result and check it for regressions
+                store (BaselineStore) : baseline store
+                suite (Str) : suite or test executing the benchmark
+                build (Str) : ceph build under test (Optional)
+                cluster_conf (Str) : cluster configuration name (Optional)
+            kw (Dict): exec_command arguments
+
+        Returns:
+            BenchResult or None when the summary could not be parsed
+        """
+        if "--format" not in cmd:
+            cmd = f"{cmd} --format json"
+
+        out, _ = client.exec_command(cmd=cmd, sudo=True, **kw)
+        try:
+            result = parse_bench_output(out, mode)
+        except ValueError as err:
+            LOG.warning(f"Unable to parse rados bench {mode} result: {err}")
+            return None
+
+        LOG.info(
+            f"rados bench {mode}: {result.bandwidth_mb_sec} MB/sec, "
+            f"{result.average_iops} IOPS, {result.average_latency}s average latency"
+        )
+        if baseline:
+            baseline = dict(baseline)
+            store = baseline.pop("store")
+            result.regressions = store.compare_and_record(result, **baseline)
+
+        return result
+
     @staticmethod
     def write(client, pool_name, **config):
         """
@@ -155,9 +196,13 @@ class RadosBench:
                 reuse-bench (Str) : bench name (String value)
                 max-objects(Str) : max number of objects to be written
                 check_ec(bool): flag to control Exit code checks
+                baseline (Dict) : record the result, refer run_bench (Optional)
+                result (List) : list the BenchResult is appended to (Optional)
 
         """
         base_cmd = ["rados", "bench"]
+        baseline = config.pop("baseline", None)
+        results = config.pop("result", None)
         seconds = str(config.pop("seconds"))
         _timeout = config.get("timeout", int(seconds) + 100)
         check_ec = config.get("check_ec", True)
@@ -171,9 +216,17 @@ class RadosBench:
         base_cmd.append(config_dict_to_string(config))
         base_cmd = " ".join(base_cmd)
 
-        client.exec_command(
-            cmd=base_cmd, sudo=True, timeout=_timeout, check_ec=check_ec
+        result = RadosBench.run_bench(
+            client,
+            base_cmd,
+            "write",
+            baseline=baseline,
+            timeout=_timeout,
+            check_ec=check_ec,
         )
+        if result and results is not None:
+            result.run_name = run_name or None
+            results.append(result)
         return run_name if run_name else None
 
     @staticmethod
@@ -200,11 +253,15 @@ class RadosBench:
                 no-hints:  no-hint option (Boolean value, Default: false(hints))
                 concurrent-ios: integer (String value)
                 reuse-bench: bench name (String value)
+                baseline: record the result, refer run_bench (Dict : Optional)
+                result: list the BenchResult is appended to (List : Optional)
 
         :warning: there should be a write operation pre-executed.
 
         """
         base_cmd = ["rados", "bench"]
+        baseline = config.pop("baseline", None)
+        results = config.pop("result", None)
 
         run_name = config.get("run-name")
 
@@ -215,7 +272,10 @@ class RadosBench:
 
         base_cmd = " ".join(base_cmd)
 
-        client.exec_command(cmd=base_cmd, sudo=True)
+        result = RadosBench.run_bench(client, base_cmd, "seq", baseline=baseline)
+        if result and results is not None:
+            result.run_name = run_name or None
+            results.append(result)
         return run_name if run_name else None
 
     @staticmethod
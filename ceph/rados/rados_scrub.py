@@ -86,7 +86,7 @@ class RadosScrubber(RadosOrchestrator):
         column_dict = defaultdict(list)
 
         log.info(f'{"Getting  PG dump of the cluster"}')
-        pgDump = super().run_ceph_command(cmd=cmd)
+        pgDump = super().run_ceph_command(cmd=cmd, fresh=True)
         if args:
             columns = list(args)
             for detail in pgDump["pg_map"]["pg_stats"]:
@@ -250,7 +250,7 @@ class RadosScrubber(RadosOrchestrator):
                     log.info(f"The {state['state_name']} is in progress")
                     is_scrubbing = True
             cmd = "ceph pg dump pgs"
-            pg_stats = self.run_ceph_command(cmd)
+            pg_stats = self.run_ceph_command(cmd, fresh=True)
             for pg in pg_stats["pg_stats"]:
                 if "scrubbing" in pg["state"]:
                     log.info(f"The {pg['stat']} is in progress on {pg['pgid']} ")
@@ -0,0 +1,214 @@
+"""
+Cache of the ceph JSON queries repeatedly issued while inspecting the cluster.
+
+Read-only commands like `ceph osd tree` or `ceph pg dump` are served from the
+cache for a short time-to-live. Entries derived from the OSD map are kept
+beyond it for as long as the osdmap epoch does not change, which is checked
+with a single `ceph osd stat` shared by all the entries.
+
+The cache of a cluster is dropped as soon as a command that is not known to be
+read-only is executed through the cephadm shell or run_ceph_command, so
+assertions issued right after an operation never see the state before it.
+The cluster changes made by RadosOrchestrator on the client node, e.g. scrubs,
+go through its exec_mutation to drop the cache as well. Other commands executed
+directly on a node are only caught by the time-to-live and the epoch check,
+the PG state polling after such operations bypasses the cache.
+"""
+
+import re
+import threading
+import time
+
+from utility.log import Log
+
+log = Log(__name__)
+
+# Time for which an entry is served without any validation.
+STATE_CACHE_TTL = 2
+
+# Maximum age of an entry validated using the osdmap epoch.
+STATE_CACHE_MAX_AGE = 60
+
+EPOCH_PROBE_CMD = "ceph osd stat"
+
+# Commands reflecting the OSD map, valid as long as its epoch is unchanged.
+OSDMAP_COMMANDS = re.compile(
+    r"^ceph osd (tree|dump|crush rule (dump|ls)|pool ls( detail)?|metadata)\b"
+)
+
+# Commands cached for the time-to-live only.
+TTL_COMMANDS = re.compile(
+    r"^ceph (pg (dump|ls|stat)|df|osd (df|stat)|orch (ps|ls|host ls))\b"
+)
+
+# Commands which do not change the cluster state.
+READ_ONLY_COMMANDS = re.compile(
+    r"^(ceph (osd (tree|dump|df|stat|metadata|crush rule (dump|ls)|pool (ls|get)|"
+    r"ls|find|perf|utilization|ok-to-stop|safe-to-destroy)|pg (dump|ls|stat|map|"
+    r"query)|df|status|-s|health|versions|report|mon (dump|stat)|quorum_status|"
+    r"orch (ps|ls|host ls|device ls|status)|config (get|dump|show)|fs (ls|status|"
+    r"dump|get)|mgr (dump|stat|services)|auth (get|ls)|balancer status|crash ls|"
+    r"log last)|rados (df|ls|lspools|stat|listomap|getomap))\b"
+)
+
+_caches = dict()
+_caches_lock = threading.Lock()
+
+
+def is_read_only(cmd):
+    """Returns True when the command is known not to modify the cluster."""
+    return bool(READ_ONLY_COMMANDS.match(cmd.strip()))
+
+
+class CephStateCache:
+    """Time and osdmap epoch bound cache of ceph JSON query outputs."""
+
+    def __init__(self, ttl=STATE_CACHE_TTL, max_age=STATE_CACHE_MAX_AGE):
+        """
+        Initializes the cache
+        Args:
+            ttl: seconds an entry is served without validation
+            max_age: seconds an osdmap entry is served while the epoch is unchanged
+        """
+        self.ttl = ttl
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._entries = dict()
+        self._epoch = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drops all the cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._epoch = None
+            self._generation += 1
+
+    def _known_epoch(self):
+        """Returns the (epoch, time) probed within the time-to-live, None otherwise."""
+        if self._epoch and time.monotonic() - self._epoch[1] < self.ttl:
+            return self._epoch
+        return None
+
+    def _probe_epoch(self, loader, generation):
+        """Returns the osdmap epoch, probed outside of the lock."""
+        now = time.monotonic()
+        out, _ = loader(EPOCH_PROBE_CMD)
+        epoch = re.search(r'"epoch":\s*(\d+)', out)
+        epoch = int(epoch.group(1)) if epoch else None
+        with self._lock:
+            if generation == self._generation:
+                self._epoch = (epoch, now)
+        return epoch
+
+    def _hit(self, cmd, entry, generation):
+        with self._lock:
+            # the entry is not served when the cache was dropped meanwhile
+            if generation != self._generation:
+                return False
+            self.hits += 1
+        log.debug(f"Serving '{cmd}' from the cluster state cache")
+        return True
+
+    def get(self, cmd, loader, fresh=False):
+        """
+        Returns the output of the command from the cache or using the loader
+        Args:
+            cmd: ceph command without its format options
+            loader: callable executing a command and returning (out, err)
+            fresh: bypass the cache and refresh the entry
+        Returns:
+            (out, err) of the command
+        """
+        cmd = cmd.strip()
+        osdmap = bool(OSDMAP_COMMANDS.match(cmd))
+        if not (osdmap or TTL_COMMANDS.match(cmd)):
+            try:
+                return loader(cmd)
+            finally:
+                if not is_read_only(cmd):
+                    self.invalidate()
+
+        # The cluster is only queried outside of the lock, a slow query does
+        # not block the threads served from the cache
+        with self._lock:
+            entry = None if fresh else self._entries.get(cmd)
+            generation = self._generation
+            known = self._known_epoch()
+
+        probed = known is not None
+        epoch = known[0] if probed else None
+        if entry:
+            age = time.monotonic() - entry["time"]
+            if age < self.ttl and self._hit(cmd, entry, generation):
+                return entry["out"], entry["err"]
+
+            if osdmap and age < self.max_age and entry["epoch"] is not None:
+                if not probed:
+                    epoch, probed = self._probe_epoch(loader, generation), True
+                if epoch == entry["epoch"] and self._hit(cmd, entry, generation):
+                    return entry["out"], entry["err"]
+
+        with self._lock:
+            self.misses += 1
+        if osdmap and not probed:
+            epoch = self._probe_epoch(loader, generation)
+
+        start = time.monotonic()
+        out, err = loader(cmd)
+        with self._lock:
+            # Do not cache an output racing with a state change
+            if generation == self._generation:
+                self._entries[cmd] = {
+                    "out": out,
+                    "err": err,
+                    "time": start,
+                    "epoch": epoch if osdmap else None,
+                }
+
+        return out, err
+
+
+def get_state_cache(cluster):
+    """
+    Returns the state cache of the cluster, creating it when required
+    Args:
+        cluster: Ceph cluster object
+    """
+    key = getattr(cluster, "name", None) or id(cluster)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = CephStateCache()
+
+    return cache
+
+
+def invalidate_state_cache(cluster=None):
+    """
+    Drops the cached state of the cluster or of all the clusters
+    Args:
+        cluster: Ceph cluster object, all the clusters when not provided
+    """
+    with _caches_lock:
+        if cluster is None:
+            caches = list(_caches.values())
+        else:
+            key = getattr(cluster, "name", None) or id(cluster)
+            caches = [_caches.get(key)]
+
+    for cache in caches:
+        if cache:
+            cache.invalidate()
+
+
+def clear_state_caches():
+    """Drops the caches of all the clusters, used once clusters are destroyed."""
+    with _caches_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+
+    for cache in caches:
+        cache.invalidate()
@@ -1,4 +1,6 @@
+import json
 import math
+import os
 import random
 import string
 
@@ -7,6 +9,15 @@ from utility.log import Log
 
 log = Log(__name__)
 
+EXTENT_CHECKSUM_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "utility",
+    "rbd_extent_checksum.py",
+)
+EXTENT_CHECKSUM_REMOTE_PATH = "/tmp/rbd_extent_checksum.py"
+EXTENT_SIZE = 4 * 1024 * 1024
+EXTENT_CHECKSUM_CONCURRENCY = 16
+
 
 getdict = lambda x: {k: v for (k, v) in x.items() if isinstance(v, dict)}
 
@@ -122,6 +133,98 @@ def check_data_integrity(**kw):
     return 0
 
 
+def get_extent_checksums_rbd_image(client, image_spec, **kw):
+    """
+    Get md5sum of every allocated extent of an RBD image.
+
+    The image is read from librbd on the client, skipping the unallocated
+    ranges reported by rbd diff, no export of the image is required.
+
+    Args:
+        client: client node with the rbd python bindings
+        image_spec: <pool/[namespace/]image> to be checksummed
+        kw: {
+            "snap": snapshot of the image to be read,
+            "extent_size": size of the checksummed extents in bytes,
+            "concurrency": number of reads in flight,
+            "cluster": name of the cluster,
+            "timeout": timeout of the checksum in seconds
+        }
+    Returns:
+        dict with the image size, extent size and the md5sum per extent offset
+        of the extents holding data
+    """
+    with open(EXTENT_CHECKSUM_SCRIPT) as script:
+        remote = client.remote_file(
+            sudo=True, file_name=EXTENT_CHECKSUM_REMOTE_PATH, file_mode="w"
+        )
+        remote.write(script.read())
+        remote.flush()
+        remote.close()
+    client.exec_command(
+        sudo=True,
+        cmd="python3 -c 'import docopt' || pip3 install docopt",
+        long_running=True,
+    )
+
+    cmd = (
+        f"python3 {EXTENT_CHECKSUM_REMOTE_PATH} --image {image_spec}"
+        f" --extent-size {kw.get('extent_size', EXTENT_SIZE)}"
+        f" --concurrency {kw.get('concurrency', EXTENT_CHECKSUM_CONCURRENCY)}"
+        f" --cluster {kw.get('cluster', 'ceph')}"
+    )
+    if kw.get("snap"):
+        cmd += f" --snap {kw['snap']}"
+    out, _, rc, _ = client.exec_command(
+        sudo=True,
+        cmd=cmd,
+        timeout=kw.get("timeout", 3600),
+        check_ec=False,
+        verbose=True,
+    )
+
+    try:
+        checksums = json.loads(out.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        raise CommandFailed(f"Extent checksum failed for image {image_spec}: {out}")
+
+    log.info(
+        f"Checksummed {checksums['allocated_extents']} extents of {image_spec} on "
+        f"{client.hostname}: {checksums['mb_per_sec']:.1f} MB/s"
+    )
+    if rc != 0 or checksums["errors"]:
+        raise CommandFailed(
+            f"Extent checksum failed for image {image_spec}: {checksums['errors']}"
+        )
+
+    return checksums
+
+
+def compare_extent_checksums(first, second):
+    """
+    Compare the extent checksums of two images.
+
+    Args:
+        first: extent checksums of the first image, refer get_extent_checksums_rbd_image
+        second: extent checksums of the second image
+    Returns:
+        sorted list of the offsets of the mismatching extents, the size of the
+        smaller image when the image sizes are different
+    """
+    if first["extent_size"] != second["extent_size"]:
+        raise ValueError("Extent checksums of different extent sizes")
+
+    mismatches = set()
+    if first["size"] != second["size"]:
+        mismatches.add(min(first["size"], second["size"]))
+
+    for offset in set(first["extents"]) | set(second["extents"]):
+        if first["extents"].get(offset) != second["extents"].get(offset):
+            mismatches.add(int(offset))
+
+    return sorted(mismatches)
+
+
 def exec_cmd(node, cmd, **kw):
     """
     exec_command wrapper with additional functionality
@@ -778,9 +778,10 @@ def create_ceph_nodes(
         else:
             params["root-login"] = True
 
+        # OpenStack API calls are rate limited across the nodes by the driver,
+        # hence all the nodes are requested at once.
         with parallel() as p:
             for node in range(1, 100):
-                sleep(10 * node)
                 node = "node" + str(node)
                 if not ceph_cluster.get(node):
                     break
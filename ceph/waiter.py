@@ -1,21 +1,168 @@
-"""Helper object to encapsulate waiting for timeouts"""
+"""Helper object to encapsulate waiting for timeouts.
 
+WaitUntil polls with a fixed interval by default. Exponential backoff and
+jitter can be enabled to check often right after a change is triggered and
+less often later on, so that a successful wait does not overshoot by a
+large fixed interval.
+
+watch_until follows a streaming command (e.g. `ceph -w`) and returns as soon
+as a line matching the condition is emitted instead of polling at all.
+
+Every wait is recorded in the WaitTelemetry registry along with its
+duration, number of attempts and allocated timeout. The waits are attributed
+to the test context they run in, refer utility.log.in_test.
+"""
+
+import itertools
+import random
+import re
+import select
+import sys
+import threading
 import time
 
+from utility.log import Log, current_test
+
+log = Log(__name__)
+
+_record_keys = itertools.count()
+
+
+class WaitTelemetry(object):
+    """Registry of the time taken by the waits versus their timeout."""
+
+    _lock = threading.Lock()
+    _records = dict()
+
+    @classmethod
+    def update(cls, key, **record):
+        record.setdefault("test", current_test())
+        with cls._lock:
+            cls._records[key] = record
+
+    @staticmethod
+    def _matches(record, test):
+        # Waits outside of any test context belong to every test
+        return test is None or record.get("test") in (test, None)
+
+    @classmethod
+    def records(cls, test=None):
+        """Returns the list of recorded waits, only the ones of test if given."""
+        with cls._lock:
+            return [r for r in cls._records.values() if cls._matches(r, test)]
+
+    @classmethod
+    def reset(cls, test=None):
+        """Forgets the recorded waits, only the ones of test if given."""
+        with cls._lock:
+            for key, record in list(cls._records.items()):
+                if cls._matches(record, test):
+                    del cls._records[key]
+
+    @classmethod
+    def summary(cls, test=None):
+        """Returns the wait statistics aggregated per condition name."""
+        summary = dict()
+        for record in cls.records(test):
+            _stats = summary.setdefault(
+                record["name"],
+                {"count": 0, "expired": 0, "elapsed": 0.0, "timeout": 0.0},
+            )
+            _stats["count"] += 1
+            _stats["expired"] += int(record["expired"])
+            _stats["elapsed"] += record["elapsed"]
+            _stats["timeout"] += record["timeout"] or 0
+
+        return summary
+
+    @classmethod
+    def log_summary(cls, test=None):
+        for name, stats in sorted(cls.summary(test).items()):
+            log.info(
+                "Wait %s: %d call(s), %d expired, %.1fs spent of %.1fs allocated",
+                name,
+                stats["count"],
+                stats["expired"],
+                stats["elapsed"],
+                stats["timeout"],
+            )
+
+
+def _caller_name(depth=2):
+    frame = sys._getframe(depth)
+    return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}"
+
 
 class WaitUntil(object):
     """A wait-retry loop as iterable.
 
     This object abstracts away the wait logic allowing functions
     to write the retry logic in a for-loop.
+
+    Example::
+
+        for w in WaitUntil(timeout=600, interval=2, backoff=1.5, max_interval=30):
+            if condition():
+                break
+
+        if w.expired:
+            raise TimeoutError()
     """
 
-    def __init__(self, timeout=60, interval=1):
+    def __init__(
+        self,
+        timeout=60,
+        interval=1,
+        backoff=1,
+        max_interval=None,
+        jitter=0,
+        name=None,
+    ):
+        """Initialize the wait loop.
+
+        Args:
+            timeout (int | float): maximum time to wait in seconds
+            interval (int | float): time between the first two attempts
+            backoff (int | float): factor applied to the interval after each attempt
+            max_interval (int | float): upper bound of the interval
+            jitter (float): fraction of the interval randomly added or removed
+            name (str): condition name used for telemetry, defaults to the caller
+        """
         self.timeout = timeout
         self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.name = name or _caller_name()
         self.expired = False
         self._attempt = 0
         self._start = None
+        self._key = next(_record_keys)
+
+    @property
+    def elapsed(self):
+        return time.time() - self._start if self._start else 0
+
+    def _next_interval(self):
+        _interval = self.interval * (self.backoff ** (self._attempt - 1))
+        if self.max_interval:
+            _interval = min(_interval, self.max_interval)
+
+        if self.jitter:
+            _interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        # Do not sleep beyond the allocated time
+        return max(0, min(_interval, self.timeout - self.elapsed))
+
+    def _record(self):
+        WaitTelemetry.update(
+            self._key,
+            name=self.name,
+            timeout=self.timeout,
+            elapsed=self.elapsed,
+            attempts=self._attempt,
+            expired=self.expired,
+        )
 
     def __iter__(self):
         return self
@@ -23,10 +170,76 @@ class WaitUntil(object):
     def __next__(self):
         if self._start is None:
             self._start = time.time()
-        if time.time() - self._start > self.timeout:
+        if self.elapsed > self.timeout:
             self.expired = True
+            self._record()
             raise StopIteration()
         if self._attempt != 0:
-            time.sleep(self.interval)
+            time.sleep(self._next_interval())
         self._attempt += 1
+        self._record()
         return self
+
+
+def watch_until(node, cmd, condition, timeout=300, sudo=True, name=None):
+    """Follow the output of a streaming command until a line matches.
+
+    Instead of polling, the command (e.g. `ceph -w` or `journalctl -f`) is
+    left running and every line it emits is checked as soon as it arrives.
+    The remote command is bound by `timeout` so it never outlives the wait.
+
+    Args:
+        node (CephNode): node to run the command on
+        cmd (str): streaming command
+        condition (str | callable): regex or predicate evaluated on each line
+        timeout (int): maximum time to wait in seconds
+        sudo (bool): execute the command as root
+        name (str): condition name used for telemetry, defaults to the caller
+
+    Returns:
+        the first matching line or None when the timeout expires
+    """
+    if isinstance(condition, str):
+        condition = re.compile(condition).search
+
+    name = name or _caller_name()
+    connection = node.root_connection if sudo else node.connection
+    start = time.time()
+    matched = None
+    channel = connection.open_channel(timeout=timeout)
+    try:
+        log.info(f"Watching {cmd} on {node.hostname} for up to {timeout}s")
+        channel.exec_command(f"timeout {int(timeout)} {cmd}")
+        _buffer = b""
+        _eof = False
+        while matched is None and not _eof:
+            _remaining = timeout - (time.time() - start)
+            if _remaining <= 0:
+                break
+
+            select.select([channel], [], [], min(_remaining, 1.0))
+            _eof = channel.eof_received
+            while channel.recv_ready():
+                _buffer += channel.recv(32768)
+
+            *_lines, _buffer = _buffer.split(b"\n")
+            if _eof and _buffer:
+                _lines.append(_buffer)
+
+            for _line in _lines:
+                _line = _line.decode("utf-8", errors="replace")
+                if condition(_line):
+                    matched = _line
+                    break
+    finally:
+        channel.close()
+        WaitTelemetry.update(
+            next(_record_keys),
+            name=name,
+            timeout=timeout,
+            elapsed=time.time() - start,
+            attempts=1,
+            expired=matched is None,
+        )
+
+    return matched
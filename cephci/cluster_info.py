@@ -1,3 +1,4 @@
+import datetime
 import json
 import os
 import pickle
@@ -6,6 +7,7 @@ import re
 import yaml
 from docopt import docopt
 
+from ceph.parallel import parallel
 from cli.cephadm.cephadm import CephAdm
 from cli.utilities.packages import Rpm, SubscriptionManager
 from cli.utilities.utils import (
@@ -21,9 +23,14 @@ from utility.log import Log
 log = Log(__name__)
 
 CEPH_VAR_LOG_DIR = "/var/log/ceph"
-_CEPH_VAR_LOG_DIR = "var/log/ceph"
 CEPH_COREDUMP_DIR = "/var/lib/systemd/coredump/"
 
+# Nodes archived at the same time
+COLLECT_WORKERS = 8
+
+# Allowance for the clock difference between the nodes and the executor
+COLLECT_WINDOW_MARGIN = 300
+
 doc = """
 Utility to gather cluster information
 
@@ -162,45 +169,135 @@ def gather_info(cluster):
     return info
 
 
-def get_ceph_var_logs(cluster, log_dir):
+def _collect_archive(node, paths, download_dir, name, since=None):
+    """Archive the files of a node changed since the previous collection.
+
+    The files are listed with their size and modification time, compared with
+    the manifest of the previous collection and only the new or modified ones
+    are archived. The archive is compressed with zstd when available, gzip
+    otherwise, and streamed over the SSH channel to the local directory.
+
+    Args:
+        node (CephNode): node holding the files
+        paths (list): remote directories to be collected
+        download_dir (str): local directory storing the archives
+        name (str): archive name, prefixed with the node hostname
+        since (datetime): skip the files not modified after this time
+
+    Returns:
+        path of the local archive or None when no file changed
     """
-    This method is to download and store
-    ceph cluster var logs into log directory.
+    manifest_file = os.path.join(download_dir, f".{node.hostname}-{name}.manifest")
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file) as fp:
+            manifest = json.load(fp)
+
+    newer = ""
+    if since:
+        _since = since.timestamp() - COLLECT_WINDOW_MARGIN
+        newer = f"-newermt @{int(_since)}"
+
+    dirs = " ".join(path.lstrip("/") for path in paths)
+    out, _ = node.exec_command(
+        cmd=f"cd / && find {dirs} -type f {newer} -printf '%s %T@ %p\\n' 2>/dev/null;"
+        " command -v zstd > /dev/null && echo __zstd__ || true",
+        sudo=True,
+        check_ec=False,
+    )
+
+    zstd, files, current = False, [], {}
+    for line in out.splitlines():
+        if line == "__zstd__":
+            zstd = True
+            continue
+
+        size, mtime, path = line.split(" ", 2)
+        current[path] = [int(size), mtime]
+        if manifest.get(path) != current[path]:
+            files.append(path)
+
+    if not files:
+        log.info(f"No new {name} files on {node.hostname}")
+        return None
+
+    compress, ext = ("zstd -q -T0 -c", "tar.zst") if zstd else ("gzip -c", "tar.gz")
+    stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    archive = os.path.join(download_dir, f"{node.hostname}-{name}-{stamp}.{ext}")
+    log.info(f"Downloading {len(files)} {name} files from {node.hostname} to {archive}")
+    rc, err = node.download_command_output(
+        cmd=f"tar -C / --warning=no-file-changed --null -T - -cf - | {compress}",
+        dst=archive,
+        stdin="\0".join(files).encode(),
+        sudo=True,
+    )
+    # tar returns 1 when files changed while being archived
+    if rc not in (0, 1):
+        raise Exception(f"Collecting {name} from {node.hostname} failed: {err}")
+
+    manifest.update(current)
+    with open(manifest_file, "w") as fp:
+        json.dump(manifest, fp)
+
+    return archive
+
+
+def _collect_from_nodes(cluster, paths, download_dir, name, since=None):
     """
-    download_dir = os.path.join(log_dir, "ceph_logs")
+    Collect the archives of all the nodes concurrently.
+
+    A node failing does not stop the collection from the other nodes, the
+    failures are raised once all the nodes are done.
+    """
+
+    def _collect(node):
+        try:
+            return _collect_archive(node, paths, download_dir, name, since=since), None
+        except Exception as e:
+            log.error(f"Unable to collect {name} from {node.hostname}: {e}")
+            return None, f"{node.hostname}: {e}"
+
     os.makedirs(download_dir, exist_ok=True)
-    for node in cluster.get_nodes():
-        tar_file = f"{node.hostname}-cephlog.tar"
-        node.exec_command(
-            cmd=f"tar -C / --warning=no-file-changed -cvzf {tar_file} {_CEPH_VAR_LOG_DIR}",
-            sudo=True,
+    with parallel(max_workers=COLLECT_WORKERS) as p:
+        for node in cluster.get_nodes():
+            p.spawn(_collect, node)
+
+    failures = [error for _, error in p.results if error]
+    if failures:
+        raise Exception(
+            f"Unable to collect {name} from {len(failures)} node(s): "
+            + ", ".join(failures)
         )
 
-        node.download_file(
-            src=tar_file,
-            dst=os.path.join(download_dir, tar_file),
-            sudo=True,
-        )
-        log.info(f"Downloading {tar_file} from {node.hostname} to {download_dir}")
+    return [archive for archive, _ in p.results if archive]
+
+
+def get_ceph_var_logs(cluster, log_dir, since=None):
+    """
+    This method is to download and store
+    ceph cluster var logs into log directory.
+
+    Nodes are collected concurrently and only the files changed since the
+    previous collection, and after `since` when provided, are downloaded.
+    """
+    download_dir = os.path.join(log_dir, "ceph_logs")
+    return _collect_from_nodes(
+        cluster, [CEPH_VAR_LOG_DIR], download_dir, "cephlog", since=since
+    )
 
 
-def collect_ceph_coredumps(cluster, _dir):
+def collect_ceph_coredumps(cluster, _dir, since=None):
     """
     This method is to download and store
     ceph coredumps into custom directory.
+
+    Nodes are collected concurrently and only the coredumps not collected
+    before, and created after `since` when provided, are downloaded.
     """
     download_dir = os.path.join(_dir, "ceph_coredumps")
-    os.makedirs(download_dir, exist_ok=True)
-    for node in cluster.get_nodes():
-        tar_file = f"{node.hostname}-coredump.tar"
-        node.exec_command(cmd=f"tar -cvzf {tar_file} {CEPH_COREDUMP_DIR}", sudo=True)
-
-        node.download_file(
-            src=tar_file,
-            dst=os.path.join(download_dir, tar_file),
-            sudo=True,
-        )
-        log.info(f"Downloading {tar_file} from {node.hostname} to {download_dir}")
+    return _collect_from_nodes(
+        cluster, [CEPH_COREDUMP_DIR], download_dir, "coredump", since=since
+    )
 
 
 def write_output(data, output):
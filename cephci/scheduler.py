@@ -0,0 +1,177 @@
+"""
+Dependency aware scheduler of the tests of a suite.
+
+Tests declaring the resources they use can be run concurrently against the
+same cluster. The declaration is optional, a test without one uses its
+clusters exclusively and is hence run alone, like a sequential run would.
+
+    - test:
+        name: rbd image listing
+        module: test_rbd_ls.py
+        resources:
+          mode: shared          # clusters are shared, exclusive by default
+          pools: [rbd_ls]       # pools mutated by the test
+          roles: [mgr]          # daemons restarted or reconfigured by the test
+        depends-on:
+          - create rbd pools    # name of a test to be completed first
+
+The tests are ordered by a DAG built from
+    - the conflicting resources, two tests conflict when they use the same
+      resource and either of them uses it exclusively
+    - the abort-on-fail tests, completed before any later test starts
+    - the destroy-cluster and recreate-cluster tests, run alone as barriers
+    - the explicit depends-on names of earlier tests
+
+Conflicting tests keep the order of the suite. The number of tests run at the
+same time is set by max-parallel-tests of the custom config, 1 by default. The
+logs, logged errors and wait telemetry of every test are kept apart through its
+test context, refer utility.log.in_test.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utility.log import Log
+
+log = Log(__name__)
+
+
+def _as_list(value):
+    if value is None:
+        return list()
+    return value if isinstance(value, list) else [value]
+
+
+def is_barrier(test):
+    """Returns True when the test changes the clusters of the run."""
+    return bool(test.get("destroy-cluster") or test.get("recreate-cluster"))
+
+
+def test_resources(test, clusters):
+    """
+    Returns the resources used by the test.
+
+    Args:
+        test (dict):        test section of the suite
+        clusters (list):    clusters of the run, used when the test has none
+
+    Returns:
+        dict -> resource key and True when it is used exclusively
+    """
+    names = list(test.get("clusters") or clusters)
+    declared = test.get("resources")
+    if not declared:
+        return {("cluster", name): True for name in names}
+
+    exclusive = declared.get("mode", "exclusive") != "shared"
+    resources = {("cluster", name): exclusive for name in names}
+    for name in names:
+        for pool in _as_list(declared.get("pools")):
+            resources[("pool", name, pool)] = True
+        for role in _as_list(declared.get("roles")):
+            resources[("role", name, role)] = True
+
+    return resources
+
+
+def conflicts(first, second):
+    """Returns True when the resources cannot be used at the same time."""
+    return any(key in second and (first[key] or second[key]) for key in first)
+
+
+def build_dag(tests, clusters):
+    """
+    Returns the tests each test of the suite waits for.
+
+    Args:
+        tests (list):       test sections of the suite, in suite order
+        clusters (list):    clusters of the run
+
+    Returns:
+        list -> set of the indexes of the earlier tests to be completed first
+
+    Raises:
+        ValueError: when a test depends on a test which is not before it
+    """
+    resources = [test_resources(test, clusters) for test in tests]
+    names = dict()
+    dag = list()
+    for index, test in enumerate(tests):
+        waits = set()
+        for before in range(index):
+            earlier = tests[before]
+            if (
+                is_barrier(test)
+                or is_barrier(earlier)
+                or earlier.get("abort-on-fail", False)
+                or conflicts(resources[index], resources[before])
+            ):
+                waits.add(before)
+
+        for name in _as_list(test.get("depends-on")):
+            if name not in names:
+                raise ValueError(
+                    f"Test '{test.get('name')}' depends on '{name}' which is not before it"
+                )
+            waits.add(names[name])
+
+        names[test.get("name")] = index
+        dag.append(waits)
+
+    return dag
+
+
+def schedule(tests, execute, clusters, max_workers=1):
+    """
+    Runs the tests of the suite in the order of their DAG.
+
+    The execute callable runs a test and returns its result along with a flag
+    requesting the run to stop, i.e. an abort-on-fail test failed. No test is
+    started once the run is stopped, the running ones are waited for.
+
+    With a single worker the tests are run one at a time in the suite order,
+    from the calling thread.
+
+    Args:
+        tests (list):       test sections of the suite
+        execute (callable): execute(index, test) -> (result, stop)
+        clusters (list):    clusters of the run
+        max_workers (int):  tests run at the same time
+
+    Returns:
+        list -> result of every test, None for the tests not run
+    """
+    dag = build_dag(tests, clusters)
+    results = [None] * len(tests)
+
+    if max_workers <= 1:
+        for index, test in enumerate(tests):
+            results[index], stop = execute(index, test)
+            if stop:
+                break
+        return results
+
+    pending = list(range(len(tests)))
+    running = dict()
+    completed = set()
+    stop = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for index in list(pending):
+                if stop or len(running) >= max_workers:
+                    break
+                if dag[index] <= completed:
+                    pending.remove(index)
+                    log.debug(f"Scheduling test {tests[index].get('name')}")
+                    running[executor.submit(execute, index, tests[index])] = index
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+                results[index], abort = future.result()
+                completed.add(index)
+                stop = stop or abort
+
+    return results
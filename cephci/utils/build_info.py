@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional
 import requests
 import yaml
 
+from utility.http_cache import MANIFEST_TTL, CachedResponse, cached_get
 from utility.log import Log
 from utility.utils import get_cephci_config
 
@@ -222,7 +223,7 @@ class CephTestManifest:
             manifest_url += f"redhat/{manifest_file}"
 
         try:
-            data: requests.Response = requests.get(manifest_url, verify=False)
+            data: CachedResponse = cached_get(manifest_url, ttl=MANIFEST_TTL)
         except requests.RequestException as e:
             raise RuntimeError(
                 "Unable to download the Ceph QE manifest file %s \n%s", manifest_url, e
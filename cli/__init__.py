@@ -1,37 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import partialmethod
 
+from cli.exceptions import FanOutError
+
+# Maximum number of nodes a command is executed on at the same time.
+FAN_OUT_WORKERS = 8
+
 
 class Cli:
+    # Commands are executed on one node after the other unless fanned out
+    max_workers = 1
+    fail_fast = True
+
     def __init__(self, ctx):
         self.ctx = ctx
 
+    def fan_out(self, max_workers=FAN_OUT_WORKERS, fail_fast=True):
+        """Execute the commands over a list of nodes concurrently.
+
+        Args:
+            max_workers (int): Number of nodes executing at the same time,
+                1 executes the command on one node after the other.
+            fail_fast (bool): Cancel the pending nodes on the first failure and
+                raise its exception. When disabled, the command is executed on
+                every node and FanOutError reports all the failures.
+        """
+        self.max_workers = max_workers
+        self.fail_fast = fail_fast
+        return self
+
+    def _execute_on_nodes(self, run, max_workers, **kw):
+        """Execute the command on every node of the context concurrently."""
+        max_workers = min(max_workers, len(self.ctx)) or 1
+        out, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run, ctx, **kw): ctx.shortname for ctx in self.ctx
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                if future.exception() is None:
+                    out[name] = future.result()
+                    continue
+
+                if self.fail_fast:
+                    # the first failure to complete is raised once the
+                    # running nodes are done
+                    for pending in futures:
+                        pending.cancel()
+                    raise future.exception()
+                errors[name] = future.exception()
+
+        # results in the order of the nodes
+        out = {name: out[name] for name in futures.values() if name in out}
+        if errors:
+            raise FanOutError(out, errors)
+
+        return out
+
     def execute(self, cmd, sudo=False, long_running=False, check_ec=False, **kwargs):
         """Inerface to execute commands on node(s).
 
+        When a list of nodes is provided, the command is executed on one node
+        after the other, or concurrently when enabled using `fan_out` or the
+        max_workers argument.
+
         Args:
             cmd (str): Command to be execute
             sudo (bool): Use root access
             long_running (bool): Long running command
             check_exit_status (bool): Check command exit status
+            max_workers (int): Number of nodes executing at the same time
+        """
+        kw = {
+            "cmd": cmd,
+            "sudo": sudo,
+            "long_running": long_running,
+            "check_ec": check_ec,
+            "timeout": kwargs.get("timeout", 3600),
+        }
+        return self.dispatch(
+            lambda ctx, **kw: ctx.exec_command(**kw), kwargs.get("max_workers"), **kw
+        )
+
+    execute_as_sudo = partialmethod(execute, sudo=True)
+
+    def dispatch(self, run, max_workers=None, **kw):
+        """Run a command on the node(s) of the context like `execute`.
+
+        Args:
+            run (callable): run(ctx, **kw) executing the command on a node
+            max_workers (int): Number of nodes executing at the same time
+            kw (dict): Arguments of the command passed to run
         """
         if isinstance(self.ctx, list):
+            max_workers = max_workers or self.max_workers
+            if max_workers > 1:
+                return self._execute_on_nodes(run, max_workers, **kw)
+
             out = {}
             for ctx in self.ctx:
-                out[ctx.shortname] = ctx.exec_command(
-                    cmd=cmd,
-                    sudo=sudo,
-                    long_running=long_running,
-                    check_ec=check_ec,
-                    timeout=kwargs.get("timeout", 3600),
-                )
+                out[ctx.shortname] = run(ctx, **kw)
             return out
         else:
-            return self.ctx.exec_command(
-                cmd=cmd,
-                sudo=sudo,
-                long_running=long_running,
-                check_ec=check_ec,
-                timeout=kwargs.get("timeout", 3600),
-            )
-
-    execute_as_sudo = partialmethod(execute, sudo=True)
+            return run(self.ctx, **kw)
@@ -1,16 +1,25 @@
 from cli import Cli
 from cli.ceph.ceph import Ceph
 from cli.ceph.ceph_volume.ceph_volume import CephVolume
+from cli.cephadm.shell_session import get_shell_session
 from cli.utilities.utils import build_cmd_from_args
 
 
 class CephAdm(Cli):
     """This module provides CLI interface to manage the CephAdm operations"""
 
-    def __init__(self, nodes, src_mount=None, mount=None, base_cmd="cephadm"):
+    def __init__(
+        self,
+        nodes,
+        src_mount=None,
+        mount=None,
+        base_cmd="cephadm",
+        persistent_shell=False,
+    ):
         super(CephAdm, self).__init__(nodes)
 
         self.base_cmd = base_cmd
+        self.persistent_shell = persistent_shell and not (src_mount or mount)
         self.base_shell_cmd = f"{self.base_cmd} shell"
         if src_mount:
             self.base_shell_cmd += f" --mount {src_mount}:{mount} --"
@@ -26,6 +35,14 @@ class CephAdm(Cli):
         Args:
             cmd (str): command to be executed
         """
+        if self.persistent_shell:
+            return self.dispatch(
+                lambda ctx, **kw: get_shell_session(ctx).run(cmd, **kw),
+                long_running=True,
+                check_ec=False,
+                timeout=3600,
+            )
+
         cmd = f"{self.base_shell_cmd} {cmd}"
         return self.execute(sudo=True, long_running=True, cmd=cmd)
 
@@ -0,0 +1,187 @@
+"""Long-lived cephadm shell container shared by ceph commands of a node.
+
+Every `cephadm shell -- <cmd>` starts a new container which costs a few
+seconds per command. A shell session starts one `cephadm shell` container in
+the background and runs the subsequent commands inside it using
+`<runtime> exec`, keeping the host side semantics (pipes, redirects) of the
+original command line intact.
+
+The container is restarted automatically when the cluster configuration,
+the admin keyring or the container image of the local daemons change, as
+the running container would otherwise serve stale bind mounts.
+"""
+
+import threading
+from uuid import uuid4
+
+from ceph.ceph import CommandFailed
+from cli.exceptions import UnexpectedStateError
+from cli.utilities.waiter import WaitUntil
+from utility.log import Log
+
+log = Log(__name__)
+
+# Files bind mounted by cephadm shell along with the image used by daemons.
+FINGERPRINT_CMD = (
+    "cat /etc/ceph/ceph.conf /etc/ceph/ceph.client.admin.keyring "
+    "/var/lib/ceph/*/*/unit.image 2>/dev/null | md5sum"
+)
+
+# Reported by the command guard when the session needs to be restarted.
+STALE_EXIT_CODE = 250
+STALE_MARKER = "cephci-shell-session-stale"
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class ShellSession:
+    """Persistent `cephadm shell` container on a node."""
+
+    def __init__(self, node, start_timeout=300):
+        """Initialize the session.
+
+        Args:
+            node (CephNode): node to run the shell container on
+            start_timeout (int): time to wait for the container to come up
+        """
+        self.node = node
+        self.start_timeout = start_timeout
+        self.runtime = None
+        self.container = None
+        self.fingerprint = None
+        self._marker = f"cephci-shell-{uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.container is not None
+
+    def _exec(self, cmd, **kw):
+        return self.node.exec_command(sudo=True, cmd=cmd, **kw)
+
+    def start(self):
+        """Start the shell container and record the node fingerprint."""
+        if not self.runtime:
+            out, _ = self._exec(
+                "command -v podman || command -v docker", check_ec=False
+            )
+            self.runtime = out.strip().split("\n")[0] or "podman"
+
+        log.info(f"Starting persistent cephadm shell on {self.node.hostname}")
+        self._exec(
+            f"nohup cephadm shell -- bash -c 'sleep infinity' {self._marker} "
+            "< /dev/null > /dev/null 2>&1 &",
+            check_ec=False,
+        )
+
+        for w in WaitUntil(timeout=self.start_timeout, interval=2):
+            out, _ = self._exec(
+                f"{self.runtime} ps --no-trunc --format '{{{{.ID}}}} {{{{.Command}}}}'"
+                f" | grep {self._marker} | cut -d ' ' -f 1",
+                check_ec=False,
+            )
+            if out.strip():
+                self.container = out.split()[0]
+                break
+
+        if w.expired:
+            raise UnexpectedStateError(
+                f"cephadm shell container did not start on {self.node.hostname}"
+            )
+
+        out, _ = self._exec(FINGERPRINT_CMD)
+        self.fingerprint = out.strip()
+        log.info(f"Persistent cephadm shell {self.container} is ready")
+
+    def stop(self):
+        """Remove the shell container."""
+        if not self.container:
+            return
+
+        log.info(f"Stopping persistent cephadm shell {self.container}")
+        self._exec(f"{self.runtime} rm -f {self.container}", check_ec=False)
+        self.container = None
+        self.fingerprint = None
+
+    def restart(self):
+        """Replace the shell container with a new one."""
+        with self._lock:
+            self.stop()
+            self.start()
+
+    def _build_cmd(self, cmd):
+        guard = (
+            f'[ "$({FINGERPRINT_CMD})" = "{self.fingerprint}" ] && '
+            f"{self.runtime} inspect {self.container} > /dev/null 2>&1 || "
+            f"{{ echo {STALE_MARKER} >&2; exit {STALE_EXIT_CODE}; }}"
+        )
+        return f"{guard}; {self.runtime} exec -i {self.container} {cmd}"
+
+    def run(self, cmd, check_ec=True, long_running=False, **kw):
+        """Execute the command within the shell container.
+
+        Args:
+            cmd (str): command to be executed, as passed to `cephadm shell --`
+            check_ec (bool): raise on non-zero exit status
+            long_running (bool): return only the exit status
+            kw (dict): additional arguments of CephNode.exec_command
+
+        Returns:
+            exit status when long_running else (stdout, stderr)
+
+        Raises:
+            CommandFailed: when the exit status is non-zero and check_ec is set
+        """
+        with self._lock:
+            if not self.active:
+                self.start()
+
+        kw.pop("verbose", None)
+        for attempt in range(2):
+            out, err, rc, _ = self._exec(
+                self._build_cmd(cmd), check_ec=False, verbose=True, **kw
+            )
+            stale = rc == STALE_EXIT_CODE and err.strip() == STALE_MARKER
+            if not stale or attempt:
+                break
+
+            log.info("Configuration or image changed, restarting cephadm shell")
+            self.restart()
+
+        if check_ec and rc != 0:
+            raise CommandFailed(
+                f"{cmd} returned {err} and code {rc} on {self.node.hostname}"
+            )
+
+        return rc if long_running else (out, err)
+
+
+def get_shell_session(node):
+    """Returns the shell session of the node, creating it when required.
+
+    Args:
+        node (CephNode | CephObject): node hosting the shell container
+    """
+    node = getattr(node, "node", node)
+    with _sessions_lock:
+        session = _sessions.get(node.ip_address)
+        if session is None:
+            session = _sessions[node.ip_address] = ShellSession(node)
+
+    # Nodes get recreated when the cluster state is restored
+    session.node = node
+    return session
+
+
+def stop_shell_sessions():
+    """Remove all the persistent shell containers."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+
+    for session in sessions:
+        try:
+            session.stop()
+        except Exception as e:
+            log.warning(f"Unable to stop cephadm shell session: {e}")
@@ -75,3 +75,17 @@ class OsdOperationError(Exception):
     """
     Custom exception thrown when OSD operation fails
     """
+
+
+class FanOutError(Exception):
+    """
+    Custom exception thrown when a command fails on some of the nodes.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        super().__init__(
+            "Execution failed on "
+            + ", ".join(f"{node}: {err}" for node, err in errors.items())
+        )
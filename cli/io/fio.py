@@ -1,6 +1,7 @@
 import itertools
 
 from cli import Cli
+from utility.io.fio_results import fetch_fio_result
 
 
 class Fio(Cli):
@@ -13,6 +14,7 @@ class Fio(Cli):
         self.sizes = None
         self.iodepth_values = None
         self.numjobs = None
+        self.outputs = []
 
     def create_config(self):
         """
@@ -96,10 +98,24 @@ iodepth= {iodepth}
                 )
                 self.execute(long_running=True, cmd=cmd)
             else:
-                cmd = (
-                    f"fio {file} --output-format=json "
-                    f"--output={file}_{self.ctx.hostname}_{mount_dir.replace('/', '')}.json"
-                )
+                output = f"{file}_{self.ctx.hostname}_{mount_dir.replace('/', '')}.json"
+                cmd = f"fio {file} --output-format=json+ --output={output}"
                 self.execute(sudo=True, long_running=True, cmd=cmd)
+                self.outputs.append(output)
 
         return True
+
+    def results(self, **tags):
+        """
+        Parse the outputs of the runs
+        Args:
+            tags (dict): labels added to the results, like protocol or build
+        Returns:
+            list of FioJobResult
+        """
+        results = []
+        for output in self.outputs:
+            results += fetch_fio_result(
+                self.ctx, output, client=self.ctx.hostname, **tags
+            )
+        return results
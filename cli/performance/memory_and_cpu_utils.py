@@ -1,5 +1,5 @@
+import json
 import os
-from threading import Thread
 
 from cli.utilities.configs import get_cephci_config
 from utility.log import Log
@@ -7,13 +7,19 @@ from utility.log import Log
 log = Log(__name__)
 
 
-SCRIPT = "memory_and_cpu_logger.py"
+SCRIPT = "ceph_resource_sampler.py"
 SCRIPT_PATH = "cli/performance/utilities/"
 SCRIPT_DST_PATH = "/home/"
 
+# Default sampling interval in seconds
+DEFAULT_INTERVAL = 5
+
+# Maximum time to wait for the samplers to exit once stopped
+STOP_TIMEOUT = 60
+
 
 def upload_mem_and_cpu_logger_script(cluster):
-    """Check and upload memory_and_cpu_logger.py to servers if not present
+    """Check and upload ceph_resource_sampler.py to servers if not present
 
     Args:
      cluster(ceph): List of all nodes where script has to be uploaded
@@ -40,105 +46,123 @@ def upload_mem_and_cpu_logger_script(cluster):
     return all(is_present)
 
 
+def _sample_file(node, test_name):
+    return f"{SCRIPT_DST_PATH}{node.hostname}-{test_name}.bin"
+
+
 def start_logging_processes(ceph_cluster, test_name):
     """
-    Start logging processes on all nodes for a given process
+    Start sampling the ceph daemons of all the nodes
+
+    A single detached sampler is started per node for all the monitored
+    processes, no SSH session is held while the test executes.
+
     Args:
         ceph_cluster(ceph): Ceph cluster object
         test_name(str): Name of the test
-        interval(int): Interval of monitoring
+    Returns:
+        list of nodes being sampled and a dict of the sample file per node
     """
-
     logging_process = []
     tracker = {}
     proc_mon_details = _get_process_list_to_monitor()
-    interval = proc_mon_details["interval"]
-    for ceph_process in proc_mon_details["process_list"]:
-        role = ceph_process.replace("ceph-", "").strip()
-        nodes = ceph_cluster.get_nodes(role)
-        if not nodes:
-            log.info(
-                f"No nodes found specific to given process {ceph_process}, running on all nodes"
-            )
-            nodes = ceph_cluster.get_nodes()
-        for node in nodes:
-            log.info(f"Triggering monitoring for {ceph_process} on {node.hostname}")
-            if node not in tracker.keys():
-                tracker[node] = []
-            node_specific_test_name = f"{node.hostname}-{test_name}"
-            logger_cmd = (
-                f"/usr/bin/env python {SCRIPT_DST_PATH}{SCRIPT} -p {ceph_process.strip()} "
-                f"-t {node_specific_test_name} -i {interval}"
-            )
-            # Set the stop_flag as 0 before starting the test
-            cmd = f"echo '0' > {SCRIPT_DST_PATH}status"
-            node.exec_command(cmd=cmd, sudo=True)
-            th = Thread(
-                target=lambda: node.exec_command(
-                    cmd=logger_cmd, sudo=True, long_running=True
-                ),
-                args=(),
+    interval = proc_mon_details["interval"] or DEFAULT_INTERVAL
+    processes = ",".join(p.strip() for p in proc_mon_details["process_list"])
+    for node in ceph_cluster.get_nodes():
+        output = _sample_file(node, test_name)
+        log.info(f"Triggering monitoring for {processes} on {node.hostname}")
+        try:
+            node.exec_command(
+                cmd=f"rm -f {output} {output}.json {output}.stop {output}.pid; "
+                f"nohup /usr/bin/env python3 {SCRIPT_DST_PATH}{SCRIPT} "
+                f"-p {processes} -i {interval} -o {output} "
+                f"> /dev/null 2>&1 < /dev/null &",
+                sudo=True,
             )
-            logging_process.append(th)
-            th.start()
-            tracker[node].append(f"{ceph_process.strip()}-{node_specific_test_name}")
+        except Exception as e:
+            log.error(f"Failed to start monitoring on {node.hostname}: {e}")
+            continue
+        logging_process.append(node)
+        tracker[node] = output
     return logging_process, tracker
 
 
 def stop_logging_process(ceph_cluster, logging_process, download_path, tracker):
     """
-    Stops the logging process
+    Stops the sampling and collects the samples along with their summary
     Args:
         ceph_cluster(ceph): Ceph cluster object
-        logging_process(dict): Dictionary of all the active logging processes
+        logging_process(list): Nodes being sampled
         download_path(str): Path to where the data has to be downloaded
-        tracker(dict): Dict keeping track of each mon job
+        tracker(dict): Sample file of each node
+    Returns:
+        dict of the resource usage summary per node and daemon
     """
-    nodes = ceph_cluster.get_nodes()
-    for node in nodes:
-        # Set the stop_flag as 1 to stop the script running on the node
-        cmd = f"echo '1' > {SCRIPT_DST_PATH}status"
-        node.exec_command(cmd=cmd, sudo=True)
+    for node in logging_process:
+        node.exec_command(cmd=f"touch {tracker[node]}.stop", sudo=True, check_ec=False)
 
     # Wait for all the process to complete
-    wait_for_logging_processes_to_stop(logging_process)
+    wait_for_logging_processes_to_stop(logging_process, tracker)
 
-    # Collect the mem logs from all the nodes
-    download_logger_data_from_nodes(download_path, tracker)
+    # Collect the samples from all the nodes
+    return download_logger_data_from_nodes(download_path, tracker)
 
 
-def wait_for_logging_processes_to_stop(logging_process):
-    """Wait for all given logging processes to stop
+def wait_for_logging_processes_to_stop(logging_process, tracker):
+    """Wait for the samplers of the given nodes to exit
     Args:
-     logging_process(list): List of all the active logging processes
+     logging_process(list): Nodes being sampled
+     tracker(dict): Sample file of each node
     """
-    for th in logging_process:
-        th.join()
+    for node in logging_process:
+        pid_file = f"{tracker[node]}.pid"
+        node.exec_command(
+            cmd=f"timeout {STOP_TIMEOUT} sh -c 'while [ -e {pid_file} ] && "
+            f"kill -0 $(cat {pid_file}) 2> /dev/null; do sleep 1; done'",
+            sudo=True,
+            check_ec=False,
+        )
 
 
 def download_logger_data_from_nodes(download_path, tracker):
     """
-    Downloads the logger data from all the nodes to the given path. The data will be collected and stored under folders
-    specific to each test case
+    Downloads the samples and their summary from all the nodes to the given
+    path, under a folder specific to each test case
     Args:
         download_path(str): Path where the logs are to be downloaded
-        tracker(dict): Tracker Dictionary containing nodes and files to be copied for each node
+        tracker(dict): Sample file of each node
+    Returns:
+        dict of the resource usage summary per node and daemon
     """
-    try:
-        for node, files in tracker.items():
-            for file in files:
-                src_file = f"/root/{file}.csv"
-                download_dir = (
-                    f"{download_path}/performance-metrics/{file.split('-')[-1]}"
-                )
-                os.makedirs(download_dir, exist_ok=True)
+    summaries = {}
+    for node, output in tracker.items():
+        try:
+            out, _ = node.exec_command(
+                cmd=f"/usr/bin/env python3 {SCRIPT_DST_PATH}{SCRIPT} --summary -o {output}",
+                sudo=True,
+            )
+            summaries[node.hostname] = json.loads(out)
+
+            test_name = os.path.basename(output)[len(node.hostname) + 1 : -4]
+            download_dir = f"{download_path}/performance-metrics/{test_name}"
+            os.makedirs(download_dir, exist_ok=True)
+            for src in (output, f"{output}.json"):
                 node.download_file(
-                    src=src_file, dst=f"{download_dir}/{file}.csv", sudo=True
+                    src=src,
+                    dst=f"{download_dir}/{os.path.basename(src)}",
+                    sudo=True,
                 )
-                log.info(f"Downloading {file} from {node.hostname} to {download_dir}")
-        log.info("All files downloaded from all the nodes")
-    except Exception:
-        log.error(f"Failed to download {file} from {node.hostname}")
+            with open(f"{download_dir}/{node.hostname}-summary.json", "w") as fd:
+                json.dump(summaries[node.hostname], fd, indent=2)
+            log.info(f"Downloaded samples of {node.hostname} to {download_dir}")
+        except Exception as e:
+            log.error(f"Failed to collect samples from {node.hostname}: {e}")
+
+    for hostname, daemons in summaries.items():
+        for daemon, usage in daemons.items():
+            log.info(f"Resource usage of {daemon} on {hostname}: {usage}")
+
+    return summaries
 
 
 def _get_process_list_to_monitor():
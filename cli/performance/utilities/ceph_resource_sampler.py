@@ -0,0 +1,247 @@
+"""
+A tool to sample the CPU and memory usage of the ceph daemons of a node.
+
+All the daemons are sampled by a single process reading procfs and the cgroup
+filesystem, no command is executed per sample. Each sample is appended to the
+output file as a fixed size binary record and the daemon names are written to
+a json index next to it, keeping hours of sub-10s samples in a few megabytes.
+
+Usage:
+    ceph_resource_sampler.py -p ceph-osd,ceph-mon -i 5 -o /home/node1-test.bin
+    ceph_resource_sampler.py --summary -o /home/node1-test.bin
+
+The sampler stops once the stop file (<output>.stop) exists or on SIGTERM,
+its pid is kept in <output>.pid while it runs.
+The summary mode prints, per daemon, the peak RSS, the CPU seconds consumed
+and the RSS growth slope over the sampled period as json.
+"""
+
+import argparse
+import json
+import os
+import signal
+import struct
+import time
+
+# timestamp, pid, cpu ticks, rss, pss, swap, cgroup memory
+RECORD = struct.Struct("<dIQQQQQ")
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+# Maximum sampling duration, guards against a lost stop request
+MAX_DURATION = 7 * 24 * 3600
+
+_stop = False
+
+
+def _read(path):
+    try:
+        with open(path) as fd:
+            return fd.read()
+    except (IOError, OSError):
+        return None
+
+
+def find_daemons(process_names):
+    """Return {pid: daemon name} of the processes matching the given names."""
+    daemons = dict()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+
+        comm = (_read(f"/proc/{pid}/comm") or "").strip()
+        if comm not in process_names:
+            continue
+
+        cmdline = (_read(f"/proc/{pid}/cmdline") or "").split("\0")
+        name = comm
+        for index, arg in enumerate(cmdline[:-1]):
+            if arg in ("--id", "-i", "-n"):
+                name = f"{comm}.{cmdline[index + 1]}"
+                break
+        daemons[int(pid)] = name
+
+    return daemons
+
+
+def _cgroup_memory(pid):
+    cgroup = _read(f"/proc/{pid}/cgroup") or ""
+    for line in cgroup.splitlines():
+        _, controllers, path = line.split(":", 2)
+        if controllers == "":
+            value = _read(f"/sys/fs/cgroup{path}/memory.current")
+        elif "memory" in controllers.split(","):
+            value = _read(f"/sys/fs/cgroup/memory{path}/memory.usage_in_bytes")
+        else:
+            continue
+        if value:
+            return int(value)
+
+    return 0
+
+
+def sample(pid):
+    """Return (cpu ticks, rss, pss, swap, cgroup memory) of the process."""
+    stat = _read(f"/proc/{pid}/stat")
+    if not stat:
+        return None
+
+    # the command name may hold spaces, the fields are after its parenthesis
+    fields = stat[stat.rindex(")") + 2 :].split()
+    ticks = int(fields[11]) + int(fields[12])
+    rss = int(fields[21]) * PAGE_SIZE
+    pss = swap = 0
+    for line in (_read(f"/proc/{pid}/smaps_rollup") or "").splitlines():
+        if line.startswith("Pss:"):
+            pss = int(line.split()[1]) * 1024
+        elif line.startswith("Swap:"):
+            swap = int(line.split()[1]) * 1024
+
+    return ticks, rss, pss, swap, _cgroup_memory(pid)
+
+
+def run(process_names, interval, output):
+    """Sample the daemons until a stop is requested."""
+    index_file = f"{output}.json"
+    stop_file = f"{output}.stop"
+    pid_file = f"{output}.pid"
+    index = json.loads(_read(index_file) or "{}")
+    if os.path.exists(stop_file):
+        os.remove(stop_file)
+
+    with open(pid_file, "w") as fd:
+        fd.write(str(os.getpid()))
+
+    try:
+        _sample_loop(process_names, interval, output, index)
+    finally:
+        os.remove(pid_file)
+
+
+def _sample_loop(process_names, interval, output, index):
+    index_file = f"{output}.json"
+    stop_file = f"{output}.stop"
+    started = time.time()
+    with open(output, "ab", buffering=0) as fd:
+        while not _stop and not os.path.exists(stop_file):
+            now = time.time()
+            if now - started > MAX_DURATION:
+                break
+
+            daemons = find_daemons(process_names)
+            if any(str(pid) not in index for pid in daemons):
+                index.update((str(pid), name) for pid, name in daemons.items())
+                with open(f"{index_file}.tmp", "w") as idx:
+                    json.dump(index, idx)
+                os.rename(f"{index_file}.tmp", index_file)
+
+            records = []
+            for pid in daemons:
+                values = sample(pid)
+                if values:
+                    records.append(RECORD.pack(now, pid, *values))
+            fd.write(b"".join(records))
+
+            time.sleep(max(0, interval - (time.time() - now)))
+
+
+def load(output):
+    """Return the samples of the output file per daemon."""
+    index = json.loads(_read(f"{output}.json") or "{}")
+    series = dict()
+    with open(output, "rb") as fd:
+        data = fd.read()
+
+    for offset in range(0, len(data) - RECORD.size + 1, RECORD.size):
+        ts, pid, ticks, rss, pss, swap, cgroup = RECORD.unpack_from(data, offset)
+        name = index.get(str(pid), str(pid))
+        series.setdefault(f"{name}[{pid}]", []).append(
+            (ts, ticks, rss, pss, swap, cgroup)
+        )
+
+    return series
+
+
+def _slope(points):
+    """Least squares slope of the (x, y) points."""
+    if len(points) < 2:
+        return 0.0
+
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return 0.0
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def summary(output):
+    """Return the resource usage summary per daemon."""
+    result = dict()
+    for daemon, samples in load(output).items():
+        start = samples[0][0]
+        result[daemon] = {
+            "samples": len(samples),
+            "duration_sec": round(samples[-1][0] - start, 1),
+            "cpu_seconds": round((samples[-1][1] - samples[0][1]) / CLOCK_TICKS, 2),
+            "peak_rss_mb": round(max(s[2] for s in samples) / 2**20, 1),
+            "last_rss_mb": round(samples[-1][2] / 2**20, 1),
+            "peak_pss_mb": round(max(s[3] for s in samples) / 2**20, 1),
+            "peak_cgroup_mb": round(max(s[5] for s in samples) / 2**20, 1),
+            "rss_growth_mb_per_hour": round(
+                _slope([(s[0] - start, s[2]) for s in samples]) * 3600 / 2**20, 3
+            ),
+        }
+
+    return result
+
+
+def _terminate(*_):
+    global _stop
+    _stop = True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sample the CPU and memory usage of the ceph daemons"
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=str,
+        dest="processes",
+        default="ceph-osd,ceph-mon,ceph-mgr,ceph-mds,radosgw",
+        help="Comma separated process names to be sampled",
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        dest="interval",
+        default=5,
+        help="Time interval between consecutive samples(Default:5)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, dest="output", required=True, help="Output file"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Print the summary of the samples instead of sampling",
+    )
+    args = parser.parse_args()
+
+    if args.summary:
+        print(json.dumps(summary(args.output), indent=2))
+        return
+
+    signal.signal(signal.SIGTERM, _terminate)
+    processes = set(p.strip() for p in args.processes.split(",") if p.strip())
+    run(processes, args.interval, args.output)
+
+
+if __name__ == "__main__":
+    main()
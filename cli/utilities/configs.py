@@ -1,9 +1,12 @@
 import os
+from copy import deepcopy
 
 import yaml
 
 from cli.exceptions import ConfigError
 
+_cephci_config = dict()
+
 
 def get_cephci_config():
     """Get data from ~/.cephci.yaml"""
@@ -11,13 +14,19 @@ def get_cephci_config():
     home_dir = os.path.expanduser("~")
     cfg_file = os.path.join(home_dir, ".cephci.yaml")
 
-    # Read config file
+    # Read config file, parsed again only once modified
     try:
-        with open(cfg_file, "r") as yml:
-            return yaml.safe_load(yml)
+        stat = os.stat(cfg_file)
+        key = (cfg_file, stat.st_mtime_ns, stat.st_size)
+        if _cephci_config.get("key") != key:
+            with open(cfg_file, "r") as yml:
+                _cephci_config.update(key=key, cfg=yaml.safe_load(yml))
     except ConfigError:
         raise ConfigError("Failed to read ~/.cephci.yaml")
 
+    # callers are free to modify their copy
+    return deepcopy(_cephci_config["cfg"])
+
 
 def get_registry_details(ibm_build=False):
     """Get registry credentials
@@ -27,6 +27,14 @@ RHBUILD_PATTERN = r"(\d\.\d)-(rhel-\d)"
 
 CEPH_PUB_KEY = "/etc/ceph/ceph.pub"
 
+FS_BULK_OPS_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "utility",
+    "fs_bulk_ops.py",
+)
+FS_BULK_OPS_REMOTE_PATH = "/tmp/fs_bulk_ops.py"
+FS_BULK_OPS_WORKERS = 8
+
 
 def get_disk_list(node, expr=None, **kw):
     """Get disks used by ceph cluster
@@ -694,25 +702,20 @@ def create_files(client, mount_point, file_count, windows_client=False, sudo=Tru
         sudo (bool): Whether to use sudo for Linux client commands
     """
 
+    if not windows_client:
+        stats = _fs_bulk_op(
+            client, "create", mount_point, sudo=sudo, start=0, count=file_count + 1
+        )
+        log.info(f"Created {stats['files']} files on {mount_point}")
+        return
+
     for i in range(0, file_count + 1):
         log.info(f"Creating file{i}")
         try:
-            if windows_client:
-                cmd = f"type nul > {mount_point}\\win_file{i}"
-                client.exec_command(
-                    cmd=cmd,
-                )
-            else:
-                cmd = f"dd if=/dev/urandom of={mount_point}/file{i} bs=1 count=1"
-                # create a file with touch command instead of dd command to avoid the error "No space left on device"
-                client.exec_command(
-                    sudo=sudo,
-                    cmd=f"touch {mount_point}/file{i}",
-                )
-                client.exec_command(
-                    sudo=sudo,
-                    cmd=cmd,
-                )
+            cmd = f"type nul > {mount_point}\\win_file{i}"
+            client.exec_command(
+                cmd=cmd,
+            )
             log.info(f"Created file{i}")
         except Exception:
             raise OperationFailedError(f"failed to create file file{i}")
@@ -757,14 +760,7 @@ def change_ownership(client, mount_point, file_count, user):
         num_files (int): total file count
         user (str): user name
     """
-    for i in range(1, file_count + 1):
-        try:
-            client.exec_command(
-                sudo=True,
-                cmd=f"chown {user} {mount_point}/file{i}",
-            )
-        except Exception:
-            raise OperationFailedError(f"failed to change ownership for file{i}")
+    _fs_bulk_op(client, "chown", mount_point, start=1, count=file_count, user=user)
 
 
 def git_clone(node, git_link, dir) -> None:
@@ -906,22 +902,136 @@ def remove_files(client, mount_point, file_count, windows_client=False):
         mount_point (str): mount path
         file_count (int): total file count
     """
+    if not windows_client:
+        _fs_bulk_op(client, "remove", mount_point, start=1, count=file_count)
+        return
+
     for i in range(1, file_count + 1):
         try:
-            if windows_client:
-                cmd = f"del {mount_point}\\win_file{i}"
-                client.exec_command(
-                    cmd=cmd,
-                )
-            else:
-                client.exec_command(
-                    sudo=True,
-                    cmd=f"rm -rf {mount_point}/file{i}",
-                )
+            cmd = f"del {mount_point}\\win_file{i}"
+            client.exec_command(
+                cmd=cmd,
+            )
         except Exception:
             raise OperationFailedError(f"failed to remove file{i}")
 
 
+def _setup_fs_bulk_ops(client, sudo=True):
+    """Copies the bulk filesystem operations helper to the client"""
+    with open(FS_BULK_OPS_SCRIPT) as script:
+        remote = client.remote_file(
+            sudo=sudo, file_name=FS_BULK_OPS_REMOTE_PATH, file_mode="w"
+        )
+        remote.write(script.read())
+        remote.flush()
+        remote.close()
+
+
+def _iter_fs_bulk_op(client, op, path, sudo=True, timeout=3600, **kw):
+    """
+    Run a bulk filesystem operation with a single command on the client
+    Args:
+        client (ceph): Client node
+        op (str): checksum, create, chown or remove
+        path (str): directory of the files
+        sudo (bool): Whether to use sudo
+        timeout (int): timeout of the operation in seconds
+        kw (dict): options of the operation, refer utility/fs_bulk_ops.py
+    Yields:
+        records of the operation, the statistics are yielded last
+    """
+    _setup_fs_bulk_ops(client, sudo=sudo)
+    options = " ".join(
+        f"--{k.replace('_', '-')} {shlex.quote(str(v))}"
+        for k, v in kw.items()
+        if v is not None
+    )
+    cmd = f"python3 {FS_BULK_OPS_REMOTE_PATH} {op} --path {shlex.quote(path)} {options}"
+
+    stats = None
+    for line in client.iter_command_output(
+        cmd, sudo=sudo, timeout=timeout, check_ec=False
+    ):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError:
+            raise OperationFailedError(f"Bulk {op} failed on {path}: {line}")
+        if isinstance(record, dict):
+            stats = record["stats"]
+        yield record
+
+    if stats is None:
+        raise OperationFailedError(f"Bulk {op} failed on {path}, no statistics")
+    log.info(
+        f"Bulk {op} of {stats['files']} files on {path}: "
+        f"{stats['files_per_sec']:.1f} files/s"
+    )
+    if stats["failed"]:
+        raise OperationFailedError(
+            f"Bulk {op} failed for {stats['failed']} files on {path}: {stats['errors']}"
+        )
+
+
+def _fs_bulk_op(client, op, path, **kw):
+    """Run a bulk filesystem operation and return its statistics"""
+    record = None
+    for record in _iter_fs_bulk_op(client, op, path, **kw):
+        pass
+    return record["stats"]
+
+
+def iter_files_checksum(
+    client,
+    directory,
+    max_depth=None,
+    algorithm="md5",
+    workers=FS_BULK_OPS_WORKERS,
+    sudo=True,
+    timeout=3600,
+):
+    """
+    Yield the checksum of the files of a directory, computed in parallel by a
+    single command on the client and streamed as they are computed
+    Args:
+        client (ceph): Client node
+        directory (str): directory of the files
+        max_depth (int): directory levels walked, all when None
+        algorithm (str): hashlib algorithm or xxh64 when python xxhash is installed
+        workers (int): files checksummed at once
+        sudo (bool): Whether to use sudo
+        timeout (int): timeout of the operation in seconds
+    Yields:
+        tuple of the file path relative to the directory and its checksum
+    """
+    for record in _iter_fs_bulk_op(
+        client,
+        "checksum",
+        directory,
+        sudo=sudo,
+        timeout=timeout,
+        max_depth=max_depth,
+        algorithm=algorithm,
+        workers=workers,
+    ):
+        if isinstance(record, list) and record[1] is not None:
+            yield record[0], record[1]
+
+
+def get_files_checksum(client, directory, **kw):
+    """
+    Get the checksum of the files of a directory with a single command
+    Args:
+        client (ceph): Client node
+        directory (str): directory of the files
+        kw (dict): options, refer iter_files_checksum
+    Returns:
+        dict of the file path relative to the directory and its checksum
+    """
+    return dict(iter_files_checksum(client, directory, **kw))
+
+
 def get_ip_from_node(node):
     """
     Returns the list of ip addresses assigned to the given node
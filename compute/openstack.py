@@ -2,11 +2,13 @@
 
 import ipaddress
 import socket
+import threading
 from datetime import datetime, timedelta
 from time import sleep
 from typing import List, Optional, Union
 from uuid import UUID
 
+from libcloud.common.openstack_identity import OpenStackAuthenticationCache
 from libcloud.compute.base import Node, NodeDriver, NodeImage, NodeSize
 from libcloud.compute.drivers.openstack import (
     OpenStack_2_NodeDriver,
@@ -16,7 +18,9 @@ from libcloud.compute.drivers.openstack import (
 from libcloud.compute.providers import get_driver
 from libcloud.compute.types import Provider
 
+from ceph.parallel import parallel
 from utility.log import Log
+from utility.rate_limit import TokenBucket
 
 from .exceptions import (
     ExactMatchFailed,
@@ -37,6 +41,72 @@ LOG = Log(__name__)
 # exception and return a response
 socket.setdefaulttimeout(280)
 
+# Sustained rate and burst of API requests issued to a single OpenStack cloud
+# by all the nodes being provisioned.
+API_RATE_LIMIT = 2
+API_BURST_LIMIT = 5
+
+
+class SharedAuthCache(OpenStackAuthenticationCache):
+    """In memory authentication cache shared by all the drivers of the process.
+
+    Every CephVMNodeV2 owns a driver as libcloud connections are not thread
+    safe, however they can share the same token instead of authenticating
+    once per node.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexts = dict()
+
+    def get(self, key):
+        with self._lock:
+            return self._contexts.get(key)
+
+    def put(self, key, context):
+        with self._lock:
+            self._contexts[key] = context
+
+    def clear(self, key):
+        with self._lock:
+            self._contexts.pop(key, None)
+
+
+AUTH_CACHE = SharedAuthCache()
+
+_api_buckets = dict()
+_lookups = dict()
+_cache_lock = threading.Lock()
+
+
+def get_api_bucket(auth_url: str) -> TokenBucket:
+    """Return the rate limiter shared by the API calls made to the given cloud."""
+    with _cache_lock:
+        if auth_url not in _api_buckets:
+            _api_buckets[auth_url] = TokenBucket(API_RATE_LIMIT, API_BURST_LIMIT)
+
+        return _api_buckets[auth_url]
+
+
+def cached_lookup(key: tuple, loader):
+    """
+    Return the cached value of a static cloud resource lookup.
+
+    Images, flavors and networks do not change during provisioning hence the
+    first successful lookup is reused by every node of the cluster.
+
+    Args:
+        key:    Unique key identifying the cloud, resource kind and name.
+        loader: Callable retrieving the resource on a cache miss.
+    """
+    with _cache_lock:
+        if key in _lookups:
+            return _lookups[key]
+
+    value = loader()
+    with _cache_lock:
+        return _lookups.setdefault(key, value)
+
 
 def get_openstack_driver(**creds) -> Union[NodeDriver, OpenStack_2_NodeDriver]:
     """
@@ -68,6 +138,7 @@ def get_openstack_driver(**creds) -> Union[NodeDriver, OpenStack_2_NodeDriver]:
         ex_force_service_region=creds["service_region"],
         ex_domain_name=creds["domain_name"],
         ex_tenant_domain_id=creds["tenant_domain_id"],
+        ex_auth_cache=AUTH_CACHE,
     )
 
 
@@ -164,6 +235,7 @@ class CephVMNodeV2:
 
             LOG.info(f"{node_name} networks: {[i.name for i in vm_network]}")
 
+            self._throttle()
             self.node = self.driver.create_node(
                 name=node_name,
                 image=image,
@@ -277,6 +349,18 @@ class CephVMNodeV2:
         self.driver = get_openstack_driver(**self._os_cred)
 
     # Private methods to the object
+    def _throttle(self) -> None:
+        """Wait for the cloud API rate limiter to allow a request."""
+        get_api_bucket(self._os_cred["auth_url"]).acquire()
+
+    def _lookup_key(self, kind: str, name: str) -> tuple:
+        return (
+            self._os_cred["auth_url"],
+            self._os_cred["tenant_name"],
+            kind,
+            name,
+        )
+
     def _get_node(self, name: str) -> Node:
         """
         Retrieve the Node object using the provided name.
@@ -319,6 +403,13 @@ class CephVMNodeV2:
             ExactMatchFailed - when the named image resource does not exist in the given
                                OpenStack cloud.
         """
+        return cached_lookup(
+            self._lookup_key("image", name), lambda: self._fetch_image(name)
+        )
+
+    def _fetch_image(self, name: str) -> NodeImage:
+        """Retrieve the NodeImage instance from the cloud."""
+        self._throttle()
         try:
             if UUID(hex=name):
                 return self.driver.get_image(name)
@@ -352,12 +443,18 @@ class CephVMNodeV2:
             ResourceNotFound - when the named vm size resource does not exist in the
                                given OpenStack Cloud.
         """
-        for flavor in self.driver.list_sizes():
+        flavors = cached_lookup(self._lookup_key("flavors", ""), self._list_sizes)
+        for flavor in flavors:
             if flavor.name == name:
                 return flavor
 
         raise ResourceNotFound(f"Failed to retrieve vm size with name: {name}")
 
+    def _list_sizes(self) -> List[NodeSize]:
+        """Retrieve the list of flavors from the cloud."""
+        self._throttle()
+        return self.driver.list_sizes()
+
     def _get_network_by_name(self, name: str) -> OpenStackNetwork:
         """
         Retrieve the OpenStackNetwork instance using the provided name.
@@ -372,6 +469,14 @@ class CephVMNodeV2:
             ResourceNotFound: when the named network resource does not exist in the
                               given OpenStack cloud
         """
+        return cached_lookup(
+            self._lookup_key("network", name),
+            lambda: self._fetch_network_by_name(name),
+        )
+
+    def _fetch_network_by_name(self, name: str) -> OpenStackNetwork:
+        """Retrieve the OpenStackNetwork instance from the cloud."""
+        self._throttle()
         url = f"{self.driver._networks_url_prefix}?name={name}"
         object_ = self.driver.network_connection.request(url).object
         networks = self.driver._to_networks(object_)
@@ -398,6 +503,7 @@ class CephVMNodeV2:
         Returns:
             True on success else False
         """
+        self._throttle()
         url = f"/v2.0/network-ip-availabilities/{net.id}"
         resp = self.driver.network_connection.request(url)
         subnets = resp.object["network_ip_availability"]["subnet_ip_availability"]
@@ -473,6 +579,7 @@ class CephVMNodeV2:
         node = None
         while end_time > datetime.now():
             sleep(5)
+            self._throttle()
             node = self.driver.ex_get_node_details(self.node.id)
 
             if node.state == target_state:
@@ -503,9 +610,10 @@ class CephVMNodeV2:
         """
         Create and attach the volumes.
 
-        This method creates the requested number of volumes and then checks if each
-        volume has moved to available state. Once the volume has moved to available,
-        then it is attached to the node.
+        This method creates the requested number of volumes concurrently and waits
+        for each of them to move to available state. Once all the volumes are
+        available, they are attached to the node. Attach requests are issued one at
+        a time as Nova serializes the attach operations of an instance.
 
         Args:
             no_of_volumes:  The number of volumes to be created.
@@ -517,24 +625,35 @@ class CephVMNodeV2:
             size_of_disk,
             self.node.name,
         )
-        volumes = list()
+        with parallel() as p:
+            for item in range(0, no_of_volumes):
+                p.spawn(
+                    self._create_volume, size_of_disk, f"{self.node.name}-vol-{item}"
+                )
 
-        for item in range(0, no_of_volumes):
-            vol_name = f"{self.node.name}-vol-{item}"
-            volume = self.driver.create_volume(size_of_disk, vol_name)
+        for _vol in p.results:
+            self._throttle()
+            if not self.driver.attach_volume(self.node, _vol):
+                raise VolumeOpFailure("Unable to attach volume %s", _vol.name)
 
-            if not volume:
-                raise VolumeOpFailure(f"Failed to create volume with name {vol_name}")
+    def _create_volume(self, size_of_disk: int, vol_name: str) -> StorageVolume:
+        """
+        Create a volume and wait until it is available.
 
-            volumes.append(volume)
+        A driver is created for every call as libcloud connections cannot be used
+        from multiple threads, the authentication token is reused from the cache.
+        """
+        driver = get_openstack_driver(**self._os_cred)
+        self._throttle()
+        volume = driver.create_volume(size_of_disk, vol_name)
 
-        for _vol in volumes:
-            if not self._wait_until_volume_available(_vol):
-                raise VolumeOpFailure(f"{_vol.name} failed to become available.")
+        if not volume:
+            raise VolumeOpFailure(f"Failed to create volume with name {vol_name}")
 
-        for _vol in volumes:
-            if not self.driver.attach_volume(self.node, _vol):
-                raise VolumeOpFailure("Unable to attach volume %s", _vol.name)
+        if not self._wait_until_volume_available(volume, driver=driver):
+            raise VolumeOpFailure(f"{volume.name} failed to become available.")
+
+        return volume
 
     def _wait_until_ip_is_known(self):
         """Retrieve the IP address of the VM node."""
@@ -550,13 +669,17 @@ class CephVMNodeV2:
 
         raise NetworkOpFailure("Unable to get IP for {}".format(self.node.name))
 
-    def _wait_until_volume_available(self, volume: StorageVolume) -> bool:
+    def _wait_until_volume_available(
+        self, volume: StorageVolume, driver: Optional[NodeDriver] = None
+    ) -> bool:
         """Wait until the state of the StorageVolume is available."""
+        driver = driver or self.driver
         tries = 0
         while True:
             sleep(3)
             tries += 1
-            volume = self.driver.ex_get_volume(volume.id)
+            self._throttle()
+            volume = driver.ex_get_volume(volume.id)
 
             if volume.state.lower() == "available":
                 return True
@@ -1,6 +1,10 @@
 """Retrieve and process CephCI suites."""
 
+import hashlib
 import os
+import pickle
+import re
+import tempfile
 from copy import deepcopy
 from glob import glob
 from typing import List
@@ -11,6 +15,16 @@ from utility.log import Log
 
 log = Log(__name__)
 
+# libyaml based loader, the pure python loader when libyaml is not available
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bumped whenever the processing of the suites changes the compiled tests
+SUITE_CACHE_VERSION = 1
+SUITE_CACHE_DIR = os.path.join("~", ".cache", "cephci", "suites")
+
+# Compiled suites of the process, by content digest
+_compiled = dict()
+
 
 def merge_dicts(dict1, dict2):
     """
@@ -47,7 +61,7 @@ def read_yaml(file_name):
     """
     file_path = os.path.abspath(file_name)
     with open(file_path) as fp:
-        data = yaml.safe_load(fp)
+        data = yaml.load(fp, Loader=SafeLoader)
 
     return data
 
@@ -131,6 +145,175 @@ def process_override(dir_name: str) -> List:
     return test_data["tests"]
 
 
+def suite_cache_dir():
+    """Returns the directory of the compiled suites."""
+    path = os.environ.get("CEPHCI_SUITE_CACHE_DIR", SUITE_CACHE_DIR)
+    return os.path.expanduser(path)
+
+
+def suite_digest(suite: str) -> str:
+    """
+    Returns the digest of the content of a suite file or override directory.
+
+    Args:
+        suite (str):    suite file or directory with the suite and its overrides
+
+    Returns:
+        str -> sha256 hex digest of the files the tests are compiled from
+    """
+    digest = hashlib.sha256(f"{SUITE_CACHE_VERSION}".encode())
+    files = sorted(glob(os.path.join(suite, "*"))) if os.path.isdir(suite) else [suite]
+    for file in files:
+        digest.update(os.path.basename(file).encode() + b"\0")
+        with open(file, "rb") as fp:
+            digest.update(fp.read())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def _store_compiled(digest, blob):
+    cache_dir = suite_cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(blob)
+        os.replace(tmp, os.path.join(cache_dir, f"{digest}.pickle"))
+    except (IOError, OSError) as err:
+        log.debug(f"Unable to store the compiled suite {digest}: {err}")
+
+
+def compile_suite(suite: str) -> List:
+    """
+    Returns the tests of a suite file or override directory.
+
+    The tests, with the overrides applied, are cached on disk by the digest of
+    the suite content, so a suite is parsed again only once modified.
+
+    Args:
+        suite (str):    suite file or directory with the suite and its overrides
+
+    Returns:
+        List -> tests of the suite, a copy owned by the caller
+    """
+    digest = suite_digest(suite)
+    if digest in _compiled:
+        return pickle.loads(_compiled[digest])
+
+    try:
+        with open(os.path.join(suite_cache_dir(), f"{digest}.pickle"), "rb") as fp:
+            blob = fp.read()
+        tests = pickle.loads(blob)
+    except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+        log.debug(f"Compiling the tests of {suite}")
+        if os.path.isdir(suite):
+            tests = process_override(suite)
+        else:
+            tests = read_yaml(suite).get("tests")
+        blob = pickle.dumps(tests, protocol=pickle.HIGHEST_PROTOCOL)
+        _store_compiled(digest, blob)
+
+    _compiled[digest] = blob
+    return tests
+
+
+class SuiteIndex:
+    """
+    Index of the tests of all the suites under a directory.
+
+    The suites are compiled using compile_suite, hence are parsed only once
+    modified. The index allows the tests to be looked up by tier, component,
+    polarion id or module.
+    """
+
+    def __init__(self, suites_dir="suites", supported_patterns=(".yaml", ".yml")):
+        self.suites_dir = suites_dir
+        self.supported_patterns = supported_patterns
+        self._entries = None
+
+    def _suites(self):
+        for root, dirs, files in os.walk(self.suites_dir):
+            dirs.sort()
+            if "overrides.yaml" in files:
+                yield root
+                continue
+            for file in sorted(files):
+                if file.endswith(self.supported_patterns):
+                    yield os.path.join(root, file)
+
+    @property
+    def entries(self):
+        """
+        Returns the tests of the suites, as dicts holding
+            suite, release, component, tier, name, module, polarion-id, desc
+        """
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = list()
+        for suite in self._suites():
+            try:
+                tests = compile_suite(suite)
+            except Exception as err:  # noqa
+                log.debug(f"Skipping {suite}, unable to compile: {err}")
+                continue
+
+            parts = os.path.relpath(suite, self.suites_dir).split(os.sep)
+            tier = re.search(r"tier-?\d+", parts[-1])
+            for test in tests or list():
+                if not isinstance(test, dict) or not isinstance(test.get("test"), dict):
+                    continue
+                self._entries.append(
+                    {
+                        "suite": suite,
+                        "release": parts[0] if len(parts) > 1 else None,
+                        "component": parts[1] if len(parts) > 2 else None,
+                        "tier": tier.group(0) if tier else None,
+                        "name": test["test"].get("name"),
+                        "module": test["test"].get("module"),
+                        "polarion-id": test["test"].get("polarion-id"),
+                        "desc": test["test"].get("desc"),
+                    }
+                )
+
+        return self._entries
+
+    def query(
+        self, tier=None, component=None, polarion_id=None, module=None, release=None
+    ):
+        """
+        Returns the tests matching all the given criteria.
+
+        Args:
+            tier (str):         tier of the suite, like tier-1
+            component (str):    directory of the suite, like rbd or cephfs
+            polarion_id (str):  polarion id, matching any of the comma separated ids
+            module (str):       test module, like test_rbd.py
+            release (str):      release directory, like squid
+
+        Returns:
+            List -> index entries of the matching tests
+        """
+        criteria = {
+            "tier": tier,
+            "component": component,
+            "module": module,
+            "release": release,
+        }
+        results = list()
+        for entry in self.entries:
+            if any(v is not None and entry[k] != v for k, v in criteria.items()):
+                continue
+            if polarion_id is not None:
+                ids = [i.strip() for i in str(entry["polarion-id"] or "").split(",")]
+                if polarion_id not in ids:
+                    continue
+            results.append(entry)
+
+        return results
+
+
 class Directory:
     """process given suite directory and return fragments in the suite directory"""
 
@@ -275,8 +458,7 @@ class Suite:
 
         for suite in self._test_suites:
             if os.path.isfile(suite) and suite.endswith(self.supported_patterns):
-                tests = read_yaml(suite)
-                suites["tests"].extend(tests.get("tests"))
+                suites["tests"].extend(compile_suite(suite))
                 continue
 
             if not os.path.isdir(suite):
@@ -284,7 +466,7 @@ class Suite:
                 suites["nan"].append(suite)
                 continue
 
-            suites["tests"].extend(process_override(suite))
+            suites["tests"].extend(compile_suite(suite))
 
         return suites
 
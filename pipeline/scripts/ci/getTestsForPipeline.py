@@ -9,6 +9,9 @@ import yaml
 from docopt import docopt
 
 log = logging.getLogger(__name__)
+
+# libyaml based loader, the pure python loader when libyaml is not available
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 doc = """
 This script fetches all the tests to be run for a pipeline based on the RHCS version and overrides
 
@@ -60,7 +63,8 @@ def fetch_from_metadata(rhcephVersion):
     current_dir = os.path.dirname(os.path.abspath(__file__))
     metadata_dir = os.path.abspath(f"{current_dir}/../../metadata")
     metadata_file = f"{metadata_dir}/{rhcephVersion}.yaml"
-    metadata_content = yaml.safe_load(open(metadata_file, "r"))
+    with open(metadata_file, "r") as fp:
+        metadata_content = yaml.load(fp, Loader=SafeLoader)
     return metadata_content
 
 
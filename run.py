@@ -7,12 +7,11 @@ import os
 import pickle
 import re
 import sys
-import time
+import threading
 import traceback
 from copy import deepcopy
 from getpass import getuser
 
-import requests
 import yaml
 from docopt import docopt
 from libcloud.common.types import LibcloudError
@@ -20,6 +19,8 @@ from libcloud.common.types import LibcloudError
 import init_suite
 from ceph.ceph import Ceph, CephNode
 from ceph.clients import WinNode
+from ceph.parallel import parallel
+from ceph.rados.state_cache import clear_state_caches, invalidate_state_cache
 from ceph.utils import (
     cleanup_ceph_nodes,
     cleanup_ibmc_ceph_nodes,
@@ -29,8 +30,11 @@ from ceph.utils import (
     create_ibmc_ceph_nodes,
     create_onecloud_ceph_nodes,
 )
+from ceph.waiter import WaitTelemetry
 from cephci.cluster_info import collect_ceph_coredumps, get_ceph_var_logs
+from cephci.scheduler import schedule
 from cephci.utils.build_info import CephTestManifest
+from cli.cephadm.shell_session import stop_shell_sessions
 from cli.performance.memory_and_cpu_utils import (
     start_logging_processes,
     stop_logging_process,
@@ -39,7 +43,8 @@ from cli.performance.memory_and_cpu_utils import (
 from compute.aws_ec2 import cleanup_aws_ceph_nodes
 from compute.onecloud import cleanup_onecloud_ceph_nodes, expand_private_key_path
 from utility import sosreport
-from utility.log import Log
+from utility.http_cache import cached_get
+from utility.log import Log, in_test
 from utility.polarion import post_to_polarion
 from utility.retry import retry
 from utility.utils import (  # ReportPortal,
@@ -94,6 +99,7 @@ A simple test suite wrapper that executes tests based on yaml test configuration
         [--enable-eus]
         [--skip-enabling-rhel-rpms]
         [--skip-sos-report]
+        [--sos-report-profile <name>]
         [--skip-tc <items>]
         [--monitor-performance]
         [--disable-console-log]
@@ -162,6 +168,8 @@ Options:
                                     rhel images for Interop runs
   --skip-sos-report                 Enables to collect sos-report on test suite failures
                                     [default: false]
+  --sos-report-profile <name>       sos plugins collected on failures, full or ceph
+                                    [default: full]
   --skip-tc <items>                 skip test case provided in comma seperated fashion
   --monitor-performance             Monitor performance and CPU usage on all/required nodes
                                     for every test and collects data to specified dir
@@ -174,6 +182,9 @@ log = Log()
 test_names = []
 run_summary = {}
 
+# Upper bound on the nodes being connected and prepared at the same time.
+NODE_CONNECT_WORKERS = 16
+
 
 class CephCIArgumentError(Exception):
     pass
@@ -401,25 +412,25 @@ def create_nodes(
 
     # TODO: refactor cluster dict to cluster list
     log.info("Done creating osp instances")
-    log.info("Waiting for Floating IPs to be available")
-    if cloud_type == "onecloud":
-        wait_sec = 75
-        log.info("OneCloud: sleeping %ds for VM readiness", wait_sec)
-        time.sleep(wait_sec)
-    else:
-        log.info("Sleeping 15 Seconds")
-        time.sleep(15)
-
-    for cluster_name, cluster in ceph_cluster_dict.items():
-        for instance in cluster:
-            try:
-                instance.connect()
-            except BaseException:
-                raise
+    log.info("Waiting for the nodes to accept SSH connections")
+    with parallel(max_workers=NODE_CONNECT_WORKERS) as p:
+        for cluster_name, cluster in ceph_cluster_dict.items():
+            for instance in cluster:
+                p.spawn(bring_up_node, instance)
 
     return ceph_cluster_dict, clients
 
 
+def bring_up_node(instance):
+    """Wait for the node to be reachable and prepare it for testing.
+
+    Args:
+        instance    CephNode to be connected
+    """
+    instance.wait_for_ssh()
+    instance.connect()
+
+
 def print_results(tc):
     header = "\n{name:<30s}   {desc:<60s}   {duration:<30s}   {status:<15s}    {comments:>15s}".format(
         name="TEST NAME",
@@ -488,9 +499,8 @@ def get_tier_level(files: str) -> str:
 
 def get_html_page(url: str) -> str:
     """Returns the content of the provided link."""
-    resp = requests.get(url, verify=False)
-
     try:
+        resp = cached_get(url)
         if resp.ok:
             return resp.text
     except BaseException as be:  # noqa
@@ -705,6 +715,7 @@ def run(args):
     enable_eus = args.get("--enable-eus")
     skip_enabling_rhel_rpms = args.get("--skip-enabling-rhel-rpms")
     skip_sos_report = args.get("--skip-sos-report")
+    sos_report_profile = args.get("--sos-report-profile") or "full"
 
     # Pre define the variables for coredump and logs collection.
     # By default we don't collect any logs.
@@ -717,6 +728,9 @@ def run(args):
     if "collect-ceph-logs" in custom_config_dict.keys():
         collect_ceph_logs = bool(custom_config_dict["collect-ceph-logs"])
 
+    # Tests run at the same time, only the tests declaring their resources overlap
+    max_parallel_tests = int(custom_config_dict.get("max-parallel-tests", 1))
+
     # load config, suite and inventory yaml files
     conf = load_file(glb_file)
     suite = init_suite.load_suites(suite_files)
@@ -909,7 +923,7 @@ def run(args):
     sys.path.append(os.path.abspath("tests/nfs"))
     sys.path.append(os.path.abspath("tests/smb"))
 
-    tests = suite.get("tests")
+    tests = [test.get("test") for test in suite.get("tests")]
     tcs = []
     jenkins_rc = 0
     _rhcs_version = ctm.release
@@ -922,27 +936,49 @@ def run(args):
     # Adding processed custom_config
     ceph_test_data["custom_config_dict"] = deepcopy(custom_config_dict)
 
-    # Initialize test return code
-    rc = 0
     run_config = {
         "log_dir": run_dir,
         "run_id": run_id,
     }
     download_path = run_dir if not log_directory else log_directory
     cluster_info = []
+    # Guards the run state updated by the tests running at the same time
+    run_state_lock = threading.Lock()
+    # Start time of the failed tests, the logs are collected from the first one
+    failed_test_starts = []
 
+    # Unique names of the tests, named in suite order
+    unique_test_names = []
     for test in tests:
-        test = test.get("test")
+        unique_test_names.append(create_unique_test_name(test.get("name"), test_names))
+        test_names.append(unique_test_names[-1])
+
+    def execute_test(index, test):
+        """Runs a test of the suite, returns its results and whether to abort the run."""
+        # The logs, logged errors and waits of the test are attributed to it
+        with in_test(unique_test_names[index]):
+            try:
+                return _execute_test(index, test)
+            finally:
+                log.close_and_remove_filehandlers(unique_test_names[index])
+
+    def _execute_test(index, test):
+        nonlocal ceph_cluster_dict, clients, enable_perf_mon
+        nonlocal jenkins_rc, skip_version_compare, _rhcs_version
+
+        rc = 0
         tc = fetch_test_details(test)
+        test_tcs = []
         do_not_skip_test = test.get("do-not-skip-tc", False)
         test_file = tc["file"]
-        unique_test_name = create_unique_test_name(tc["name"], test_names)
-        test_names.append(unique_test_name)
+        unique_test_name = unique_test_names[index]
 
         tc["log-link"] = log.configure_logger(
-            unique_test_name, run_dir, disable_console_log
+            unique_test_name, run_dir, disable_console_log, scoped=True
+        )
+        test_run_config = dict(
+            run_config, test_name=unique_test_name, log_link=tc["log-link"]
         )
-        run_config.update({"test_name": unique_test_name, "log_link": tc["log-link"]})
         mod_file_name = os.path.splitext(test_file)[0]
         test_mod = importlib.import_module(mod_file_name)
         print("\nRunning test: {test_name}".format(test_name=tc["name"]))
@@ -955,8 +991,12 @@ def run(args):
 
         for cluster_name in test.get("clusters", ceph_cluster_dict):
             # Add cluster names
-            if cluster_name not in cluster_info:
-                cluster_info.append(cluster_name)
+            with run_state_lock:
+                if cluster_name not in cluster_info:
+                    cluster_info.append(cluster_name)
+
+            # Do not rely on the cluster state stored before the test started
+            invalidate_state_cache(ceph_cluster_dict[cluster_name])
 
             # If Performance and CPU usage monitoring is enabled, perform pre-reqs
             if enable_perf_mon:
@@ -974,7 +1014,7 @@ def run(args):
             else:
                 config = test.get("config", {})
 
-            parallel = test.get("parallel", [])
+            parallel_tests = test.get("parallel", [])
 
             if not config.get("base_url"):
                 config["base_url"] = base_url
@@ -1066,16 +1106,16 @@ def run(args):
                 # Initialize the cluster with the expected rhcs_version
                 ceph_cluster_dict[cluster_name].rhcs_version = _rhcs_version
                 if mod_file_name not in skip_tc_list or do_not_skip_test:
-                    if parallel:
+                    if parallel_tests:
                         parallel_tcs, rc = test_mod.run(
                             ceph_cluster=ceph_cluster_dict[cluster_name],
                             ceph_nodes=ceph_cluster_dict[cluster_name],
                             config=config,
-                            parallel=parallel,
+                            parallel=parallel_tests,
                             test_data=ceph_test_data,
                             ceph_cluster_dict=ceph_cluster_dict,
                             clients=clients,
-                            run_config=run_config,
+                            run_config=test_run_config,
                             tc=tc,
                         )
 
@@ -1089,17 +1129,17 @@ def run(args):
                                     minutes=int(mins),
                                     seconds=float(secs),
                                 )
-                        tcs.extend(parallel_tcs)
+                        test_tcs.extend(parallel_tcs)
                     else:
                         rc = test_mod.run(
                             ceph_cluster=ceph_cluster_dict[cluster_name],
                             ceph_nodes=ceph_cluster_dict[cluster_name],
                             config=config,
-                            parallel=parallel,
+                            parallel=parallel_tests,
                             test_data=ceph_test_data,
                             ceph_cluster_dict=ceph_cluster_dict,
                             clients=clients,
-                            run_config=run_config,
+                            run_config=test_run_config,
                         )
                 else:
                     rc = -1
@@ -1119,15 +1159,18 @@ def run(args):
             finally:
                 # Stop performance and Cpu usage monitoring
                 if enable_perf_mon:
-                    stop_logging_process(
+                    tc["resource_usage"] = stop_logging_process(
                         ceph_cluster_dict[cluster_name],
                         logging_process,
                         download_path,
                         tracker,
                     )
                 collect_recipe(ceph_cluster_dict[cluster_name])
+                WaitTelemetry.log_summary(test=unique_test_name)
+                WaitTelemetry.reset(test=unique_test_name)
                 if store:
-                    store_cluster_state(ceph_cluster_dict, ceph_clusters_file)
+                    with run_state_lock:
+                        store_cluster_state(ceph_cluster_dict, ceph_clusters_file)
 
                 # Artifacts from test appended to comments
                 if config.get("artifacts"):
@@ -1146,7 +1189,9 @@ def run(args):
                     tc["err_type"], tc["err_msg"] = "error", ""
 
                     # Get error messages
-                    tc["err_msg"] = "\n".join(map(str, _object._log_errors))
+                    tc["err_msg"] = "\n".join(
+                        map(str, _object.pop_errors(unique_test_name))
+                    )
 
                 break
 
@@ -1156,7 +1201,7 @@ def run(args):
 
         # Reset errors list
         if _object:
-            _object._log_errors = []
+            _object.pop_errors(unique_test_name)
 
         if rc == 0:
             tc["status"] = "Pass"
@@ -1178,6 +1223,8 @@ def run(args):
 
         else:
             tc["status"] = "Failed"
+            with run_state_lock:
+                failed_test_starts.append(start)
             msg = "Test {} failed".format(test_mod)
             log.info(msg)
             print(msg)
@@ -1188,8 +1235,11 @@ def run(args):
 
             if test.get("abort-on-fail", False):
                 log.info("Aborting on test failure")
-                tcs.append(tc)
-                break
+                return test_tcs + [tc], True
+
+        if test.get("destroy-cluster") is True or test.get("recreate-cluster") is True:
+            stop_shell_sessions()
+            clear_state_caches()
 
         if test.get("destroy-cluster") is True:
             if cloud_type == "openstack":
@@ -1215,7 +1265,16 @@ def run(args):
                 platform=platform,
             )
 
-        tcs.append(tc)
+        return test_tcs + [tc], False
+
+    # Tests are run in the order of their DAG, refer cephci/scheduler.py
+    # Every test logs to its own files, the startup logs are completed
+    log.close_and_remove_filehandlers()
+    results = schedule(
+        tests, execute_test, list(ceph_cluster_dict), max_workers=max_parallel_tests
+    )
+    for test_tcs in results:
+        tcs.extend(test_tcs or [])
 
     url_base = (
         magna_url + run_dir.split("/")[-1]
@@ -1224,6 +1283,7 @@ def run(args):
     )
     log.info("\nAll test logs located here: {base}".format(base=url_base))
 
+    stop_shell_sessions()
     log.close_and_remove_filehandlers()
 
     test_run_metadata = {
@@ -1277,13 +1337,18 @@ def run(args):
 
     email_results(test_result=test_res)
 
+    # Logs and coredumps are collected from the start of the first failed test
+    collect_since = min(failed_test_starts, default=run_start_time)
+
     if jenkins_rc or collect_coredump:
         log.info(
             "\n\nPreserving core-dump directory due to failures in testcase or user instructed"
         )
         for cluster in ceph_cluster_dict.keys():
             # method to collect coredumps from ceph nodes
-            collect_ceph_coredumps(ceph_cluster_dict[cluster], run_dir)
+            collect_ceph_coredumps(
+                ceph_cluster_dict[cluster], run_dir, since=collect_since
+            )
         log.info(f"Generated coredump location : {url_base}/ceph_coredumps\n")
 
     if jenkins_rc and not skip_sos_report:
@@ -1293,8 +1358,9 @@ def run(args):
         for cluster in ceph_cluster_dict.keys():
             log.info(f"Installing Ceph-common on {cluster} nodes to gather Sos report")
 
-            for node in ceph_cluster_dict[cluster].get_nodes():
-                setup_cluster_access(ceph_cluster_dict[cluster], node)
+            with parallel(max_workers=sosreport.SOSREPORT_WORKERS) as p:
+                for node in ceph_cluster_dict[cluster].get_nodes():
+                    p.spawn(setup_cluster_access, ceph_cluster_dict[cluster], node)
 
             installer = ceph_cluster_dict[cluster].get_nodes(role="installer")[0]
             sosreport.run(
@@ -1302,6 +1368,7 @@ def run(args):
                 installer.username,
                 installer.password or "cephuser",
                 run_dir,
+                profile=sos_report_profile,
             )
 
         log.info(f"Generated sosreports location : {url_base}/sosreports\n")
@@ -1312,7 +1379,7 @@ def run(args):
         )
         for cluster in ceph_cluster_dict.keys():
             # method to collect logs from ceph nodes
-            get_ceph_var_logs(ceph_cluster_dict[cluster], run_dir)
+            get_ceph_var_logs(ceph_cluster_dict[cluster], run_dir, since=collect_since)
 
         log.info(f"Generated cluster log location : {url_base}/ceph_logs\n")
 
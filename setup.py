@@ -32,6 +32,9 @@ setup(
         "requests==2.32.4",
         "python-ipmi==0.5.7",
     ],
+    extras_require={
+        "async": ["asyncssh>=2.14.0"],
+    },
     zip_safe=True,
     include_package_data=True,
     packages=find_packages(exclude=["ez_setup"]),
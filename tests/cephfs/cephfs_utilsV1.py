@@ -29,6 +29,7 @@ from ceph.utils import check_ceph_healthly
 from cli.ceph.ceph import Ceph
 from cli.cephadm.cephadm import CephAdm
 from cli.utilities.filesys import Mount
+from cli.utilities.utils import get_files_checksum
 from compute.openstack import get_openstack_driver
 from tests.cephfs.exceptions import ValueMismatchError
 from utility.log import Log
@@ -2558,21 +2559,12 @@ os.system('sudo systemctl start  network')
     def get_files_and_checksum(self, client, directory):
         """
         This will collect the filenames and their respective checksums and returns the dictionary
+        The checksums are computed in parallel by a single command on the client
         :param client:
         :param directory:
         :return:
         """
-        out, rc = client.exec_command(
-            sudo=True, cmd=f"find {directory} -maxdepth 1 -type f -printf '%f\n'"
-        )
-
-        file_list = out.strip().split()
-        file_dict = {}
-        for file in file_list:
-            out, rc = client.exec_command(sudo=True, cmd=f"md5sum {directory}/{file}")
-            md5sum = out.strip().split()
-            file_dict[file] = md5sum[0]
-        return file_dict
+        return get_files_checksum(client, directory, max_depth=1)
 
     def set_xattrs(
         self,
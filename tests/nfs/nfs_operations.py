@@ -11,6 +11,7 @@ import yaml
 from looseversion import LooseVersion
 
 from ceph.ceph import CommandFailed
+from ceph.log_scanner import daemon_unit, get_log_scanner
 from ceph.waiter import WaitUntil
 from cli.ceph.ceph import Ceph
 from cli.cephadm.cephadm import CephAdm
@@ -1970,19 +1971,24 @@ def nfs_log_parser(client, nfs_node, nfs_name, expect_list=None, expect_quiet=Fa
         cmd = f"ceph orch ps | grep {nfs_name}"
         out = list(client.exec_command(sudo=True, cmd=cmd))[0]
         nfs_daemon_name = out.split()[0]
-        for search_str in expect_list:
-            cmd = f"cephadm logs --name {nfs_daemon_name} > nfs_log"
-            nfs_node.exec_command(sudo=True, cmd=cmd)
-            try:
-                cmd = f'grep "{search_str}" nfs_log'
-                out = nfs_node.exec_command(sudo=True, cmd=cmd)
-                if len(out) > 0:
-                    log.info(
-                        f"Found {search_str} in {nfs_daemon_name} log on {nfs_node.hostname}:\n {out}"
-                    )
-                    results["expect"].update({search_str: nfs_node})
-            except BaseException as ex:
-                log.info(ex)
+        fsid = list(client.exec_command(sudo=True, cmd="ceph fsid"))[0].strip()
+
+        # The journal of the daemon, read by cephadm logs, is scanned once for
+        # all the strings and only from where the previous parsing stopped
+        scanner = get_log_scanner(nfs_node, unit=daemon_unit(fsid, nfs_daemon_name))
+        try:
+            found = scanner.search(expect_list)
+        except BaseException as ex:
+            log.info(ex)
+            found = dict()
+
+        for search_str, lines in found.items():
+            if lines:
+                log.info(
+                    f"Found {search_str} in {nfs_daemon_name} log on {nfs_node.hostname}:\n "
+                    + "\n".join(lines)
+                )
+                results["expect"].update({search_str: nfs_node})
 
         expect_not_found = []
         for exp_str in expect_list:
@@ -12,6 +12,7 @@ from looseversion import LooseVersion
 
 from ceph.ceph import Ceph
 from ceph.ceph_admin.orch import Orch
+from ceph.nvmeof.cli.v2.base_cli import forget_ceph_versions
 from ceph.utils import get_node_by_id
 from cephci.utils.configs import get_configs, get_registry_credentials
 from cli.utilities.containers import Registry
@@ -270,6 +271,9 @@ def run(ceph_cluster: Ceph, **kwargs) -> int:
         # Monitor upgrade status, till completion
         orch.monitor_upgrade_status()
 
+        # The gateway CLI options depend on the Ceph version, probe it again
+        forget_ceph_versions()
+
         # Post upgrade nvmeof daemons are taking time to start, so wait for 60 seconds
         time.sleep(60)
         LOG.info("Validate upgraded versions of NVMe Gateways")
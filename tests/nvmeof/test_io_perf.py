@@ -18,6 +18,7 @@ from tests.nvmeof.workflows.initiator import NVMeInitiator
 from tests.nvmeof.workflows.nvme_service import NVMeService
 from tests.rbd.rbd_utils import initial_rbd_config
 from utility.io.fio_profiles import IO_Profiles
+from utility.io.fio_results import FioReport, fetch_fio_result, merge_ops
 from utility.log import Log
 from utility.utils import create_run_dir, generate_unique_id, run_fio
 
@@ -32,7 +33,7 @@ METRICS = [
 ]
 
 results = {}
-csv_op = []
+report = FioReport()
 
 RBD_MAP = "rbd map {pool}/{image}"
 RBD_UNMAP = "rbd unmap {device}"
@@ -42,25 +43,13 @@ cli_image = str()
 
 def initialize():
     """Initialize the reports."""
-    _results = {}
-    _csv_op = [
-        "name,protocol,io_type,image,iteration,read_iops,read_bandwidth,read_slat_avg_ns,read_clat_avg_ns,"
-        "read_lat_avg_ns,write_iops,write_bandwidth,write_slat_avg_ns,write_clat_avg_ns,"
-        "write_lat_avg_ns"
-    ]
-    return _results, _csv_op
+    return {}, FioReport()
 
 
 def calculate_average(data):
-    """Calculate average values for data sets(dict)."""
-    dicts = [i for i in data]  # Combine the dictionaries into a tuple
-    averages = {}
-    dict1 = data[0]
-    for key in dict1.keys():
-        values = [d[key] for d in dicts]
-        # Get the values for the current key from all dictionaries
-        average = sum(values) / len(values)  # Calculate the average
-        averages[key] = average
+    """Calculate average values of the FIO results of all iterations and images."""
+    op = merge_ops(data, mode="mean")
+    averages = dict(zip(METRICS, [op.iops, op.bw, op.slat_ns, op.clat_ns, op.lat_ns]))
 
     LOG.info(f"Averages: {averages}")
     return averages
@@ -179,11 +168,8 @@ def build_charts(io_type, data, test_config, cfg):
             if io not in ["write", "read"]:
                 continue
             ios.append(io)
-            __list = []
-            for i in _list:
-                __list.append(dict((k, v) for k, v in i.items() if k in METRICS))
             LOG.info(f"Calculating Averages for {proto}-{io} with data {_list}")
-            data[proto][io] = calculate_average(__list)
+            data[proto][io] = calculate_average(_list)
 
     for io, metrics in data[protocols[0]].items():
         if io not in ["write", "read"]:
@@ -257,90 +243,40 @@ def parse_fio_output(node, op_file):
     Args:
         node: FIO node
         op_file: FIO result file
-    Returns:
-        parsed_op
     """
-    _csv_op = []
-    _file = node.remote_file(file_name=op_file, file_mode="r")
-    data = json.loads(_file.read())
-    _file.close()
-
-    job = data["jobs"][0]
-    # FIO_WRITE_BS_4k_IODepth8_LIBAIO-TIEA-0-_dev_rbd17-librbd
-    # In case of read (FIO_READ_BS_4k_IODepth8_LIBAIO-R9KJ-0-librbd-_dev_rbd0)
-    if len(job["jobname"].split("-")) == 5:
-        name, _, iteration, protocol, image = job["jobname"].split("-")
-    # In case of write (FIO_WRITE_BS_4k_IODepth8_LIBAIO-2AWZ-image0-0-nvmeof-_dev_nvme0n1)
-    elif len(job["jobname"].split("-")) == 6:
-        name, _, i, iteration, protocol, image = job["jobname"].split("-")
-    io_type = job["job options"]["rw"]
-    io_information = data["global options"] | job["job options"]
-    _csv_op += [name, protocol, io_type, image, iteration]
-
-    if io_type not in results:
-        results[io_type] = {}
-
-    if protocol not in results[io_type]:
-        results[io_type][protocol] = {
-            "name": name,
-            "protocol": protocol,
-            "io_type": io_type,
-            "io_information": io_information,
-        }
-
-    results[io_type][protocol]["num_of_iterations"] = iteration
-    if job["job options"]["rw"] in ["read", "randread", "rw", "readwrite"]:
-        read = job["read"]
-        if "read" not in results[io_type][protocol]:
-            results[io_type][protocol]["read"] = []
-
-        results[io_type][protocol]["read"].append(
-            {
-                "iteration": iteration,
-                "image": image,
-                "iops": read["iops"],
-                "bandwidth": read["bw_mean"],
-                "submission_latency_in_nanoseconds": read["slat_ns"]["mean"],
-                "completion_latency_in_nanoseconds": read["clat_ns"]["mean"],
-                "overall_latency_in_nanoseconds": read["lat_ns"]["mean"],
-            }
+    for job in fetch_fio_result(node, op_file):
+        # FIO_WRITE_BS_4k_IODepth8_LIBAIO-TIEA-0-_dev_rbd17-librbd
+        # In case of read (FIO_READ_BS_4k_IODepth8_LIBAIO-R9KJ-0-librbd-_dev_rbd0)
+        if len(job.name.split("-")) == 5:
+            name, _, iteration, protocol, image = job.name.split("-")
+        # In case of write (FIO_WRITE_BS_4k_IODepth8_LIBAIO-2AWZ-image0-0-nvmeof-_dev_nvme0n1)
+        elif len(job.name.split("-")) == 6:
+            name, _, i, iteration, protocol, image = job.name.split("-")
+        io_type = job.rw
+        report.add(
+            job,
+            name=name,
+            protocol=protocol,
+            io_type=io_type,
+            image=image,
+            iteration=iteration,
         )
 
-        _csv_op += [
-            read["iops"],
-            read["bw_mean"],
-            read["slat_ns"]["mean"],
-            read["clat_ns"]["mean"],
-            read["lat_ns"]["mean"],
-        ]
-    else:
-        _csv_op += ["", "", "", "", ""]
-
-    if job["job options"]["rw"] in ["write", "randwrite", "rw", "readwrite"]:
-        write = job["write"]
-        if "write" not in results[io_type][protocol]:
-            results[io_type][protocol]["write"] = []
-
-        results[io_type][protocol]["write"].append(
-            {
-                "iteration": iteration,
-                "iops": write["iops"],
-                "image": image,
-                "bandwidth": write["bw_mean"],
-                "submission_latency_in_nanoseconds": write["slat_ns"]["mean"],
-                "completion_latency_in_nanoseconds": write["clat_ns"]["mean"],
-                "overall_latency_in_nanoseconds": write["lat_ns"]["mean"],
+        if io_type not in results:
+            results[io_type] = {}
+
+        if protocol not in results[io_type]:
+            results[io_type][protocol] = {
+                "name": name,
+                "protocol": protocol,
+                "io_type": io_type,
+                "io_information": job.options,
             }
-        )
-        _csv_op += [
-            write["iops"],
-            write["bw_mean"],
-            write["slat_ns"]["mean"],
-            write["clat_ns"]["mean"],
-            write["lat_ns"]["mean"],
-        ]
 
-    csv_op.append(",".join([op if isinstance(op, str) else str(op) for op in _csv_op]))
+        results[io_type][protocol]["num_of_iterations"] = iteration
+        for io, op in job.ops.items():
+            if io in ["read", "write"]:
+                results[io_type][protocol].setdefault(io, []).append(op)
 
 
 def librbd(ceph_cluster, **args):
@@ -575,8 +511,8 @@ def run(ceph_cluster: Ceph, **kwargs) -> int:
                       gw_node: node6
                       initiator_node: node7
     """
-    global results, csv_op, cli_image
-    results, csv_op = initialize()
+    global results, report, cli_image
+    results, report = initialize()
 
     config = kwargs["config"]
     LOG.info(f"Test IO Performance : {config}")
@@ -625,9 +561,9 @@ def run(ceph_cluster: Ceph, **kwargs) -> int:
         csv_file = f"{test_dir}/run.csv"
         json_file = f"{test_dir}/run.json"
         with open(csv_file, "w+") as _csv, open(json_file, "w+") as _json:
-            _csv.write("\n".join(csv_op))
+            _csv.write(report.to_csv())
             LOG.info(f"CSV file located here: {csv_file}")
-            _json.write(json.dumps(results, indent=2))
+            _json.write(report.to_json())
             LOG.info(f"Json file located here: {json_file}")
 
         # Plot charts
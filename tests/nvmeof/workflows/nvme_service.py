@@ -32,6 +32,7 @@ class NVMeService:
         self.config = config
         self.group = self.config.get("gw_group", None)
         self.mtls = config.get("mtls", False)
+        self.grpc_client = config.get("grpc_client", False)
         self.inband_auth_mode = config.get("inband_auth_mode", None)
         self.ceph_cluster = ceph_cluster
         self.clients = self.ceph_cluster.get_nodes(role="client")
@@ -280,6 +281,7 @@ class NVMeService:
                     nvme_gw_cli_version_adapter(self.ceph_cluster),
                     node,
                     mtls=self.mtls,
+                    grpc=self.grpc_client,
                     shell=getattr(ceph, "shell"),
                     port=port,
                     gw_group=self.group,
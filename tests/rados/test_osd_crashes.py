@@ -135,11 +135,13 @@ def run(ceph_cluster, **kw):
                 # pull script to write fragmented objects
                 script_loc = (
                     "https://raw.githubusercontent.com/red-hat-storage/cephci/"
-                    "main/utility/generate_frag_objs.py"
+                    "main/utility"
                 )
+                # the script imports the shared helpers of rados_aio.py
                 client_node.exec_command(
                     sudo=True,
-                    cmd=f"curl -k {script_loc} -O",
+                    cmd=f"curl -k {script_loc}/generate_frag_objs.py -O "
+                    f"{script_loc}/rados_aio.py -O",
                 )
                 # Setup Script pre-requisites : docopt
                 client_node.exec_command(
@@ -154,7 +156,7 @@ def run(ceph_cluster, **kw):
                     # each iteration is supposed to add 5K objects to the pool
                     index = obj_sizes.index(size) + 1
                     _exp_objs = index * 5000
-                    cmd_options = f"--pool {pool_name} --create 10000 --remove 0 --size $((1024*{size}))"
+                    cmd_options = f"--pool {pool_name} --create 10000 --remove 0 --size $((1024*{size})) --concurrency 16"
                     _cmd = f"python3 generate_frag_objs.py {cmd_options}"
 
                     out, err = client_node.exec_command(sudo=True, cmd=_cmd)
@@ -186,7 +188,7 @@ def run(ceph_cluster, **kw):
                 log.debug("Removing fragmented objects from the pool %s" % pool_name)
                 for size in rm_obj_sizes:
                     _exp_objs = _exp_objs - 5000
-                    cmd_options = f"--pool {pool_name} --create 0 --remove 10000 --size $((1024*{size}))"
+                    cmd_options = f"--pool {pool_name} --create 0 --remove 10000 --size $((1024*{size})) --concurrency 16"
                     _cmd = f"python3 generate_frag_objs.py {cmd_options}"
                     out, err = client_node.exec_command(sudo=True, cmd=_cmd)
                     log.debug(out + err)
@@ -6,6 +6,7 @@ import datetime
 import time
 
 from ceph.ceph_admin import CephAdmin
+from ceph.rados.bench_results import BaselineStore, baseline_store_path
 from ceph.rados.core_workflows import RadosOrchestrator
 from ceph.rados.perf_workflow import PerfWorkflows
 from ceph.rados.utils import get_cluster_timestamp
@@ -109,6 +110,19 @@ def run(ceph_cluster, **kw):
                     )
             time.sleep(300)
 
+        # record the radosbench results and compare them with the previous runs
+        run_dir = kw.get("run_config", {}).get("log_dir")
+        if run_dir:
+            baseline = {
+                "store": BaselineStore(baseline_store_path(run_dir)),
+                "suite": kw.get("run_config", {}).get("test_name", "rados_perf"),
+                "build": config.get("ceph_docker_image_tag", config.get("rhbuild")),
+                "cluster_conf": pool_config.get("pool_type", "replicated"),
+            }
+            for result in perf_obj.collect_radosbench_results(baseline=baseline):
+                if result.regressions:
+                    log.error(f"radosbench regressions found: {result.regressions}")
+
     except Exception as e:
         log.error(f"Failed with exception: {e.__doc__}")
         log.exception(e)
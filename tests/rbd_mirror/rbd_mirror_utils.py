@@ -9,7 +9,14 @@ from typing import List
 
 from ceph.ceph import CommandFailed
 from ceph.parallel import parallel
+from ceph.rbd.utils import (
+    EXTENT_CHECKSUM_CONCURRENCY,
+    EXTENT_SIZE,
+    compare_extent_checksums,
+    get_extent_checksums_rbd_image,
+)
 from ceph.utils import get_node_by_id
+from ceph.waiter import WaitUntil
 from tests.rbd.exceptions import IOonSecondaryError
 from utility.log import Log
 
@@ -407,16 +414,21 @@ class RbdMirror:
             imagespec: Image specification of the image of which status needs to be checked
             state_pattern: Required mirror image state
             description_pattern: Required mirror image description
-            retry_interval: sleep duration in between retries.
+            retry_interval: maximum sleep duration in between retries.
             ignore_command_failure: true if command failure is to be ignored.
         """
-        starttime = datetime.datetime.now()
         if kw.get("tout"):
             tout = kw.get("tout")
         else:
             tout = datetime.timedelta(seconds=1200)
-        time.sleep(kw.get("retry_interval", 20))
-        while True:
+        retry_interval = kw.get("retry_interval", 20)
+        for _ in WaitUntil(
+            timeout=tout.total_seconds(),
+            interval=min(5, retry_interval),
+            backoff=1.5,
+            max_interval=retry_interval,
+            jitter=0.1,
+        ):
             if kw.get("poolname", False):
                 if kw.get("health_pattern"):
                     out = self.mirror_status("pool", kw.get("poolname"), "health")
@@ -486,10 +498,8 @@ class RbdMirror:
                         continue
                     else:
                         raise
-            if datetime.datetime.now() - starttime <= tout:
-                time.sleep(kw.get("retry_interval", 20))
-            else:
-                raise Exception("Required status can not be attained")
+
+        raise Exception("Required status can not be attained")
 
     def wait_for_replay_complete(self, imagespec):
         """Waits till image replay to complete in journal based mirroring.
@@ -688,11 +698,27 @@ class RbdMirror:
             return 1
 
     # Check data consistency
-    def check_data(self, peercluster, imagespec):
+    def check_data(self, peercluster, imagespec, mode="export", **kw):
+        """Verifies the data of the image is the same on both the clusters.
+
+        Args:
+          peercluster: RbdMirror object of the peer cluster
+          imagespec: image specification
+          mode: export to compare the md5sum of full exports - Default, extents
+                to compare the checksums of the allocated extents read from librbd
+          kw:
+            extent_size: size of the compared extents in bytes
+            concurrency: number of extent reads in flight
+            max_report: number of mismatching extents reported - Default 10
+        """
         self.wait_for_status(imagespec=imagespec, state_pattern="up+stopped")
         peercluster.wait_for_status(imagespec=imagespec, state_pattern="up+replaying")
         if self.get_mirror_mode(imagespec) != "snapshot":
             peercluster.wait_for_replay_complete(imagespec)
+
+        if mode == "extents":
+            return self.check_data_extents(peercluster, imagespec, **kw)
+
         export_path = "/home/cephuser/image.export_" + self.random_string()
         self.export_image(imagespec=imagespec, path=export_path)
         peercluster.export_image(imagespec=imagespec, path=export_path)
@@ -712,6 +738,46 @@ class RbdMirror:
         else:
             raise Exception("Data Inconsistency found")
 
+    def check_data_extents(self, peercluster, imagespec, **kw):
+        """Compares the checksums of the allocated extents of the image on both the
+        clusters, read in parallel from librbd without exporting the image.
+        """
+        checksum_args = {
+            "extent_size": kw.get("extent_size", EXTENT_SIZE),
+            "concurrency": kw.get("concurrency", EXTENT_CHECKSUM_CONCURRENCY),
+        }
+        with parallel() as p:
+            for mirror in (self, peercluster):
+                p.spawn(
+                    get_extent_checksums_rbd_image,
+                    mirror.ceph_client,
+                    imagespec,
+                    cluster=mirror.cluster_name,
+                    **checksum_args,
+                )
+        local, remote = p.results
+
+        mismatches = compare_extent_checksums(local, remote)
+        if not mismatches:
+            log.info(
+                f"Data is consistent, {len(local['extents'])} extents of "
+                f"{local['extent_size']} bytes compared"
+            )
+            return 0
+
+        if local["size"] != remote["size"]:
+            log.error(f"Image size {local['size']} differs from {remote['size']}")
+        for offset in mismatches[: kw.get("max_report", 10)]:
+            log.error(
+                f"Extent at offset {offset} differs: "
+                f"{local['extents'].get(str(offset), 'zero')} vs "
+                f"{remote['extents'].get(str(offset), 'zero')}"
+            )
+        raise Exception(
+            f"Data Inconsistency found in {len(mismatches)} extents of {imagespec}, "
+            f"first at offset {mismatches[0]}"
+        )
+
     # CLIs
     def benchwrite(self, **kw):
         """Executes rbd bench write operation on provided image.
@@ -0,0 +1,25 @@
+import json
+
+import mock
+
+from ceph.ceph_admin.helper import check_service_exists
+
+
+def _orch_ls(running, size):
+    return json.dumps([{"status": {"running": running, "size": size}}]), ""
+
+
+@mock.patch("ceph.ceph_admin.helper.sleep")
+@mock.patch("ceph.ceph_admin.helper.watch_until")
+def test_check_service_exists_watches_until_converged(watch_mock, sleep_mock):
+    installer = mock.Mock()
+    installer.exec_command.side_effect = [_orch_ls(1, 3)] + [_orch_ls(3, 3)] * 4
+
+    assert check_service_exists(installer, service_type="mon", interval=20)
+
+    # The cephadm events are followed while the daemons come up, the
+    # cross-verification checks are spaced by the full interval
+    watch_mock.assert_called_once()
+    assert watch_mock.call_args.args[1] == "cephadm shell -- ceph -W cephadm"
+    assert watch_mock.call_args.args[2]("Deploying daemon mon.node2 on node2")
+    assert [c.args[0] for c in sleep_mock.call_args_list] == [20] * 3
@@ -0,0 +1,73 @@
+"""Tests the NVMe-oF gateway gRPC request translation and version probe."""
+
+from unittest import mock
+
+from ceph.nvmeof.cli.v2 import NVMeGWCLIV2
+from ceph.nvmeof.cli.v2.base_cli import BaseCLI, forget_ceph_versions
+from ceph.nvmeof.cli.v2.grpc_client import to_grpc_request
+
+
+def test_namespace_add_request():
+    method, fields = to_grpc_request(
+        "ns",
+        "add",
+        {
+            "nqn": "nqn.2016-06.io.spdk:cnode1",
+            "rbd_pool": "rbd",
+            "rbd_image_name": "image1",
+            "rbd-image-size": "1G",
+            "no-auto-visible": "",
+            "gw_group": "group1",
+        },
+    )
+
+    assert method == "namespace_add"
+    assert fields == {
+        "subsystem_nqn": "nqn.2016-06.io.spdk:cnode1",
+        "rbd_pool_name": "rbd",
+        "rbd_image_name": "image1",
+        "size": 2**30,
+        "no_auto_visible": True,
+    }
+
+
+def test_untranslated_request():
+    assert to_grpc_request("ns", "get_io_stats", {"nsid": 1}) is None
+    assert to_grpc_request("ns", "add", {"unknown-arg": "1"}) is None
+
+
+def test_version_probed_once_per_gateway():
+    shell = mock.Mock(return_value=('{"version": "ceph version 20.1.0-99"}', ""))
+    node = mock.Mock(hostname="gw-version-probe", ip_address="10.0.0.1")
+
+    first, second = BaseCLI(node, shell), BaseCLI(node, shell)
+    assert not first.uses_server_address()
+    assert not second.uses_server_address()
+    assert shell.call_count == 1
+
+
+def test_version_probed_again_once_forgotten():
+    shell = mock.Mock(return_value=('{"version": "ceph version 20.1.0-99"}', ""))
+    node = mock.Mock(hostname="gw-version-upgrade", ip_address="10.0.0.2")
+    assert not BaseCLI(node, shell).uses_server_address()
+
+    shell.return_value = ('{"version": "ceph version 20.1.0-150"}', "")
+    forget_ceph_versions([node])
+    assert BaseCLI(node, shell).uses_server_address()
+    assert shell.call_count == 2
+
+
+def test_values_are_typed_by_the_helper():
+    method, fields = to_grpc_request(
+        "subsystem", "add", {"nqn": "nqn.2016-06.io.spdk:cnode1", "serial_number": "1"}
+    )
+
+    assert method == "create_subsystem"
+    assert fields["serial_number"] == "1"
+
+
+def test_mtls_gateways_use_the_cli():
+    shell = mock.Mock(return_value=("", ""))
+    node = mock.Mock(hostname="gw-mtls", ip_address="10.0.0.2")
+
+    assert NVMeGWCLIV2(node, shell=shell, grpc=True, mtls=True).grpc_session is None
@@ -0,0 +1,69 @@
+"""Tests the rados bench result parsing and baseline store."""
+
+import pytest
+
+from ceph.rados.bench_results import BaselineStore, BenchResult, parse_bench_output
+
+JSON_OUTPUT = """hints = 1
+{"concurrent_ops":16,"object_size":4194304,"op_size":4194304,"seconds_to_run":10,\
+"total_time_run":"10.05","total_writes_made":"700","write_size":"4194304",\
+"object_size":"4194304","bandwidth_MB_sec":"278.5","stddev_bandwidth":"12.1",\
+"max_bandwidth_MB_sec":"300","min_bandwidth_MB_sec":"252","average_iops":"69",\
+"stddev_iops":"3.0","max_iops":"75","min_iops":"63","average_latency":"0.229",\
+"stddev_latency":"0.05","max_latency":"0.61","min_latency":"0.05"}
+"""
+
+TEXT_OUTPUT = """Total time run:         10.0371
+Total reads made:     700
+Read size:            4194304
+Object size:          4194304
+Bandwidth (MB/sec):   1003.2
+Average IOPS:         250
+Stddev IOPS:          10.5
+Max IOPS:             270
+Min IOPS:             231
+Average Latency(s):   0.0631
+Max latency(s):       0.21
+Min latency(s):       0.01
+"""
+
+
+def test_parse_json_summary():
+    result = parse_bench_output(JSON_OUTPUT, "write", run_name="r1")
+
+    assert result.bandwidth_mb_sec == 278.5
+    assert result.average_iops == 69
+    assert result.total_ops == 700
+    assert result.concurrent_ops == 16
+    assert result.run_name == "r1"
+
+
+def test_parse_text_summary():
+    result = parse_bench_output(TEXT_OUTPUT, "seq")
+
+    assert result.bandwidth_mb_sec == 1003.2
+    assert result.total_ops == 700
+    assert result.average_latency == 0.0631
+
+
+def test_parse_missing_summary():
+    with pytest.raises(ValueError):
+        parse_bench_output("error opening pool", "write")
+
+
+def test_regression_detected(tmp_path):
+    store = BaselineStore(str(tmp_path / "baseline.db"))
+    for bandwidth in (100, 102, 98, 101):
+        store.record(
+            BenchResult(op="write", bandwidth_mb_sec=bandwidth), "tier-2", "b1"
+        )
+
+    same = BenchResult(op="write", bandwidth_mb_sec=99)
+    assert store.check_regression(same, "tier-2") == []
+
+    slow = BenchResult(op="write", bandwidth_mb_sec=80)
+    regressions = store.check_regression(slow, "tier-2")
+    assert [r["metric"] for r in regressions] == ["bandwidth_mb_sec"]
+
+    # results of another suite are not part of the baseline
+    assert store.check_regression(slow, "tier-1") == []
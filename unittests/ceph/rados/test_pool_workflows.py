@@ -0,0 +1,96 @@
+import json
+from unittest import mock
+
+import pytest
+
+from ceph.rados.pool_workflows import BULK_IO_SCRIPT, BulkIOUnavailable, PoolFunctions
+
+
+@pytest.fixture
+def pool_obj():
+    obj = PoolFunctions.__new__(PoolFunctions)
+    obj._bulk_io_clients = set()
+    return obj
+
+
+def _client(out=""):
+    client = mock.Mock(hostname="client1")
+    client.exec_command.return_value = (out, "", 0, 1.0)
+    return client
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [("512", 512), (4096, 4096), ("4M", 4 << 20), ("2kB", 2048), ("1GiB", 1 << 30)],
+)
+def test_size_in_bytes(size, expected):
+    assert PoolFunctions._size_in_bytes(size) == expected
+
+
+@pytest.mark.parametrize("size", ["4X", "M", "-1K", ""])
+def test_invalid_size(size):
+    with pytest.raises(ValueError):
+        PoolFunctions._size_in_bytes(size)
+
+
+def test_bulk_io_setup_once_per_client(pool_obj):
+    client = _client()
+
+    pool_obj._setup_bulk_io(client)
+    pool_obj._setup_bulk_io(client)
+
+    with open(BULK_IO_SCRIPT) as script:
+        client.remote_file.return_value.write.assert_called_once_with(script.read())
+    client.exec_command.assert_called_once()
+
+
+def test_bulk_io_manifests_are_unique(pool_obj):
+    stats = {"objects": ["obj1"], "errors": 0, "ops_per_sec": 1, "mb_per_sec": 1}
+    client = _client(json.dumps(stats))
+
+    for _ in range(2):
+        assert pool_obj._run_bulk_io(client, "put", "rbd", ["obj1"], 60, 4) == stats
+
+    manifests = [
+        c.kwargs["file_name"]
+        for c in client.remote_file.call_args_list
+        if c.kwargs["file_name"].endswith(".json")
+    ]
+    assert len(set(manifests)) == 2
+    assert all(m.startswith("/tmp/rados_bulk_io_put_rbd_") for m in manifests)
+    removed = [
+        c.kwargs["cmd"]
+        for c in client.exec_command.call_args_list
+        if c.kwargs["cmd"].startswith("rm -f")
+    ]
+    assert removed == [f"rm -f {m}" for m in manifests]
+
+
+def test_rados_put_falls_back_when_librados_is_unavailable(pool_obj):
+    pool_obj._run_bulk_io = mock.Mock(side_effect=BulkIOUnavailable("no rados"))
+    pool_obj.prepare_static_data = mock.Mock(return_value="/tmp/sdata.txt")
+    client = _client()
+    client.exec_command.return_value = ("", "")
+
+    assert pool_obj.do_rados_put(client, "rbd", nobj=2) == 0
+    assert [c.kwargs["cmd"] for c in client.exec_command.call_args_list] == [
+        "rados put -p rbd obj0 /tmp/sdata.txt",
+        "rados put -p rbd obj1 /tmp/sdata.txt",
+    ]
+
+
+def test_rados_put_reports_bulk_io_failures(pool_obj):
+    pool_obj._run_bulk_io = mock.Mock(side_effect=Exception("obj1: -5"))
+    client = _client()
+
+    assert pool_obj.do_rados_put(client, "rbd", nobj=2) == 1
+    client.exec_command.assert_not_called()
+
+
+def test_unavailable_librados_is_raised(pool_obj):
+    pool_obj._bulk_io_clients.add("client1")
+    client = _client("librados python bindings are not available")
+    client.exec_command.return_value = (client.exec_command.return_value[0], "", 2, 1)
+
+    with pytest.raises(BulkIOUnavailable):
+        pool_obj._run_bulk_io(client, "get", "rbd", ["obj1"], 60, 4)
@@ -0,0 +1,110 @@
+import json
+from unittest import mock
+
+from ceph.rados.core_workflows import RadosOrchestrator
+from ceph.rados.state_cache import (
+    CephStateCache,
+    clear_state_caches,
+    get_state_cache,
+    is_read_only,
+)
+
+
+class Cluster:
+    def __init__(self):
+        self.epoch = 10
+        self.calls = []
+
+    def run(self, cmd):
+        self.calls.append(cmd)
+        return json.dumps({"epoch": self.epoch, "cmd": cmd}), ""
+
+
+def test_read_only_commands():
+    assert is_read_only("ceph osd tree -f json")
+    assert is_read_only("ceph pg dump")
+    assert not is_read_only("ceph osd out 3")
+    assert not is_read_only("ceph osd pool set rbd size 2")
+
+
+def test_cache_hit_and_invalidation_on_change():
+    cluster = Cluster()
+    cache = CephStateCache()
+
+    cache.get("ceph pg dump", cluster.run)
+    cache.get("ceph pg dump", cluster.run)
+    assert cluster.calls == ["ceph pg dump"]
+
+    cache.get("ceph osd set noout", cluster.run)
+    cache.get("ceph pg dump", cluster.run)
+    assert cluster.calls.count("ceph pg dump") == 2
+
+    cache.get("ceph pg dump", cluster.run, fresh=True)
+    assert cluster.calls.count("ceph pg dump") == 3
+    assert cache.hits == 1
+
+
+@mock.patch("ceph.rados.state_cache.time.monotonic")
+def test_osdmap_entries_follow_the_epoch(monotonic):
+    cluster = Cluster()
+    cache = CephStateCache(ttl=2, max_age=60)
+
+    monotonic.return_value = 100
+    cache.get("ceph osd tree", cluster.run)
+
+    # Beyond the ttl, the entry is served while the epoch does not change
+    monotonic.return_value = 110
+    cache.get("ceph osd tree", cluster.run)
+    assert cluster.calls == ["ceph osd stat", "ceph osd tree", "ceph osd stat"]
+
+    cluster.epoch = 11
+    monotonic.return_value = 120
+    cache.get("ceph osd tree", cluster.run)
+    assert cluster.calls[-2:] == ["ceph osd stat", "ceph osd tree"]
+
+    # TTL only entries are not kept beyond the ttl
+    cache.get("ceph df", cluster.run)
+    monotonic.return_value = 123
+    cache.get("ceph df", cluster.run)
+    assert cluster.calls.count("ceph df") == 2
+
+
+def test_epoch_probed_outside_the_lock():
+    cluster = Cluster()
+    cache = CephStateCache(ttl=0)
+
+    def run(cmd):
+        # the cache stays usable by the other threads while the cluster is queried
+        assert not cache._lock.locked()
+        return cluster.run(cmd)
+
+    cache.get("ceph osd tree", run)
+    cache.get("ceph osd tree", run)
+    assert cluster.calls == ["ceph osd stat", "ceph osd tree", "ceph osd stat"]
+
+
+def test_caches_cleared_with_the_clusters():
+    cluster = mock.Mock()
+    cluster.name = "ceph"
+    cache = get_state_cache(cluster)
+    cache.get("ceph pg dump", Cluster().run)
+
+    clear_state_caches()
+    assert get_state_cache(cluster) is not cache
+    assert not cache._entries
+
+
+def test_scrub_on_the_client_drops_the_cached_pg_state():
+    cluster = Cluster()
+    rados_obj = RadosOrchestrator.__new__(RadosOrchestrator)
+    rados_obj.client = mock.Mock()
+    rados_obj.state_cache = CephStateCache()
+
+    rados_obj.state_cache.get("ceph pg dump", cluster.run)
+    rados_obj.run_deep_scrub(pool="rbd")
+    rados_obj.state_cache.get("ceph pg dump", cluster.run)
+
+    rados_obj.client.exec_command.assert_called_once_with(
+        cmd="ceph osd pool deep-scrub rbd", sudo=True
+    )
+    assert cluster.calls == ["ceph pg dump", "ceph pg dump"]
@@ -0,0 +1,33 @@
+"""Tests the comparison of the RBD image extent checksums."""
+
+import pytest
+
+from ceph.rbd.utils import compare_extent_checksums
+
+
+def checksums(extents, size=16, extent_size=4):
+    return {"size": size, "extent_size": extent_size, "extents": extents}
+
+
+def test_same_extents():
+    first = checksums({"0": "a", "8": "b"})
+    assert compare_extent_checksums(first, checksums({"0": "a", "8": "b"})) == []
+
+
+def test_mismatching_extents():
+    first = checksums({"0": "a", "8": "b", "12": "c"})
+    second = checksums({"0": "a", "4": "d", "8": "x"})
+
+    assert compare_extent_checksums(first, second) == [4, 8, 12]
+
+
+def test_different_sizes():
+    first = checksums({"0": "a"}, size=16)
+    second = checksums({"0": "a"}, size=8)
+
+    assert compare_extent_checksums(first, second) == [8]
+
+
+def test_different_extent_sizes():
+    with pytest.raises(ValueError):
+        compare_extent_checksums(checksums({}), checksums({}, extent_size=8))
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from ceph import async_node
+from ceph.async_node import AsyncCephNode, gather_bounded, run_coroutine
+from ceph.ceph import CommandFailed
+
+
+def test_gather_bounded_limits_coroutines_in_flight():
+    running = []
+
+    async def work(index):
+        running.append(index)
+        active = len(running)
+        await asyncio.sleep(0.01 * (5 - index % 5))
+        running.remove(index)
+        return index, active
+
+    results = run_coroutine(gather_bounded([work(i) for i in range(20)], limit=4))
+    assert [index for index, _ in results] == list(range(20))
+    assert max(active for _, active in results) == 4
+
+
+def test_gather_bounded_exceptions():
+    async def fail():
+        raise ValueError("failed")
+
+    async def succeed():
+        return "ok"
+
+    with pytest.raises(ValueError):
+        run_coroutine(gather_bounded([succeed(), fail()]))
+
+    results = run_coroutine(gather_bounded([fail(), succeed()], return_exceptions=True))
+    assert isinstance(results[0], ValueError) and results[1] == "ok"
+
+
+def test_run_coroutine_on_the_shared_loop():
+    async def thread():
+        return threading.current_thread()
+
+    assert run_coroutine(thread()).name == "cephci-asyncio"
+    assert run_coroutine(thread()) is run_coroutine(thread())
+
+
+@pytest.fixture
+def asyncssh():
+    """asyncssh whose connections report the commands they are given."""
+    running = []
+
+    async def run(cmd, check=False):
+        running.append(cmd)
+        peak = len(running)
+        await asyncio.sleep(0.2 if cmd == "sleep" else 0.01)
+        running.remove(cmd)
+        exit_status = 1 if cmd == "false" else 0
+        return mock.Mock(stdout=f"{cmd} {peak}", stderr="", exit_status=exit_status)
+
+    async def connect(**kw):
+        conn = mock.Mock(run=run, username=kw["username"])
+        conn.is_closed.return_value = False
+        return conn
+
+    with mock.patch.object(async_node, "asyncssh") as module:
+        module.connect = mock.Mock(side_effect=connect)
+        yield module
+
+
+def _node(**kw):
+    node = mock.Mock(
+        hostname="node1",
+        ip_address="10.0.0.1",
+        username="cephuser",
+        password="pass",
+        root_username="root",
+        root_passwd="root_pass",
+        private_key_path="",
+        look_for_key=False,
+    )
+    return AsyncCephNode(node, **kw)
+
+
+def test_exec_command(asyncssh):
+    node = _node()
+
+    assert node.exec_command(cmd="ceph -s", sudo=True) == ("ceph -s 1", "")
+    assert node.exec_command(cmd="uptime", long_running=True) == 0
+    node.exec_command(cmd="uptime", sudo=True)
+
+    # a connection per user, reused by the later commands
+    assert [c.kwargs["username"] for c in asyncssh.connect.call_args_list] == [
+        "root",
+        "cephuser",
+    ]
+    assert asyncssh.connect.call_args.kwargs["client_keys"] is None
+
+
+def test_exec_command_failures(asyncssh):
+    node = _node()
+
+    with pytest.raises(CommandFailed, match="false returned"):
+        node.exec_command(cmd="false")
+    assert node.exec_command(cmd="false", check_ec=False) == ("false 1", "")
+
+    with pytest.raises(CommandFailed, match="within"):
+        node.exec_command(cmd="sleep", timeout=0.05)
+
+
+def test_exec_commands_bounded_by_the_sessions(asyncssh):
+    node = _node(max_sessions=2)
+
+    results = node.exec_commands([f"cmd{i}" for i in range(6)])
+    assert [out.split()[0] for out, _, _, _ in results] == [f"cmd{i}" for i in range(6)]
+    assert max(int(out.split()[1]) for out, _, _, _ in results) == 2
+
+    with pytest.raises(CommandFailed):
+        node.exec_commands(["true", "false"])
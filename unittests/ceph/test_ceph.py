@@ -0,0 +1,286 @@
+import time
+from unittest import mock
+
+import pytest
+
+from ceph.ceph import (
+    CHANNEL_POOL_SIZE,
+    READ_CHUNK_SIZE,
+    CephNode,
+    ChannelPool,
+    CommandFailed,
+    OutputBuffer,
+    SSHConnectionManager,
+    stream_to,
+)
+
+
+def test_output_buffer_spills_to_disk():
+    with OutputBuffer(spill_size=16) as output:
+        output.write(b"line 1\nline 2\n")
+        assert not output.spilled
+
+        output.write("line 3 é\n".encode())
+        assert output.spilled
+        assert output.getvalue() == "line 1\nline 2\nline 3 é\n"
+        assert list(output.lines()) == ["line 1", "line 2", "line 3 é"]
+
+
+def test_stream_to_grows_reads():
+    channel = mock.Mock()
+    data = [b"x" * READ_CHUNK_SIZE, b"x" * 2 * READ_CHUNK_SIZE, b"y\n", b""]
+    channel.recv.side_effect = data
+
+    with OutputBuffer() as output:
+        stream_to(output, channel, None, False)
+        assert output.size == sum(len(d) for d in data)
+
+    assert [c.args[0] for c in channel.recv.call_args_list] == [
+        READ_CHUNK_SIZE,
+        2 * READ_CHUNK_SIZE,
+        4 * READ_CHUNK_SIZE,
+        4 * READ_CHUNK_SIZE,
+    ]
+
+
+def _streaming_node(chunks, exit_status=0):
+    chunks = list(chunks)
+    channel = mock.Mock(closed=False)
+    type(channel).eof_received = mock.PropertyMock(side_effect=lambda: not chunks)
+    channel.exit_status_ready.return_value = True
+    channel.recv_ready.side_effect = lambda: bool(chunks)
+    channel.recv.side_effect = lambda _: chunks.pop(0)
+    channel.recv_stderr_ready.return_value = False
+    channel.recv_exit_status.return_value = exit_status
+
+    node = mock.Mock(hostname="node1", ip_address="10.0.0.1")
+    node.connection.open_channel.return_value = channel
+    return node
+
+
+@mock.patch("ceph.ceph.wait_for_channels", mock.Mock())
+def test_iter_command_output_splits_records():
+    node = _streaming_node([b"a\0b", b"c\0", b"d"])
+
+    records = CephNode.iter_command_output(node, "find -print0", delimiter=b"\0")
+    assert list(records) == ["a", "bc", "d"]
+
+
+@mock.patch("ceph.ceph.wait_for_channels", mock.Mock())
+def test_iter_command_output_checks_exit_status():
+    records = CephNode.iter_command_output(_streaming_node([b"a\n"], 1), "false")
+
+    assert next(records) == "a"
+    with pytest.raises(CommandFailed):
+        next(records)
+
+
+def test_download_command_output_interleaves_stdin(tmp_path):
+    stdin = b"x" * 3 * READ_CHUNK_SIZE
+    sent = []
+    chunks = []
+    channel = mock.Mock(closed=False)
+    type(channel).eof_received = mock.PropertyMock(
+        side_effect=lambda: len(sent) == 3 and not chunks
+    )
+    channel.exit_status_ready.return_value = True
+    channel.send_ready.return_value = True
+
+    def send(data):
+        # every chunk written produces output, which has to be read before more
+        # input is accepted by a command like tar
+        assert not chunks
+        sent.append(data)
+        chunks.append(data.upper())
+        return len(data)
+
+    channel.send.side_effect = send
+    channel.recv_ready.side_effect = lambda: bool(chunks)
+    channel.recv.side_effect = lambda _: chunks.pop(0)
+    channel.recv_stderr_ready.return_value = False
+    channel.recv_exit_status.return_value = 0
+    node = mock.Mock(hostname="node1", ip_address="10.0.0.1")
+    node.connection.open_channel.return_value = channel
+
+    dst = tmp_path / "out"
+    with mock.patch("ceph.ceph.wait_for_channels"):
+        rc, _ = CephNode.download_command_output(node, "cat", str(dst), stdin=stdin)
+
+    assert rc == 0
+    assert dst.read_bytes() == stdin.upper()
+    assert [len(data) for data in sent] == [READ_CHUNK_SIZE] * 3
+    channel.shutdown_write.assert_called_once()
+
+
+def _session():
+    return mock.Mock(active=True, closed=False, eof_received=False)
+
+
+def _wait_for(condition, timeout=5):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_channel_pool_refilled_in_the_background():
+    transport = mock.Mock()
+    transport.open_session.side_effect = lambda timeout=None: _session()
+    pool = ChannelPool(size=2)
+
+    first = pool.acquire(transport)
+    assert _wait_for(lambda: len(pool._channels) == 2 and not pool._refilling)
+    assert transport.open_session.call_count == 3
+
+    # stale sessions are skipped and closed sessions are never handed out
+    pool._channels[0].closed = True
+    second = pool.acquire(transport)
+    assert second not in (first, None) and not second.closed
+    assert _wait_for(lambda: len(pool._channels) == 2 and not pool._refilling)
+
+    # a new transport drops the sessions of the previous one
+    dropped = list(pool._channels)
+    pool.acquire(mock.Mock(is_active=mock.Mock(return_value=False)))
+    assert all(channel.close.called for channel in dropped)
+
+
+def test_channel_pool_disabled():
+    transport = mock.Mock()
+    transport.open_session.side_effect = lambda timeout=None: _session()
+    pool = ChannelPool(size=0)
+
+    pool.acquire(transport)
+    pool.acquire(transport)
+    assert transport.open_session.call_count == 2
+    assert not pool._channels and not pool._refilling
+
+
+def test_connection_pool_size_configurable():
+    manager = SSHConnectionManager("10.0.0.1", "cephuser", "", channel_pool_size=0)
+    assert manager.channel_pool.size == 0
+    assert SSHConnectionManager("10.0.0.1", "cephuser", "").channel_pool.size == (
+        CHANNEL_POOL_SIZE
+    )
+
+
+class _Command:
+    """Session channel of a command completing after a number of polls.
+
+    The output is only received along with the EOF, as for a short command.
+    """
+
+    def __init__(self, polls, out, exit_status=0):
+        self.polls = polls
+        self.out = [out.encode()]
+        self.exit_status = exit_status
+        self.closed = False
+        self.cmd = None
+
+    def exec_command(self, cmd):
+        self.cmd = cmd
+
+    @property
+    def eof_received(self):
+        self.polls -= 1
+        return self.polls <= 0
+
+    def exit_status_ready(self):
+        return self.polls <= 0
+
+    def recv_ready(self):
+        return self.polls <= 0 and bool(self.out)
+
+    def recv(self, _):
+        return self.out.pop()
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv_stderr(self, _):
+        return b""
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+    def close(self):
+        self.closed = True
+
+
+def _commands_node(channels):
+    node = mock.Mock(hostname="node1", ip_address="10.0.0.1")
+    node._get_command_timeout.return_value = 60
+    node.connection.open_channel.side_effect = channels
+    return node
+
+
+@mock.patch("ceph.ceph.wait_for_channels", mock.Mock())
+def test_exec_commands_results_in_command_order():
+    channels = [_Command(6, "slow"), _Command(1, "fast"), _Command(3, "medium")]
+    node = _commands_node(channels)
+
+    results = CephNode.exec_commands(node, ["slow", "fast", "medium"])
+    assert [(out, rc) for out, _, rc, _ in results] == [
+        ("slow", 0),
+        ("fast", 0),
+        ("medium", 0),
+    ]
+    assert [channel.cmd for channel in channels] == ["slow", "fast", "medium"]
+    assert all(channel.closed for channel in channels)
+
+
+@mock.patch("ceph.ceph.wait_for_channels", mock.Mock())
+def test_exec_commands_failures():
+    def channels():
+        return [_Command(2, "up"), _Command(1, "", exit_status=2)]
+
+    with pytest.raises(CommandFailed, match="missing.*code 2"):
+        CephNode.exec_commands(_commands_node(channels()), ["ls", "missing"])
+
+    results = CephNode.exec_commands(
+        _commands_node(channels()), ["ls", "missing"], check_ec=False
+    )
+    assert [rc for _, _, rc, _ in results] == [0, 2]
+
+
+@mock.patch("ceph.ceph.wait_for_channels", mock.Mock())
+def test_exec_commands_bounds_running_channels():
+    channels = [_Command(2, str(index)) for index in range(5)]
+    node = _commands_node(channels)
+    running = []
+
+    def open_channel(timeout=None):
+        running.append(sum(1 for c in channels if c.cmd and not c.closed))
+        return channels[len(running) - 1]
+
+    node.connection.open_channel.side_effect = open_channel
+    results = CephNode.exec_commands(node, list("01234"), max_channels=2)
+
+    assert [out for out, _, _, _ in results] == list("01234")
+    assert max(running) < 2
+
+
+@pytest.mark.parametrize("long_running", [False, True])
+def test_streamed_output_closed_on_failure(long_running):
+    output = OutputBuffer()
+    node = mock.Mock(hostname="node1", ip_address="10.0.0.1", run_once=False)
+    node.long_running.return_value = (output, "failed", 1, 0.1)
+
+    with pytest.raises(CommandFailed):
+        CephNode.exec_command(
+            node,
+            cmd="ceph pg dump",
+            stream=True,
+            long_running=long_running,
+            check_ec=True,
+        )
+    assert output._file.closed
+
+
+def test_streamed_output_handed_over():
+    output = OutputBuffer()
+    node = mock.Mock(hostname="node1", ip_address="10.0.0.1", run_once=False)
+    node.long_running.return_value = (output, "", 0, 0.1)
+
+    out, _ = CephNode.exec_command(node, cmd="ceph pg dump", stream=True)
+    assert out is output and not output._file.closed
+    output.close()
@@ -0,0 +1,66 @@
+from datetime import datetime
+from unittest import mock
+
+from ceph.log_scanner import (
+    CURSOR_MARKER,
+    LogScanner,
+    get_log_scanner,
+    grep_command,
+    parse_timestamp,
+)
+
+LINES = [
+    "2024-05-02T10:00:00+0000 host ganesha[1]: export created",
+    "2024-05-02T10:05:00+0000 host ganesha[1]: client mounted",
+]
+
+
+def _node(*outputs):
+    node = mock.Mock(hostname="node1")
+    node.exec_command.side_effect = [(out, "") for out in outputs]
+    return node
+
+
+def test_grep_command_matches_strings_and_cursor():
+    cmd = grep_command(["a b", "c"])
+    assert cmd == f"grep -a -F -e '{CURSOR_MARKER}' -e 'a b' -e c"
+    assert grep_command(["x.*"], regex=True).startswith("grep -a -E")
+
+
+def test_parse_timestamp():
+    assert parse_timestamp(LINES[0]) == datetime(2024, 5, 2, 10, 0, 0)
+    assert parse_timestamp("2022-07-20 09:40:10") == datetime(2022, 7, 20, 9, 40, 10)
+    assert parse_timestamp("no time") is None
+    assert parse_timestamp(None) is None
+
+
+def test_scan_resumes_from_cursor():
+    node = _node(
+        "\n".join([LINES[0], f"{CURSOR_MARKER}c1"]),
+        "\n".join([LINES[1], f"{CURSOR_MARKER}c2"]),
+    )
+    scanner = LogScanner(node, unit="ceph-fsid@nfs.foo.service")
+
+    found = scanner.search(["export created", "client mounted"])
+    assert found == {"export created": [LINES[0]], "client mounted": []}
+    assert scanner.cursor == "c1"
+
+    assert scanner.found("client mounted") == [LINES[1]]
+    assert "--after-cursor c1" in node.exec_command.call_args.kwargs["cmd"]
+    assert scanner.cursor == "c2"
+
+
+def test_found_since():
+    node = _node("\n".join(LINES + [f"{CURSOR_MARKER}c1"]))
+    scanner = LogScanner(node, path="/var/log/ceph/ganesha.log")
+    scanner.watch("ganesha")
+    scanner.scan()
+
+    assert scanner._found("ganesha", "2024-05-02 10:01:00") == [LINES[1]]
+    assert scanner._found("ganesha", None) == LINES
+
+
+def test_scanners_are_shared():
+    node = mock.Mock(hostname="node2")
+    assert get_log_scanner(node, unit="u") is get_log_scanner(node, unit="u")
+    assert get_log_scanner(node, unit="u") is not get_log_scanner(node, path="u")
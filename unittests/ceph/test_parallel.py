@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from ceph.parallel import parallel
+from utility.log import current_test, in_test
+
+
+def _task(value, delay=0.05):
+    time.sleep(delay)
+    if value == "fail":
+        raise ValueError(value)
+
+    return value
+
+
+def test_parallel_results_in_spawn_order():
+    with parallel() as p:
+        for delay in [0.2, 0.1, 0.0]:
+            p.spawn(_task, delay, delay)
+
+    assert p.results == [0.2, 0.1, 0.0]
+    assert [t["status"] for t in p.timings] == ["done"] * 3
+
+
+def test_parallel_streams_results_as_completed():
+    with parallel() as p:
+        for delay in [0.2, 0.1, 0.0]:
+            p.spawn(_task, delay, delay)
+
+        assert list(p.as_completed()) == [0.0, 0.1, 0.2]
+
+
+def test_parallel_cancels_pending_tasks_on_failure():
+    with pytest.raises(ValueError):
+        with parallel(max_workers=1, shutdown_cancel_pending=True) as p:
+            for value in ["fail", 1, 2, 3]:
+                p.spawn(_task, value, 0.1)
+
+    assert p.timings[0]["status"] == "failed"
+    assert p.timings[-1]["status"] == "cancelled"
+
+
+def test_parallel_task_timeout():
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        with parallel() as p:
+            p.spawn_with_timeout(0.1, _task, 1, 2)
+            p.spawn(_task, 2)
+
+    assert time.time() - start < 1
+    assert [t["status"] for t in p.timings] == ["timeout", "done"]
+
+
+def test_parallel_tasks_run_in_spawning_test_context():
+    with in_test("spawning-test"):
+        with parallel() as p:
+            p.spawn(current_test)
+
+    assert p.results == ["spawning-test"]
@@ -0,0 +1,74 @@
+import time
+from unittest import mock
+
+from ceph.waiter import WaitTelemetry, WaitUntil, watch_until
+from utility.log import in_test
+
+
+@mock.patch("ceph.waiter.time.sleep")
+def test_wait_until_fixed_interval(sleep_mock):
+    for w in WaitUntil(timeout=60, interval=5):
+        if w._attempt == 4:
+            break
+
+    assert [c.args[0] for c in sleep_mock.call_args_list] == [5, 5, 5]
+    assert not w.expired
+
+
+@mock.patch("ceph.waiter.time.sleep")
+def test_wait_until_backoff_is_capped(sleep_mock):
+    for w in WaitUntil(timeout=600, interval=2, backoff=2, max_interval=10):
+        if w._attempt == 6:
+            break
+
+    assert [c.args[0] for c in sleep_mock.call_args_list] == [2, 4, 8, 10, 10]
+
+
+def test_wait_until_does_not_sleep_past_timeout():
+    w = WaitUntil(timeout=10, interval=8)
+    w._attempt = 1
+    w._start = time.time() - 8
+
+    assert w._next_interval() <= 2
+
+
+@mock.patch("ceph.waiter.time.sleep")
+def test_wait_telemetry_summary(sleep_mock):
+    WaitTelemetry.reset()
+    for _ in WaitUntil(timeout=60, interval=1, name="condition"):
+        break
+
+    summary = WaitTelemetry.summary()
+    assert summary["condition"]["count"] == 1
+    assert summary["condition"]["expired"] == 0
+    assert summary["condition"]["timeout"] == 60
+
+
+@mock.patch("ceph.waiter.time.sleep")
+def test_wait_telemetry_per_test(sleep_mock):
+    WaitTelemetry.reset()
+    for test in ["first", "second"]:
+        with in_test(test):
+            for _ in WaitUntil(timeout=60, interval=1, name=f"{test}-condition"):
+                break
+
+    assert list(WaitTelemetry.summary(test="first")) == ["first-condition"]
+
+    WaitTelemetry.reset(test="first")
+    assert list(WaitTelemetry.summary()) == ["second-condition"]
+
+
+@mock.patch("ceph.waiter.select.select")
+def test_watch_until_returns_first_matching_line(select_mock):
+    channel = mock.Mock(eof_received=False)
+    channel.recv_ready.side_effect = [True, True, False]
+    channel.recv.side_effect = [b"mon.a deployed\nosd.1 up", b"\nosd.2 up\n"]
+    node = mock.Mock(hostname="node1")
+    node.root_connection.open_channel.return_value = channel
+
+    line = watch_until(node, "ceph -w", r"osd\.\d up", timeout=30, name="osd-up")
+
+    assert line == "osd.1 up"
+    channel.exec_command.assert_called_once_with("timeout 30 ceph -w")
+    channel.close.assert_called_once()
+    assert not WaitTelemetry.summary()["osd-up"]["expired"]
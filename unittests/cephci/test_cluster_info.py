@@ -0,0 +1,22 @@
+from unittest import mock
+
+import pytest
+
+from cephci import cluster_info
+
+
+def test_collection_failures_raised_after_all_nodes(tmp_path):
+    nodes = [mock.Mock(hostname=f"node{index}") for index in range(3)]
+    cluster = mock.Mock()
+    cluster.get_nodes.return_value = nodes
+
+    def collect(node, *args, **kwargs):
+        if node.hostname == "node0":
+            raise Exception("connection lost")
+        return f"{node.hostname}.tar.zst"
+
+    with mock.patch.object(cluster_info, "_collect_archive", side_effect=collect) as m:
+        with pytest.raises(Exception, match="1 node.*node0: connection lost"):
+            cluster_info.get_ceph_var_logs(cluster, str(tmp_path))
+
+    assert m.call_count == 3
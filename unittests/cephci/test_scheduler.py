@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from cephci.scheduler import build_dag, schedule
+
+SHARED = {"mode": "shared"}
+
+
+def _test(name, **kwargs):
+    return dict(name=name, module=f"{name}.py", **kwargs)
+
+
+def test_build_dag():
+    tests = [
+        _test("install", **{"abort-on-fail": True}),
+        _test("ls", resources=SHARED),
+        _test("info", resources=dict(SHARED, pools=["rbd"])),
+        _test("resize", resources=dict(SHARED, pools=["rbd"])),
+        _test("upgrade"),
+        _test("stats", resources=SHARED, **{"depends-on": "ls"}),
+        _test("teardown", resources=SHARED, **{"destroy-cluster": True}),
+    ]
+    dag = build_dag(tests, ["ceph"])
+
+    assert dag[1] == {0}
+    assert dag[2] == {0}
+    assert dag[3] == {0, 2}
+    assert dag[4] == {0, 1, 2, 3}
+    assert dag[5] == {0, 1, 4}
+    assert dag[6] == {0, 1, 2, 3, 4, 5}
+
+
+def test_build_dag_unknown_dependency():
+    with pytest.raises(ValueError):
+        build_dag([_test("ls", **{"depends-on": ["missing"]})], ["ceph"])
+
+
+def test_schedule_runs_shared_tests_concurrently():
+    barrier = threading.Barrier(2, timeout=10)
+    order = []
+
+    def execute(index, test):
+        if test["name"] in ("ls", "info"):
+            barrier.wait()
+        order.append(test["name"])
+        return test["name"], False
+
+    tests = [
+        _test("install"),
+        _test("ls", resources=SHARED),
+        _test("info", resources=SHARED),
+        _test("upgrade"),
+    ]
+    results = schedule(tests, execute, ["ceph"], max_workers=4)
+
+    assert results == ["install", "ls", "info", "upgrade"]
+    assert order[0] == "install" and order[-1] == "upgrade"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_schedule_stops_on_abort(max_workers):
+    def execute(index, test):
+        return test["name"], test["name"] == "install"
+
+    tests = [_test("install", **{"abort-on-fail": True}), _test("ls")]
+    assert schedule(tests, execute, ["ceph"], max_workers) == ["install", None]
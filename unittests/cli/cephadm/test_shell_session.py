@@ -0,0 +1,106 @@
+import subprocess
+from unittest import mock
+
+import pytest
+
+from ceph.ceph import CommandFailed
+from cli.cephadm.cephadm import CephAdm
+from cli.cephadm.shell_session import (
+    FINGERPRINT_CMD,
+    STALE_EXIT_CODE,
+    STALE_MARKER,
+    ShellSession,
+)
+
+# Container runtime only knowing the "alive" container
+RUNTIME = """#!/bin/bash
+case "$1" in
+  inspect) [ "$2" = alive ] ;;
+  exec) shift 3; exec "$@" ;;
+esac
+"""
+
+
+@pytest.fixture
+def session(tmp_path):
+    runtime = tmp_path / "runtime"
+    runtime.write_text(RUNTIME)
+    runtime.chmod(0o755)
+
+    session = ShellSession(mock.Mock(hostname="node1"))
+    session.runtime = str(runtime)
+    session.container = "alive"
+    session.fingerprint = subprocess.run(
+        ["bash", "-c", FINGERPRINT_CMD], capture_output=True, text=True
+    ).stdout.strip()
+    return session
+
+
+def _run(cmd):
+    proc = subprocess.run(["bash", "-c", cmd], capture_output=True, text=True)
+    return proc.stdout, proc.stderr, proc.returncode
+
+
+def test_build_cmd_runs_the_command_in_the_container(session):
+    cmd = session._build_cmd("echo ready | tr a-z A-Z")
+
+    assert f"{session.runtime} exec -i alive echo ready" in cmd
+    assert _run(cmd) == ("READY\n", "", 0)
+
+
+def test_build_cmd_guards_the_fingerprint(session):
+    session.fingerprint = "outdated"
+
+    assert _run(session._build_cmd("echo ready")) == (
+        "",
+        f"{STALE_MARKER}\n",
+        STALE_EXIT_CODE,
+    )
+
+
+def test_build_cmd_guards_a_dead_container(session):
+    session.container = "dead"
+
+    _, err, rc = _run(session._build_cmd("echo ready"))
+    assert (err.strip(), rc) == (STALE_MARKER, STALE_EXIT_CODE)
+
+
+def test_run_restarts_a_stale_container():
+    session = ShellSession(mock.Mock(hostname="node1"))
+    session.container = "dead"
+    session.node.exec_command.side_effect = [
+        ("", f"{STALE_MARKER}\n", STALE_EXIT_CODE, None),
+        ("HEALTH_OK", "", 0, None),
+    ]
+
+    with mock.patch.object(session, "restart") as restart:
+        assert session.run("ceph health") == ("HEALTH_OK", "")
+    restart.assert_called_once()
+
+
+def test_run_gives_up_after_one_restart():
+    session = ShellSession(mock.Mock(hostname="node1"))
+    session.container = "dead"
+    session.node.exec_command.return_value = (
+        "",
+        STALE_MARKER,
+        STALE_EXIT_CODE,
+        None,
+    )
+
+    with mock.patch.object(session, "restart") as restart:
+        with pytest.raises(CommandFailed):
+            session.run("ceph health")
+    restart.assert_called_once()
+    assert session.node.exec_command.call_count == 2
+
+
+@mock.patch("cli.cephadm.cephadm.get_shell_session")
+def test_persistent_shell_dispatched_like_execute(get_shell_session):
+    get_shell_session.side_effect = lambda node: mock.Mock(
+        run=lambda cmd, **kw: f"{node.shortname}: {cmd}"
+    )
+    nodes = [mock.Mock(shortname=f"node{i}") for i in range(3)]
+
+    out = CephAdm(nodes, persistent_shell=True).fan_out().shell("ceph -s")
+    assert out == {f"node{i}": f"node{i}: ceph -s" for i in range(3)}
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from cli.performance.utilities import ceph_resource_sampler as sampler
+from cli.performance.utilities.ceph_resource_sampler import RECORD, load, summary
+
+MB = 2**20
+
+
+@pytest.fixture
+def output(tmp_path):
+    """Samples of an osd growing 1MB a minute and of an unnamed process."""
+    output = tmp_path / "node1-test.bin"
+    records = [
+        RECORD.pack(60.0 * i, 100, 100 * i, (10 + i) * MB, 8 * MB, 0, 20 * MB)
+        for i in range(4)
+    ]
+    records.append(RECORD.pack(0.0, 200, 5, MB, MB, 0, 0))
+    # a record partially written when the sampler was stopped
+    output.write_bytes(b"".join(records) + RECORD.pack(240.0, 100, 0, 0, 0, 0, 0)[:9])
+    (tmp_path / "node1-test.bin.json").write_text(json.dumps({"100": "ceph-osd.1"}))
+    return str(output)
+
+
+def test_load_per_daemon(output):
+    series = load(output)
+
+    assert list(series) == ["ceph-osd.1[100]", "200[200]"]
+    assert len(series["ceph-osd.1[100]"]) == 4
+    assert series["ceph-osd.1[100]"][1] == (60.0, 100, 11 * MB, 8 * MB, 0, 20 * MB)
+
+
+def test_summary(output, monkeypatch):
+    monkeypatch.setattr(sampler, "CLOCK_TICKS", 100)
+    osd = summary(output)["ceph-osd.1[100]"]
+
+    assert osd["samples"] == 4
+    assert osd["duration_sec"] == 180
+    assert osd["cpu_seconds"] == 3
+    assert osd["peak_rss_mb"] == 13
+    assert osd["last_rss_mb"] == 13
+    assert osd["peak_cgroup_mb"] == 20
+    assert osd["rss_growth_mb_per_hour"] == 60
+    assert summary(output)["200[200]"]["rss_growth_mb_per_hour"] == 0
+
+
+@pytest.mark.parametrize(
+    "points, slope",
+    [
+        ([], 0.0),
+        ([(1, 5)], 0.0),
+        ([(1, 5), (1, 7)], 0.0),
+        ([(0, 1), (1, 3), (2, 5)], 2.0),
+        ([(0, 4), (1, 1), (2, 3), (3, 0)], -1.0),
+    ],
+)
+def test_slope(points, slope):
+    assert sampler._slope(points) == pytest.approx(slope)
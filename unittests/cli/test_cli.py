@@ -0,0 +1,63 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from cli import Cli
+from cli.exceptions import FanOutError
+
+
+def _node(name, delay=0, error=None):
+    def exec_command(**kw):
+        time.sleep(delay)
+        if error:
+            raise error
+        return f"{name}: {kw['cmd']}", ""
+
+    return mock.Mock(shortname=name, exec_command=mock.Mock(side_effect=exec_command))
+
+
+def test_nodes_are_serial_by_default():
+    running = []
+    lock = threading.Lock()
+
+    def exec_command(**kw):
+        with lock:
+            running.append(threading.current_thread())
+        return "", ""
+
+    nodes = [
+        mock.Mock(shortname=f"node{i}", exec_command=exec_command) for i in range(3)
+    ]
+    assert list(Cli(nodes).execute("uptime")) == ["node0", "node1", "node2"]
+    assert set(running) == {threading.current_thread()}
+
+
+def test_fan_out_results_in_node_order():
+    nodes = [_node("node1", 0.2), _node("node2", 0.1), _node("node3")]
+
+    out = Cli(nodes).fan_out().execute("uptime")
+    assert list(out) == ["node1", "node2", "node3"]
+    assert out["node2"] == ("node2: uptime", "")
+
+    assert list(Cli(nodes).execute("uptime", max_workers=3)) == list(out)
+
+
+def test_fan_out_raises_first_failure_to_complete():
+    nodes = [
+        _node("node1", 0.3, error=ValueError("late")),
+        _node("node2", 0.1, error=KeyError("early")),
+    ]
+
+    with pytest.raises(KeyError):
+        Cli(nodes).fan_out().execute("uptime")
+
+
+def test_fan_out_aggregates_failures():
+    nodes = [_node("node1", error=ValueError("down")), _node("node2")]
+
+    with pytest.raises(FanOutError) as err:
+        Cli(nodes).fan_out(fail_fast=False).execute("uptime")
+    assert list(err.value.results) == ["node2"]
+    assert list(err.value.errors) == ["node1"]
@@ -0,0 +1,25 @@
+import os
+from unittest import mock
+
+import yaml
+
+from cli.utilities.configs import get_cephci_config
+
+
+def test_get_cephci_config_reloaded_once_modified(monkeypatch, tmp_path):
+    """Test the configuration is parsed again only when the file changes."""
+    cfg_file = tmp_path / ".cephci.yaml"
+    cfg_file.write_text("email:\n  address: a@example.com\n")
+    monkeypatch.setattr(os.path, "expanduser", lambda x: str(tmp_path))
+
+    with mock.patch(
+        "cli.utilities.configs.yaml.safe_load", wraps=yaml.safe_load
+    ) as load:
+        get_cephci_config()["email"]["address"] = "changed"
+        assert get_cephci_config()["email"]["address"] == "a@example.com"
+        assert load.call_count == 1
+
+        cfg_file.write_text("email:\n  address: b@example.com\n")
+        os.utime(cfg_file, ns=(0, 10**18))
+        assert get_cephci_config()["email"]["address"] == "b@example.com"
+        assert load.call_count == 2
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import init_suite
+from init_suite import SuiteIndex, compile_suite, load_suites
+
+SUITE = """
+tests:
+  - test:
+      name: install
+      module: install_prereq.py
+      polarion-id: CEPH-1,CEPH-2
+  - test:
+      name: bootstrap
+      module: test_cephadm.py
+      config:
+        command: bootstrap
+"""
+
+OVERRIDES = """
+tests:
+  - test:
+      index: 2
+      config:
+        args: [--skip-monitoring]
+"""
+
+
+@pytest.fixture
+def suites(tmp_path, monkeypatch):
+    monkeypatch.setenv("CEPHCI_SUITE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(init_suite, "_compiled", dict())
+
+    component = tmp_path / "suites" / "squid" / "rbd"
+    component.mkdir(parents=True)
+    (component / "tier-1_rbd.yaml").write_text(SUITE)
+
+    override = component / "tier-2_rbd_overrides"
+    override.mkdir()
+    (override / "suite.yaml").write_text(SUITE)
+    (override / "overrides.yaml").write_text(OVERRIDES)
+    return tmp_path / "suites"
+
+
+def test_compile_suite_applies_overrides(suites):
+    tests = compile_suite(str(suites / "squid" / "rbd" / "tier-2_rbd_overrides"))
+    assert tests[1]["test"]["config"] == {
+        "command": "bootstrap",
+        "args": ["--skip-monitoring"],
+    }
+
+
+def test_compiled_suites_are_cached(suites, monkeypatch):
+    suite = str(suites / "squid" / "rbd" / "tier-1_rbd.yaml")
+    tests = load_suites([suite])["tests"]
+    tests[0]["test"]["name"] = "modified by the caller"
+    assert len(os.listdir(os.environ["CEPHCI_SUITE_CACHE_DIR"])) == 1
+
+    monkeypatch.setattr(init_suite, "_compiled", dict())
+    monkeypatch.setattr(init_suite, "read_yaml", None)
+    assert compile_suite(suite)[0]["test"]["name"] == "install"
+
+
+def test_modified_suites_are_compiled_again(suites):
+    suite = suites / "squid" / "rbd" / "tier-1_rbd.yaml"
+    compile_suite(str(suite))
+    suite.write_text(SUITE.replace("name: install", "name: setup"))
+    assert compile_suite(str(suite))[0]["test"]["name"] == "setup"
+
+
+def test_suite_index_query(suites):
+    index = SuiteIndex(str(suites))
+    assert len(index.entries) == 4
+
+    tier1 = index.query(tier="tier-1", component="rbd", release="squid")
+    assert [e["name"] for e in tier1] == ["install", "bootstrap"]
+    assert [e["suite"] for e in index.query(polarion_id="CEPH-2")] == [
+        str(suites / "squid" / "rbd" / "tier-1_rbd.yaml"),
+        str(suites / "squid" / "rbd" / "tier-2_rbd_overrides"),
+    ]
+    assert len(index.query(module="test_cephadm.py", tier="tier-2")) == 1
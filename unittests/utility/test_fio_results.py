@@ -0,0 +1,81 @@
+"""Tests the fio result model, merging and comparison."""
+
+import json
+
+from utility.io.fio_results import (
+    FioReport,
+    merge_results,
+    parse_fio_output,
+)
+
+
+def fio_output(name, iops, lat, bins=None, rw="randread"):
+    clat = {"mean": lat, "percentile": {"50.000000": lat, "99.000000": lat * 2}}
+    if bins:
+        clat["bins"] = bins
+    direction = {
+        "iops": iops,
+        "bw": iops * 4,
+        "io_bytes": iops * 4096,
+        "total_ios": iops,
+        "runtime": 1000,
+        "slat_ns": {"mean": 10},
+        "clat_ns": clat,
+        "lat_ns": {"mean": lat + 10, "min": 1, "max": lat * 3},
+    }
+    empty = {"iops": 0, "io_bytes": 0, "total_ios": 0}
+    return json.dumps(
+        {
+            "global options": {"ioengine": "libaio"},
+            "jobs": [
+                {
+                    "jobname": name,
+                    "job options": {"rw": rw},
+                    "read": direction,
+                    "write": empty,
+                    "trim": empty,
+                }
+            ],
+        }
+    )
+
+
+def test_parse_output():
+    (result,) = parse_fio_output(
+        "note: both iodepth >= 1 and synchronous I/O engine\n"
+        + fio_output("job", 100, 1000),
+        client="node1",
+    )
+
+    assert result.rw == "randread"
+    assert result.options["ioengine"] == "libaio"
+    assert list(result.ops) == ["read"]
+    assert result.read.iops == 100
+    assert result.read.percentile(99) == 2000
+    assert result.tags == {"client": "node1"}
+
+
+def test_merge_histograms():
+    first = parse_fio_output(fio_output("job", 100, 1000, bins={"1000": 99, "9000": 1}))
+    second = parse_fio_output(fio_output("job", 300, 3000, bins={"3000": 300}))
+
+    merged = merge_results(first + second)
+    assert merged.read.iops == 400
+    assert merged.read.clat_ns == (100 * 1000 + 300 * 3000) / 400
+    assert merged.read.percentile(50) == 3000
+    assert merged.read.percentile(99) == 3000
+
+    mean = merge_results(first + second, mode="mean")
+    assert mean.read.iops == 200
+
+
+def test_compare_builds():
+    report = FioReport()
+    for build, iops in (("b1", 100), ("b1", 102), ("b2", 80)):
+        report.add(parse_fio_output(fio_output("job", iops, 1000)), build=build)
+
+    rows = report.compare(baseline={"build": "b1"}, by="build")
+    status = {row["metric"]: row["status"] for row in rows}
+    assert status["iops"] == "regressed"
+    assert status["lat_ns"] == "ok"
+    assert report.to_csv().startswith("name,rw,direction,build")
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+import requests
+
+from utility import http_cache
+from utility.http_cache import cached_get
+
+URL = "https://manifest.example.com/redhat/8.1.yaml"
+
+
+def _response(status_code=200, content=b"", headers=None):
+    resp = mock.Mock(status_code=status_code, content=content, headers=headers or {})
+    resp.ok = status_code < 400
+    return resp
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CEPHCI_HTTP_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("CEPHCI_OFFLINE", raising=False)
+    with mock.patch.object(http_cache.requests, "get") as get:
+        yield get
+
+
+def test_served_from_cache_within_ttl(cache):
+    cache.return_value = _response(content=b"nightly: {}", headers={"ETag": '"v1"'})
+
+    assert cached_get(URL).text == "nightly: {}"
+    resp = cached_get(URL)
+    assert resp.from_cache and resp.text == "nightly: {}"
+    assert cache.call_count == 1
+
+
+def test_revalidated_after_ttl(cache):
+    cache.return_value = _response(content=b"v1", headers={"ETag": '"v1"'})
+    cached_get(URL)
+
+    cache.return_value = _response(status_code=304)
+    resp = cached_get(URL, ttl=0)
+    assert resp.text == "v1" and resp.from_cache
+    assert cache.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_last_good_copy_on_failures(cache, monkeypatch):
+    cache.return_value = _response(content=b"v1")
+    cached_get(URL)
+
+    cache.side_effect = requests.ConnectionError("unreachable")
+    assert cached_get(URL, ttl=0).text == "v1"
+
+    cache.side_effect = None
+    cache.return_value = _response(status_code=503)
+    assert cached_get(URL, ttl=0).text == "v1"
+
+    monkeypatch.setenv("CEPHCI_OFFLINE", "1")
+    assert cached_get(URL, ttl=0).text == "v1"
+    with pytest.raises(requests.ConnectionError):
+        cached_get(URL + ".missing")
+
+
+def test_errors_are_not_cached(cache):
+    cache.return_value = _response(status_code=404, content=b"not found")
+    assert not cached_get(URL).ok
+
+    cache.return_value = _response(content=b"v1")
+    assert cached_get(URL).text == "v1"
+    assert cache.call_count == 2
+
+
+def test_manifest_changes_seen_at_once(cache):
+    cache.return_value = _response(content=b"latest: 1", headers={"ETag": '"v1"'})
+    cached_get(URL, ttl=http_cache.MANIFEST_TTL)
+
+    cache.return_value = _response(content=b"latest: 2", headers={"ETag": '"v2"'})
+    assert cached_get(URL, ttl=http_cache.MANIFEST_TTL).text == "latest: 2"
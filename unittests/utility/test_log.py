@@ -9,7 +9,7 @@ from copy import deepcopy
 
 import pytest
 
-from utility.log import Log
+from utility.log import Log, in_test
 
 str_data = "This has password something."
 str_data_no_passwd = "This test has no sensitive data."
@@ -116,3 +116,24 @@ def test_log_list_of_dictionaries(logger):
     assert list_dict_data[1]["test"]["module"] in log_contents
     assert "masked" not in log_contents
     assert None not in _test_data
+
+
+def test_log_scoped_to_test(tmp_path):
+    log = Log()
+    try:
+        for test in ["first", "second"]:
+            log.configure_logger(test, str(tmp_path), True, scoped=True)
+
+        with in_test("first"):
+            log.log_error("first failed")
+        with in_test("second"):
+            log.info("second running")
+    finally:
+        log.close_and_remove_filehandlers("first")
+        assert not (tmp_path / "first.log").read_text().count("second running")
+        log.close_and_remove_filehandlers()
+
+    assert "first failed" in (tmp_path / "first.err").read_text()
+    assert "first failed" not in (tmp_path / "second.log").read_text()
+    assert log.pop_errors("second") == []
+    assert log.pop_errors("first") == ["first failed"]
@@ -0,0 +1,46 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from utility.rados_aio import AioWindow, summary
+
+
+def test_window_bounds_operations_in_flight():
+    window = AioWindow(2)
+    pending = []
+    released = []
+
+    def aio(name, oncomplete):
+        pending.append(oncomplete)
+
+    window.submit(aio, "obj1", release=lambda: released.append(1))
+    window.submit(aio, "obj2")
+    assert not window.slots.acquire(blocking=False)
+
+    completion = mock.Mock()
+    completion.get_return_value.side_effect = [0, -2]
+    threading.Timer(0.05, lambda: [cb(completion) for cb in pending]).start()
+    window.wait()
+
+    assert len(window.latencies) == 2
+    assert window.errors == 1
+    assert released == [1]
+
+
+def test_window_slot_released_on_submit_failure():
+    window = AioWindow(1)
+
+    with pytest.raises(ValueError):
+        window.submit(mock.Mock(side_effect=ValueError))
+    window.wait()
+
+
+def test_summary_percentiles():
+    result = summary([0.001 * x for x in range(1, 101)], 0, 2)
+
+    assert result["ops"] == 100
+    assert result["ops_per_sec"] == 50
+    assert result["p50_ms"] == pytest.approx(51)
+    assert result["p99_ms"] == pytest.approx(100)
+    assert summary([], 0, 0)["p99_ms"] == 0
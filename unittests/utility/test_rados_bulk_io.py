@@ -0,0 +1,47 @@
+import hashlib
+from unittest import mock
+
+from utility.rados_bulk_io import BulkIO
+
+
+class FakeIoctx(object):
+    """Completes the asynchronous operations right away."""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    @staticmethod
+    def _completion(ret):
+        completion = mock.Mock()
+        completion.get_return_value.return_value = ret
+        return completion
+
+    def aio_stat(self, name, oncomplete):
+        if name not in self.objects:
+            return oncomplete(self._completion(-2), None, None)
+        oncomplete(self._completion(0), len(self.objects[name]), 0)
+
+    def aio_read(self, name, length, offset, oncomplete):
+        data = self.objects[name][offset : offset + length]
+        oncomplete(self._completion(len(data)), data)
+
+    def aio_flush(self):
+        pass
+
+
+def test_get_reads_the_stat_size():
+    ioctx = FakeIoctx({"obj1": b"hello world", "obj2": b""})
+    ioctx.stat = mock.Mock()
+    bulk = BulkIO(ioctx, 2)
+
+    for name in ["obj1", "obj2", "missing"]:
+        bulk.get(name)
+    bulk.wait()
+
+    ioctx.stat.assert_not_called()
+    assert bulk.checksums == {
+        "obj1": hashlib.md5(b"hello world").hexdigest(),
+        "obj2": hashlib.md5(b"").hexdigest(),
+    }
+    assert bulk.errors == {"missing": -2}
+    assert bulk.bytes == len(b"hello world")
@@ -0,0 +1,19 @@
+from unittest import mock
+
+from utility.rate_limit import TokenBucket
+
+
+def test_token_bucket_allows_burst():
+    bucket = TokenBucket(rate=1, capacity=3)
+    with mock.patch("utility.rate_limit.time.sleep") as sleep_mock:
+        for _ in range(3):
+            assert bucket.acquire() == 0
+
+    sleep_mock.assert_not_called()
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(rate=1000, capacity=1)
+    bucket.acquire()
+
+    assert bucket.acquire() > 0
@@ -2,6 +2,7 @@ import os
 from unittest import mock
 
 import pytest
+import yaml
 
 from utility.utils import custom_ceph_config, get_cephci_config
 
@@ -140,6 +141,23 @@ def test_get_cephi_config(monkeypatch, fixtures_dir):
     assert ceph_cfg.get("email", {}).get("address") == "cephci@redhat.com"
 
 
+def test_get_cephci_config_reloaded_once_modified(monkeypatch, tmp_path):
+    """Test the configuration is parsed again only when the file changes."""
+    cfg_file = tmp_path / ".cephci.yaml"
+    cfg_file.write_text("email:\n  address: a@example.com\n")
+    monkeypatch.setattr(os.path, "expanduser", lambda x: str(tmp_path))
+
+    with mock.patch("utility.utils.yaml.safe_load", wraps=yaml.safe_load) as load:
+        get_cephci_config()["email"]["address"] = "changed"
+        assert get_cephci_config()["email"]["address"] == "a@example.com"
+        assert load.call_count == 1
+
+        cfg_file.write_text("email:\n  address: b@example.com\n")
+        os.utime(cfg_file, ns=(0, 10**18))
+        assert get_cephci_config()["email"]["address"] == "b@example.com"
+        assert load.call_count == 2
+
+
 @mock.patch("os.path.expanduser")
 def test_get_cephci_config_raises(mock_expanduser):
     """Test exception thrown when invalid file is provided."""
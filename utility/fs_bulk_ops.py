@@ -0,0 +1,194 @@
+"""
+Module used to checksum, create, chown or remove many files from a single process.
+
+The whole batch is executed by one invocation on the client instead of one
+command per file. Checksums are computed by a pool of threads and written as
+one JSON line per file as soon as they are available, so directories holding
+millions of files are streamed instead of being buffered. The last line is a
+JSON document holding the statistics of the operation.
+
+Usage:
+    fs_bulk_ops.py checksum -p /mnt/cephfs/dir --max-depth 1 -a md5
+    fs_bulk_ops.py create -p /mnt/cephfs/dir -c 100000 --start 0 --size 1
+    fs_bulk_ops.py chown -p /mnt/cephfs/dir -c 100000 -u user1
+    fs_bulk_ops.py remove -p /mnt/cephfs/dir -c 100000
+
+The checksum lines are [relative path, digest] lists, [relative path, null,
+error] for the files which could not be read. The create, chown and remove
+operations act on the files <prefix><index> of the given index range.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of errors reported in the statistics
+MAX_ERRORS = 100
+
+
+def _hasher(algorithm):
+    if algorithm.startswith("xxh"):
+        import xxhash
+
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def checksum_file(path, algorithm):
+    """Return the digest of the file content."""
+    digest = _hasher(algorithm)
+    with open(path, "rb") as fd:
+        for chunk in iter(lambda: fd.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest(), os.path.getsize(path)
+
+
+def walk_files(top, max_depth=None, depth=1):
+    """Yield the regular files under top, up to max_depth levels deep."""
+    try:
+        entries = os.scandir(top)
+    except OSError:
+        return
+
+    # entries are read as they are walked, large directories are not listed first
+    with entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                yield entry.path
+            elif entry.is_dir(follow_symlinks=False):
+                if max_depth is None or depth < max_depth:
+                    for path in walk_files(entry.path, max_depth, depth + 1):
+                        yield path
+
+
+def checksum(args, stats):
+    """Write the checksum of every file as soon as it is computed."""
+    window = args.workers * 4
+    pending = deque()
+
+    def _emit(futures):
+        for future in futures:
+            path = future.path
+            rel_path = os.path.relpath(path, args.path)
+            try:
+                digest, size = future.result()
+            except (IOError, OSError) as err:
+                _error(stats, path, err)
+                record = [rel_path, None, str(err)]
+            else:
+                stats["files"] += 1
+                stats["bytes"] += size
+                record = [rel_path, digest]
+            sys.stdout.write(json.dumps(record) + "\n")
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for path in walk_files(args.path, args.max_depth):
+            future = executor.submit(checksum_file, path, args.algorithm)
+            future.path = path
+            pending.append(future)
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                _emit(done)
+
+        _emit(pending)
+
+
+def _files(args):
+    for index in range(args.start, args.start + args.count):
+        yield os.path.join(args.path, f"{args.prefix}{index}")
+
+
+def _error(stats, path, err):
+    stats["failed"] += 1
+    if len(stats["errors"]) < MAX_ERRORS:
+        stats["errors"][path] = str(err)
+
+
+def create(args, stats):
+    for path in _files(args):
+        try:
+            with open(path, "wb") as fd:
+                fd.write(os.urandom(args.size))
+            stats["files"] += 1
+            stats["bytes"] += args.size
+        except (IOError, OSError) as err:
+            _error(stats, path, err)
+
+
+def chown(args, stats):
+    user, _, group = args.user.partition(":")
+    for path in _files(args):
+        try:
+            shutil.chown(path, user=user or None, group=group or None)
+            stats["files"] += 1
+        except (IOError, OSError, LookupError) as err:
+            _error(stats, path, err)
+
+
+def remove(args, stats):
+    for path in _files(args):
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            stats["files"] += 1
+        except FileNotFoundError:
+            # same as rm -rf, missing files are not an error
+            stats["files"] += 1
+        except (IOError, OSError) as err:
+            _error(stats, path, err)
+
+
+OPERATIONS = {"checksum": checksum, "create": create, "chown": chown, "remove": remove}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Checksum, create, chown or remove many files at once"
+    )
+    parser.add_argument("op", choices=sorted(OPERATIONS))
+    parser.add_argument("-p", "--path", required=True, help="Directory of the files")
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="Directory levels checksummed, all when omitted",
+    )
+    parser.add_argument(
+        "-a",
+        "--algorithm",
+        default="md5",
+        help="hashlib algorithm or xxh64/xxh128 when python xxhash is installed",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=8, help="Files checksummed at once"
+    )
+    parser.add_argument("-c", "--count", type=int, default=0, help="Number of files")
+    parser.add_argument("--start", type=int, default=1, help="Index of the first file")
+    parser.add_argument("--prefix", default="file", help="Name prefix of the files")
+    parser.add_argument("--size", type=int, default=1, help="Size of created files")
+    parser.add_argument("-u", "--user", help="user[:group] owning the files")
+    args = parser.parse_args()
+
+    stats = {"op": args.op, "files": 0, "bytes": 0, "failed": 0, "errors": {}}
+    start = time.time()
+    OPERATIONS[args.op](args, stats)
+    stats["elapsed"] = max(time.time() - start, 1e-6)
+    stats["files_per_sec"] = stats["files"] / stats["elapsed"]
+    sys.stdout.write(json.dumps({"stats": stats}) + "\n")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,69 +1,115 @@
 # module can be used to generate fragmented objects on replicated pool only
 # support for EC pool may be added later
+# Objects are created and removed asynchronously with a bounded number of
+# operations in flight, optionally sharded across processes, and a JSON summary
+# with the throughput and latency of the operations is printed once done.
 # !/usr/bin/env python
 from __future__ import print_function
 
+import json
 import sys
+import time
+from multiprocessing import Pool
 
 from docopt import docopt
 from rados import Rados
+from rados_aio import AioWindow, summary
 
 doc = """
 Usage:
   generate_frag_objs.py --pool <pool_name> --create <object_count> --remove <object_count> --size <each_object_size>
+                        [--concurrency <num>] [--workers <num>]
 
 Options:
   --pool <name>      Name of the pool where the omap entries need to be generated
   --create <num>       Start point/count to create objects
   --remove <num>       Start point/count to create objects
   --size <num>       Number of kw pairs to be created for each object
+  --concurrency <num>  Number of operations in flight per process [default: 1]
+  --workers <num>      Number of processes sharing the objects [default: 1]
 
 """
 
 
-def run(args):
-    pool = args["--pool"]
-    create = int(args["--create"])
-    remove = int(args["--remove"])
-    size = int(args["--size"])
+def progress(state, *message):
+    if time.time() - state["last_print"] >= 1:
+        state["last_print"] = time.time()
+        print(*message, end="\r")
+        sys.stdout.flush()
+
+
+def run_shard(params):
+    pool, first, last, create, remove, size, concurrency = params
+    # Zero filled buffer shared by all the writes
     data = bytes(size)
+    window = AioWindow(concurrency)
+    state = {"last_print": 0}
+    prefix = "filler_" + str(size) + "_"
+
     with Rados(conffile="") as cluster:
         with cluster.open_ioctx(pool) as ioctx:
-            prefix = "filler_" + str(size) + "_"
-            for i in range(0, create):
-                ioctx.write(prefix + str(i), data, 0)
-                print(
-                    "create",
-                    i,
-                    "of",
-                    create,
-                    "objects",
-                    end="\r",
-                )
-                sys.stdout.flush()
-            for i in range(0, create, 2):
-                ioctx.remove_object(prefix + str(i))
-                print(
+            for i in range(first, min(last, create)):
+                window.submit(ioctx.aio_write, prefix + str(i), data, 0)
+                progress(state, "create", i, "of", create, "objects")
+            window.wait()
+
+            # removed - fragment, every even object created
+            for i in range(first + first % 2, min(last, create), 2):
+                window.submit(ioctx.aio_remove, prefix + str(i))
+                progress(
+                    state,
                     "removed - fragment",
                     int(i / 2),
                     "of",
                     int(create / 2),
                     "objects",
-                    end="\r",
                 )
-                sys.stdout.flush()
-            for i in range(0, remove, 2):
-                ioctx.remove_object(prefix + str(i + 1))
-                print(
+            window.wait()
+
+            # removed - defragment, every odd object up to remove
+            for i in range(first + (first + 1) % 2, min(last, remove + 1), 2):
+                window.submit(ioctx.aio_remove, prefix + str(i))
+                progress(
+                    state,
                     "removed - defragment",
                     int(i / 2),
                     "of",
                     int(remove / 2),
                     "objects",
-                    end="\r",
                 )
-                sys.stdout.flush()
+            window.wait()
+
+    return window.latencies, window.errors
+
+
+def run(args):
+    pool = args["--pool"]
+    create = int(args["--create"])
+    remove = int(args["--remove"])
+    size = int(args["--size"])
+    concurrency = int(args["--concurrency"])
+    total = max(create, remove + 1)
+    workers = max(1, min(int(args["--workers"]), total))
+
+    step = -(-total // workers)
+    shards = [
+        (pool, i, min(i + step, total), create, remove, size, concurrency)
+        for i in range(0, total, step)
+    ]
+
+    began = time.time()
+    if len(shards) > 1:
+        with Pool(len(shards)) as pool_:
+            results = pool_.map(run_shard, shards)
+    else:
+        results = [run_shard(shard) for shard in shards]
+
+    latencies = [latency for result in results for latency in result[0]]
+    errors = sum(result[1] for result in results)
     print("\nDone!")
+    print(json.dumps(summary(latencies, errors, time.time() - began)))
+    if errors:
+        raise Exception(f"{errors} operations failed")
 
 
 if __name__ == "__main__":
@@ -3,55 +3,103 @@ Module used to:
 1. Create objects on pool,
 2. generate specified amount of dummy key value pairs, add it as attributes to the object,
  thereby increasing the omap entries on the pool
+
+Writes are issued asynchronously with a bounded number of operations in flight
+and the object range can be sharded across processes. A JSON summary with the
+throughput and latency of the writes is printed once done.
 """
 
 # !/usr/bin/env python
 from __future__ import print_function
 
+import json
 import os
 import sys
+import time
+from multiprocessing import Pool
 
 from docopt import docopt
-from rados import Rados, WriteOpCtx
+from rados import Rados
+from rados_aio import AioWindow, summary
 
 doc = """
 Usage:
   generate_omap_entries.py --pool <pool_name> --start <init_count> --end <end_count> --key-count <num_keys>
+                           [--concurrency <num>] [--workers <num>]
 
 Options:
   --pool <name>                     Name of the pool where the omap entries need to be generated
   --start <num>                     Start point/count to create objects
   --end <num>                       end point/count to create objects
   --key-count <num>                 Number of kw pairs to be created for each object
+  --concurrency <num>               Number of writes in flight per process [default: 1]
+  --workers <num>                   Number of processes sharing the objects [default: 1]
 
 """
 
 
-def run(args):
-    pool = args["--pool"]
-    start = int(args["--start"])
-    end = int(args["--end"])
-    keys_per_object = int(args["--key-count"])
+def write_shard(params):
+    pool, prefix, start, end, keys_per_object, concurrency = params
     keys = tuple(["key_" + str(x) for x in range(keys_per_object)])
     values = tuple(["value_" + str(x) for x in range(keys_per_object)])
+    window = AioWindow(concurrency)
+    last_print = 0
 
     with Rados(conffile="") as cluster:
         with cluster.open_ioctx(pool) as ioctx:
-            prefix = "omap_obj_" + str(os.getpid()) + "_"
             for i in range(start, end):
-                with WriteOpCtx(ioctx) as write_op:
-                    ioctx.set_omap(write_op, keys, values)
-                    ioctx.operate_write_op(write_op, prefix + str(i))
+                write_op = ioctx.create_write_op()
+                ioctx.set_omap(write_op, keys, values)
+                window.submit(
+                    ioctx.operate_aio_write_op,
+                    write_op,
+                    prefix + str(i),
+                    release=write_op.release,
+                )
+                if time.time() - last_print >= 1:
+                    last_print = time.time()
                     print(
                         "wrote",
-                        (i + 1) * keys_per_object,
+                        (i - start + 1) * keys_per_object,
                         "of",
                         (end - start) * keys_per_object,
                         "omap entries",
                         end="\r",
                     )
                     sys.stdout.flush()
+            window.wait()
+
+    return window.latencies, window.errors
+
+
+def run(args):
+    pool = args["--pool"]
+    start = int(args["--start"])
+    end = int(args["--end"])
+    keys_per_object = int(args["--key-count"])
+    concurrency = int(args["--concurrency"])
+    workers = max(1, min(int(args["--workers"]), end - start))
+    prefix = "omap_obj_" + str(os.getpid()) + "_"
+
+    step = -(-(end - start) // workers) if end > start else 1
+    shards = [
+        (pool, prefix, i, min(i + step, end), keys_per_object, concurrency)
+        for i in range(start, end, step)
+    ]
+
+    began = time.time()
+    if len(shards) > 1:
+        with Pool(len(shards)) as pool_:
+            results = pool_.map(write_shard, shards)
+    else:
+        results = [write_shard(shard) for shard in shards]
+
+    latencies = [latency for result in results for latency in result[0]]
+    errors = sum(result[1] for result in results)
     print("\nDone!")
+    print(json.dumps(summary(latencies, errors, time.time() - began)))
+    if errors:
+        raise Exception(f"{errors} writes failed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""
+On-disk cache of the HTTP resources fetched at every run, like the QE ceph
+manifest files and the compose listings.
+
+A cached resource is served without any request while it is younger than its
+TTL. Past the TTL, it is revalidated with the ETag and Last-Modified returned
+by the server, a `304 Not Modified` reply only refreshing its age. When the
+server cannot be reached or fails, the last good copy is served instead.
+
+The manifests naming the "latest" builds change without their URL changing,
+they are fetched with a TTL of 0 so every read is revalidated while the cache
+still covers an unreachable server or an offline run.
+
+The behaviour is controlled using the environment
+
+    CEPHCI_HTTP_CACHE_DIR   directory of the cache, ~/.cache/cephci/http
+    CEPHCI_HTTP_CACHE_TTL   seconds a copy is served without revalidation, 600
+    CEPHCI_OFFLINE          when set to 1 or true, only the cache is used
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+from utility.log import Log
+
+log = Log(__name__)
+
+DEFAULT_TTL = 600
+
+# TTL of the build manifests, always revalidated
+MANIFEST_TTL = 0
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "cephci", "http")
+
+
+class CachedResponse:
+    """Minimal requests.Response like view of a cached resource."""
+
+    def __init__(self, url, content, status_code=200, headers=None, from_cache=False):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or dict()
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def cache_dir():
+    """Returns the directory of the cache."""
+    path = os.environ.get("CEPHCI_HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return os.path.expanduser(path)
+
+
+def is_offline():
+    """Returns True when the remote resources must not be requested."""
+    return os.environ.get("CEPHCI_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def _ttl(ttl):
+    if ttl is not None:
+        return ttl
+    return int(os.environ.get("CEPHCI_HTTP_CACHE_TTL", DEFAULT_TTL))
+
+
+def _paths(url):
+    key = hashlib.sha256(url.encode()).hexdigest()
+    base = os.path.join(cache_dir(), key)
+    return f"{base}.json", f"{base}.body"
+
+
+def _load(url):
+    meta_file, body_file = _paths(url)
+    try:
+        with open(meta_file) as meta_fd, open(body_file, "rb") as body_fd:
+            meta = json.load(meta_fd)
+            return meta, body_fd.read()
+    except (IOError, ValueError):
+        return None, None
+
+
+def _write(path, data):
+    # written to a temporary file first, concurrent runs never read partial copies
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as tmp_fd:
+        tmp_fd.write(data)
+    os.replace(tmp, path)
+
+
+def _store(url, meta, content=None):
+    meta_file, body_file = _paths(url)
+    try:
+        os.makedirs(os.path.dirname(meta_file), exist_ok=True)
+        if content is not None:
+            _write(body_file, content)
+        _write(meta_file, json.dumps(meta).encode())
+    except (IOError, OSError) as err:
+        log.debug(f"Unable to cache {url}: {err}")
+
+
+def cached_get(url, ttl=None, verify=False, timeout=60):
+    """
+    Returns the resource at the url, from the cache when it is still valid.
+
+    Only successful replies are cached. Errors are returned as is when no
+    copy of the resource has been cached before.
+
+    Args:
+        url: resource to be fetched
+        ttl: seconds the cached copy is used without revalidation, the
+             CEPHCI_HTTP_CACHE_TTL environment or 600 when None
+        verify: verify the TLS certificate of the server
+        timeout: timeout of the request in seconds
+
+    Returns:
+        CachedResponse of the resource
+
+    Raises:
+        requests.RequestException: when the resource could not be fetched and
+            is not cached
+    """
+    meta, content = _load(url)
+
+    if meta and is_offline():
+        return CachedResponse(url, content, headers=meta["headers"], from_cache=True)
+    if is_offline():
+        raise requests.ConnectionError(f"{url} is not cached, running offline")
+
+    if meta and time.time() - meta["fetched"] < _ttl(ttl):
+        return CachedResponse(url, content, headers=meta["headers"], from_cache=True)
+
+    headers = dict()
+    if meta and meta["headers"].get("ETag"):
+        headers["If-None-Match"] = meta["headers"]["ETag"]
+    if meta and meta["headers"].get("Last-Modified"):
+        headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+    try:
+        resp = requests.get(url, headers=headers, verify=verify, timeout=timeout)
+    except requests.RequestException as err:
+        if not meta:
+            raise
+        log.warning(f"Unable to reach {url}, using the copy cached. {err}")
+        return CachedResponse(url, content, headers=meta["headers"], from_cache=True)
+
+    if meta and resp.status_code == 304:
+        meta["fetched"] = time.time()
+        _store(url, meta)
+        return CachedResponse(url, content, headers=meta["headers"], from_cache=True)
+
+    if not resp.ok:
+        if meta and resp.status_code >= 500:
+            log.warning(f"{url} returned {resp.status_code}, using the copy cached")
+            return CachedResponse(
+                url, content, headers=meta["headers"], from_cache=True
+            )
+        return CachedResponse(url, resp.content, resp.status_code, dict(resp.headers))
+
+    validators = {
+        k: resp.headers[k] for k in ("ETag", "Last-Modified") if k in resp.headers
+    }
+    meta = {"url": url, "fetched": time.time(), "headers": validators}
+    _store(url, meta, resp.content)
+
+    return CachedResponse(url, resp.content, resp.status_code, validators)
@@ -0,0 +1,462 @@
+"""
+fio result model shared by the IO and performance tests.
+
+The json and json+ outputs of fio are parsed into FioJobResult objects holding
+a FioOpResult per data direction with the IOPS, bandwidth, latencies and the
+completion latency percentiles. json+ outputs carry the latency histogram,
+which allows the percentiles of merged results to be computed exactly.
+
+Results of the jobs of a run, of several clients or of several iterations are
+merged using `merge_results` and FioReport groups the results per build,
+protocol and workload to compare them against a baseline with tolerance bands::
+
+    report = FioReport()
+    report.add(parse_fio_output(out), build="19.2.1-10", protocol="nvmeof")
+    report.add(parse_fio_output(out2), build="19.2.1-10", protocol="rbd")
+    rows = report.compare(baseline={"protocol": "rbd"}, by="protocol")
+"""
+
+import csv
+import io
+import json
+from dataclasses import asdict, dataclass, field
+
+from utility.log import Log
+
+log = Log(__name__)
+
+DIRECTIONS = ("read", "write", "trim")
+
+# Percentiles reported when computed from the latency histograms
+PERCENTILES = (1.0, 5.0, 10.0, 50.0, 90.0, 95.0, 99.0, 99.9, 99.99)
+
+# Allowed relative change of a metric before it is reported as a regression
+DEFAULT_TOLERANCE = {
+    "iops": 0.05,
+    "bw": 0.05,
+    "lat_ns": 0.10,
+    "clat_p99_ns": 0.15,
+}
+
+# Metrics for which a higher value is better
+HIGHER_IS_BETTER = ("iops", "bw")
+
+
+def _pct_key(percentile):
+    return f"{percentile:.6f}"
+
+
+@dataclass
+class FioOpResult:
+    """
+    Statistics of a data direction of a fio job.
+
+    Attributes:
+        iops: operations per second
+        bw: bandwidth in KiB/s
+        io_bytes: bytes transferred
+        total_ios: number of operations
+        runtime_ms: runtime in milliseconds
+        slat_ns, clat_ns, lat_ns: mean submission, completion and total latency
+        lat_min_ns, lat_max_ns: minimum and maximum total latency
+        clat_percentiles: completion latency in ns per percentile ("99.000000")
+        clat_bins: completion latency histogram {ns: count}, json+ output only
+    """
+
+    iops: float = 0.0
+    bw: float = 0.0
+    io_bytes: int = 0
+    total_ios: int = 0
+    runtime_ms: int = 0
+    slat_ns: float = 0.0
+    clat_ns: float = 0.0
+    lat_ns: float = 0.0
+    lat_min_ns: float = 0.0
+    lat_max_ns: float = 0.0
+    clat_percentiles: dict = field(default_factory=dict)
+    clat_bins: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_fio(cls, data):
+        """Build the statistics from a direction section of the fio output."""
+        clat = data.get("clat_ns", {})
+        lat = data.get("lat_ns", {})
+        return cls(
+            iops=float(data.get("iops", 0)),
+            bw=float(data.get("bw", 0)),
+            io_bytes=int(data.get("io_bytes", 0)),
+            total_ios=int(data.get("total_ios", 0)),
+            runtime_ms=int(data.get("runtime", 0)),
+            slat_ns=float(data.get("slat_ns", {}).get("mean", 0)),
+            clat_ns=float(clat.get("mean", 0)),
+            lat_ns=float(lat.get("mean", 0)),
+            lat_min_ns=float(lat.get("min", 0)),
+            lat_max_ns=float(lat.get("max", 0)),
+            clat_percentiles={
+                k: float(v) for k, v in (clat.get("percentile") or {}).items()
+            },
+            clat_bins={int(k): int(v) for k, v in (clat.get("bins") or {}).items()},
+        )
+
+    def percentile(self, percentile):
+        """Return the completion latency in ns of the given percentile."""
+        return self.clat_percentiles.get(_pct_key(percentile), 0.0)
+
+    @property
+    def metrics(self):
+        """Return the metrics compared between runs."""
+        return {
+            "iops": self.iops,
+            "bw": self.bw,
+            "slat_ns": self.slat_ns,
+            "clat_ns": self.clat_ns,
+            "lat_ns": self.lat_ns,
+            "clat_p50_ns": self.percentile(50),
+            "clat_p99_ns": self.percentile(99),
+            "clat_p99.9_ns": self.percentile(99.9),
+        }
+
+
+@dataclass
+class FioJobResult:
+    """
+    Result of a fio job.
+
+    Attributes:
+        name: job name
+        rw: IO pattern of the job
+        options: job options along with the global options
+        read, write, trim: FioOpResult of the directions exercised by the job
+        tags: labels of the result, like client, protocol, build or iteration
+    """
+
+    name: str
+    rw: str = ""
+    options: dict = field(default_factory=dict)
+    read: FioOpResult = None
+    write: FioOpResult = None
+    trim: FioOpResult = None
+    tags: dict = field(default_factory=dict)
+
+    @property
+    def ops(self):
+        """Return the exercised directions and their statistics."""
+        return {d: getattr(self, d) for d in DIRECTIONS if getattr(self, d)}
+
+    def to_dict(self, bins=False):
+        data = asdict(self)
+        if not bins:
+            for direction in DIRECTIONS:
+                if data[direction]:
+                    data[direction].pop("clat_bins")
+        return data
+
+
+def parse_fio_output(output, **tags):
+    """
+    Parse the json or json+ output of fio
+    Args:
+        output: fio output, either the text or the loaded json
+        tags: labels added to the results, like client or protocol
+    Returns:
+        list of FioJobResult, one per reported job or group
+    """
+    if isinstance(output, bytes):
+        output = output.decode()
+
+    if isinstance(output, str):
+        # fio may print warnings before the json document
+        output = json.loads(output[output.index("{") :])
+
+    global_options = output.get("global options", {})
+    results = []
+    for job in output.get("jobs", []):
+        options = dict(global_options, **job.get("job options", {}))
+        result = FioJobResult(
+            name=job.get("jobname", ""),
+            rw=options.get("rw", ""),
+            options=options,
+            tags=dict(tags),
+        )
+        for direction in DIRECTIONS:
+            data = job.get(direction)
+            if data and (data.get("total_ios") or data.get("io_bytes")):
+                setattr(result, direction, FioOpResult.from_fio(data))
+        results.append(result)
+
+    return results
+
+
+def fetch_fio_result(node, path, **tags):
+    """
+    Read and parse the fio output file of a node
+    Args:
+        node: node holding the fio output file
+        path: fio output file
+        tags: labels added to the results
+    Returns:
+        list of FioJobResult
+    """
+    remote_file = node.remote_file(file_name=path, file_mode="r")
+    try:
+        return parse_fio_output(remote_file.read(), **tags)
+    finally:
+        remote_file.close()
+
+
+def _percentiles_from_bins(bins):
+    total = sum(bins.values())
+    percentiles = dict()
+    if not total:
+        return percentiles
+
+    cumulative, items, index = 0, sorted(bins.items()), 0
+    for percentile in PERCENTILES:
+        threshold = total * percentile / 100
+        while index < len(items) and cumulative + items[index][1] < threshold:
+            cumulative += items[index][1]
+            index += 1
+        percentiles[_pct_key(percentile)] = float(items[min(index, len(items) - 1)][0])
+
+    return percentiles
+
+
+def merge_ops(ops, mode="sum"):
+    """
+    Merge the statistics of a direction
+    Args:
+        ops: list of FioOpResult
+        mode: "sum" for jobs or clients running at the same time, "mean" for
+            iterations of the same workload
+    Returns:
+        FioOpResult
+    """
+    ops = [op for op in ops if op]
+    if not ops:
+        return None
+
+    count = len(ops) if mode == "mean" else 1
+    total_ios = sum(op.total_ios for op in ops)
+
+    def _weighted(attr):
+        if not total_ios:
+            return sum(getattr(op, attr) for op in ops) / len(ops)
+        return sum(getattr(op, attr) * op.total_ios for op in ops) / total_ios
+
+    bins = dict()
+    if all(op.clat_bins for op in ops):
+        for op in ops:
+            for value, hits in op.clat_bins.items():
+                bins[value] = bins.get(value, 0) + hits
+        percentiles = _percentiles_from_bins(bins)
+    else:
+        # Weighted percentiles are an approximation without the histograms
+        keys = set.intersection(*[set(op.clat_percentiles) for op in ops])
+        percentiles = {
+            k: (
+                sum(op.clat_percentiles[k] * (op.total_ios or 1) for op in ops)
+                / sum(op.total_ios or 1 for op in ops)
+            )
+            for k in keys
+        }
+
+    return FioOpResult(
+        iops=sum(op.iops for op in ops) / count,
+        bw=sum(op.bw for op in ops) / count,
+        io_bytes=sum(op.io_bytes for op in ops) // count,
+        total_ios=total_ios // count,
+        runtime_ms=(
+            max(op.runtime_ms for op in ops)
+            if mode == "sum"
+            else sum(op.runtime_ms for op in ops) // count
+        ),
+        slat_ns=_weighted("slat_ns"),
+        clat_ns=_weighted("clat_ns"),
+        lat_ns=_weighted("lat_ns"),
+        lat_min_ns=min(op.lat_min_ns for op in ops),
+        lat_max_ns=max(op.lat_max_ns for op in ops),
+        clat_percentiles=percentiles,
+        clat_bins=bins,
+    )
+
+
+def merge_results(results, mode="sum", name=None):
+    """
+    Merge job results into a single result
+    Args:
+        results: list of FioJobResult
+        mode: "sum" for jobs or clients running at the same time, "mean" for
+            iterations of the same workload
+        name: name of the merged result, the name of the first result otherwise
+    Returns:
+        FioJobResult holding the tags shared by all the results
+    """
+    if not results:
+        raise ValueError("No fio results to merge")
+
+    tags = {
+        k: v
+        for k, v in results[0].tags.items()
+        if all(r.tags.get(k) == v for r in results)
+    }
+    merged = FioJobResult(
+        name=name or results[0].name,
+        rw=results[0].rw,
+        options=results[0].options,
+        tags=tags,
+    )
+    for direction in DIRECTIONS:
+        setattr(
+            merged,
+            direction,
+            merge_ops([getattr(r, direction) for r in results], mode=mode),
+        )
+
+    return merged
+
+
+def compare_metrics(baseline, current, tolerance=None):
+    """
+    Compare the metrics of a direction against a baseline
+    Args:
+        baseline: FioOpResult of the baseline
+        current: FioOpResult to be compared
+        tolerance: allowed relative change per metric, refer DEFAULT_TOLERANCE
+    Returns:
+        list of dict with the metric, both values, the change and the status,
+        one of "ok", "improved" or "regressed"
+    """
+    tolerance = dict(DEFAULT_TOLERANCE, **(tolerance or {}))
+    rows = []
+    base_metrics, metrics = baseline.metrics, current.metrics
+    for metric, band in tolerance.items():
+        base, value = base_metrics.get(metric), metrics.get(metric)
+        if not base or value is None:
+            continue
+
+        change = (value - base) / base
+        better = change if metric in HIGHER_IS_BETTER else -change
+        status = "ok"
+        if better < -band:
+            status = "regressed"
+        elif better > band:
+            status = "improved"
+
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": base,
+                "value": value,
+                "change": change,
+                "tolerance": band,
+                "status": status,
+            }
+        )
+
+    return rows
+
+
+class FioReport:
+    """Collection of fio results compared across builds and protocols."""
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, results, **tags):
+        """
+        Add job results to the report
+        Args:
+            results: FioJobResult or list of them
+            tags: labels of the results, like build, protocol or iteration
+        """
+        if isinstance(results, FioJobResult):
+            results = [results]
+
+        for result in results:
+            result.tags.update(tags)
+            self.results.append(result)
+
+    def group(self, *keys, mode="mean"):
+        """
+        Merge the results sharing the same values of the given tags
+        Args:
+            keys: tags identifying a group, the job name is always part of it
+            mode: merge mode of the results of a group, refer merge_results
+        Returns:
+            dict of (name, tag values...) to the merged FioJobResult
+        """
+        groups = dict()
+        for result in self.results:
+            key = (result.name,) + tuple(result.tags.get(k) for k in keys)
+            groups.setdefault(key, []).append(result)
+
+        return {k: merge_results(v, mode=mode) for k, v in groups.items()}
+
+    def compare(self, baseline, by="build", keys=(), tolerance=None):
+        """
+        Compare the results with the baseline ones
+        Args:
+            baseline: tag values selecting the baseline, like {"build": "19.2.1-10"}
+            by: tag distinguishing the compared runs, build or protocol
+            keys: additional tags a result is compared within, like workload
+            tolerance: allowed relative change per metric, refer DEFAULT_TOLERANCE
+        Returns:
+            list of comparison rows, refer compare_metrics
+        """
+        keys = tuple(k for k in keys if k != by)
+        groups = self.group(by, *keys)
+        rows = []
+        for (name, value, *others), result in groups.items():
+            if value == baseline.get(by):
+                continue
+
+            base = groups.get((name, baseline.get(by), *others))
+            if not base:
+                continue
+
+            for direction, op in result.ops.items():
+                base_op = getattr(base, direction)
+                if not base_op:
+                    continue
+                for row in compare_metrics(base_op, op, tolerance):
+                    row.update(
+                        dict(zip(keys, others)),
+                        name=name,
+                        direction=direction,
+                        **{by: value, f"baseline_{by}": baseline.get(by)},
+                    )
+                    rows.append(row)
+
+        for row in rows:
+            if row["status"] == "regressed":
+                log.error(f"fio regression: {row}")
+
+        return rows
+
+    def to_rows(self):
+        """Return a flat row per job result and direction."""
+        rows = []
+        for result in self.results:
+            for direction, op in result.ops.items():
+                row = {"name": result.name, "rw": result.rw, "direction": direction}
+                row.update(result.tags)
+                row.update(op.metrics)
+                rows.append(row)
+        return rows
+
+    def to_csv(self):
+        """Return the results as CSV text."""
+        rows = self.to_rows()
+        fields = []
+        for row in rows:
+            fields += [k for k in row if k not in fields]
+
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+        return out.getvalue()
+
+    def to_json(self, bins=False):
+        """Return the results as a json document."""
+        return json.dumps([r.to_dict(bins=bins) for r in self.results], indent=2)
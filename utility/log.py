@@ -1,7 +1,10 @@
+import contextvars
 import logging
 import logging.handlers
 import os
 import re
+import threading
+from contextlib import contextmanager
 from copy import deepcopy
 from typing import Dict
 
@@ -14,6 +17,29 @@ LOG_FORMAT = (
 magna_server = "http://magna002.ceph.redhat.com"
 magna_url = f"{magna_server}/cephci-jenkins/"
 
+# Name of the test the current thread works for, ceph.parallel tasks inherit it
+_current_test = contextvars.ContextVar("cephci_test", default=None)
+_errors_lock = threading.Lock()
+
+
+def current_test():
+    """Returns the name of the test the caller works for, None outside a test."""
+    return _current_test.get()
+
+
+@contextmanager
+def in_test(test_name):
+    """Attributes the logs, errors and waits of the caller to the test.
+
+    Args:
+        test_name (str): unique name of the test
+    """
+    token = _current_test.set(test_name)
+    try:
+        yield
+    finally:
+        _current_test.reset(token)
+
 
 class LoggerInitializationException(Exception):
     """Exception raised for logger initialization errors."""
@@ -98,15 +124,39 @@ class Log(logging.Logger):
         Args:
             message (str): The error message to log and track.
         """
-        self._log_errors.append(message)
+        with _errors_lock:
+            self._log_errors.append((current_test(), message))
         self.error(message)
 
-    def configure_logger(self, test_name, run_dir, disable_console_log, **kwargs):
+    def pop_errors(self, test_name=None):
+        """Returns and forgets the errors tracked for the test.
+
+        The errors logged outside of any test context are returned as well,
+        they come from threads not started through ceph.parallel.
+
+        Args:
+            test_name (str): unique name of the test
+        Returns:
+            list of the error messages
+        """
+        with _errors_lock:
+            errors = [m for t, m in self._log_errors if t in (test_name, None)]
+            self._log_errors = [
+                (t, m) for t, m in self._log_errors if t not in (test_name, None)
+            ]
+
+        return errors
+
+    def configure_logger(
+        self, test_name, run_dir, disable_console_log, scoped=False, **kwargs
+    ):
         """Configures a new FileHandler for the root logger.
 
         Args:
             test_name: name of the test being executed. used for naming the logfile
             run_dir: directory where logs are being placed
+            scoped: keep the file handlers of the other tests, the new ones only
+                log the records of the test context, refer in_test
         Returns:
             URL where the log file can be viewed or None if the run_dir does not exist
         """
@@ -116,8 +166,10 @@ class Log(logging.Logger):
             )
             return None
 
-        self.close_and_remove_filehandlers()
+        if not scoped:
+            self.close_and_remove_filehandlers()
         pass_filter = SensitiveLogFilter(name="cephci_filter")
+        test_filter = TestLogFilter(test_name) if scoped else None
 
         log_format = logging.Formatter(self.log_format)
         full_log_name = f"{test_name}.log"
@@ -135,6 +187,8 @@ class Log(logging.Logger):
         )
         _handler.setFormatter(log_format)
         _handler.addFilter(pass_filter)
+        if test_filter:
+            _handler.addFilter(test_filter)
         self._logger.addHandler(_handler)
 
         # error file handler
@@ -143,6 +197,8 @@ class Log(logging.Logger):
         _err_handler.setFormatter(log_format)
         _err_handler.setLevel(logging.ERROR)
         _err_handler.addFilter(pass_filter)
+        if test_filter:
+            _err_handler.addFilter(test_filter)
         self._logger.addHandler(_err_handler)
 
         console_handler = logging.StreamHandler()
@@ -162,13 +218,35 @@ class Log(logging.Logger):
 
         return log_url
 
-    def close_and_remove_filehandlers(self):
-        """Close FileHandlers and then remove them from the logger's handlers list."""
+    def close_and_remove_filehandlers(self, test_name=None):
+        """Close FileHandlers and then remove them from the logger's handlers list.
+
+        Args:
+            test_name: only the scoped handlers of the test, all when None
+        """
         handlers = self._logger.handlers[:]
         for handler in handlers:
-            if isinstance(handler, logging.FileHandler):
-                handler.close()
-                self._logger.removeHandler(handler)
+            if not isinstance(handler, logging.FileHandler):
+                continue
+            if test_name and not any(
+                isinstance(f, TestLogFilter) and f.test_name == test_name
+                for f in handler.filters
+            ):
+                continue
+
+            handler.close()
+            self._logger.removeHandler(handler)
+
+
+class TestLogFilter(logging.Filter):
+    """Keeps the records of a test, along with the ones of no test context."""
+
+    def __init__(self, test_name):
+        super().__init__()
+        self.test_name = test_name
+
+    def filter(self, record):
+        return current_test() in (self.test_name, None)
 
 
 class SensitiveLogFilter(logging.Filter):
@@ -0,0 +1,187 @@
+"""
+Module used to send many requests to a NVMe-oF gateway over a single gRPC channel.
+
+The helper runs inside the gateway container, which ships the gRPC runtime and
+the stubs matching the gateway version, and keeps one channel open to the
+gateway control port for its whole life. Requests are read from stdin and the
+responses written to stdout, one JSON document per line:
+
+    {"method": "namespace_add", "request": {"subsystem_nqn": "...", ...}}
+    {"method": "namespace_add", "batch": [{...}, {...}], "concurrency": 32}
+
+The field values are converted to the types of the request fields, CLI
+arguments being strings. A single request is answered with {"ok": true,
+"response": {...}}, or {"ok": false, "error": "..."}; "unsupported" is set
+when the method, its fields or their values are not known by the gateway
+version. A batch is answered with
+{"results": [...]} holding one such answer per request, in request order.
+
+Usage:
+    podman exec -i <nvmeof container> python3 -u nvmeof_grpc_helper.py <ip>:<port>
+"""
+
+import json
+import sys
+import threading
+
+import grpc
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+
+sys.path.insert(0, "/src")
+from control.proto import gateway_pb2, gateway_pb2_grpc  # noqa: E402
+
+DEFAULT_TIMEOUT = 300
+
+_INT_TYPES = (
+    FieldDescriptor.TYPE_INT32,
+    FieldDescriptor.TYPE_INT64,
+    FieldDescriptor.TYPE_UINT32,
+    FieldDescriptor.TYPE_UINT64,
+    FieldDescriptor.TYPE_SINT32,
+    FieldDescriptor.TYPE_SINT64,
+    FieldDescriptor.TYPE_FIXED32,
+    FieldDescriptor.TYPE_FIXED64,
+)
+
+
+def _to_dict(message):
+    kwargs = {"preserving_proto_field_name": True}
+    try:
+        return MessageToDict(message, including_default_value_fields=True, **kwargs)
+    except TypeError:
+        # protobuf >= 5 renamed the option
+        return MessageToDict(
+            message, always_print_fields_with_no_presence=True, **kwargs
+        )
+
+
+def _convert(field, value):
+    """Return the value converted to the type of the request field."""
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        return value
+    if field.type == FieldDescriptor.TYPE_STRING:
+        return str(value)
+    if field.type == FieldDescriptor.TYPE_BOOL:
+        if isinstance(value, str):
+            return value.lower() in ("", "1", "true", "yes")
+        return bool(value)
+    if field.type in _INT_TYPES:
+        return int(value)
+    if field.type in (FieldDescriptor.TYPE_FLOAT, FieldDescriptor.TYPE_DOUBLE):
+        return float(value)
+    if field.type == FieldDescriptor.TYPE_ENUM and isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        values = field.enum_type.values_by_name
+        for name in (value, value.upper(), value.lower()):
+            if name in values:
+                return values[name].number
+        raise ValueError(f"{value} is not a value of {field.enum_type.name}")
+    return value
+
+
+def _build(method, fields):
+    """Return the request message of the method, None if it is not supported."""
+    request_cls = getattr(gateway_pb2, f"{method}_req", None)
+    if request_cls is None:
+        return None, f"method {method} is not supported by the gateway"
+
+    descriptors = request_cls.DESCRIPTOR.fields_by_name
+    unknown = set(fields) - set(descriptors)
+    if unknown:
+        return None, f"fields {sorted(unknown)} of {method}_req are not supported"
+
+    try:
+        values = {k: _convert(descriptors[k], v) for k, v in fields.items()}
+        return request_cls(**values), None
+    except (TypeError, ValueError) as err:
+        return None, f"invalid {method}_req {fields}: {err}"
+
+
+def _result(response):
+    result = _to_dict(response)
+    if result.get("status"):
+        return {
+            "ok": False,
+            "error": result.get("error_message") or f"status {result['status']}",
+            "response": result,
+        }
+    return {"ok": True, "response": result}
+
+
+def _error(err):
+    if isinstance(err, grpc.RpcError):
+        return {"ok": False, "error": f"{err.code()}: {err.details()}"}
+    return {"ok": False, "error": str(err)}
+
+
+def call(stub, method, fields, timeout):
+    request, error = _build(method, fields)
+    if request is None:
+        return {"ok": False, "unsupported": True, "error": error}
+
+    try:
+        return _result(getattr(stub, method)(request, timeout=timeout))
+    except Exception as err:
+        return _error(err)
+
+
+def batch(stub, method, requests, concurrency, timeout):
+    """Send the requests with a bounded number of calls in flight."""
+    results = [None] * len(requests)
+    window = threading.Semaphore(concurrency)
+
+    def _done(index, future):
+        try:
+            results[index] = _result(future.result())
+        except Exception as err:
+            results[index] = _error(err)
+        finally:
+            window.release()
+
+    for index, fields in enumerate(requests):
+        request, error = _build(method, fields)
+        if request is None:
+            results[index] = {"ok": False, "unsupported": True, "error": error}
+            continue
+
+        window.acquire()
+        future = getattr(stub, method).future(request, timeout=timeout)
+        future.add_done_callback(lambda f, i=index: _done(i, f))
+
+    for _ in range(concurrency):
+        window.acquire()
+
+    return {"results": results}
+
+
+def main():
+    channel = grpc.insecure_channel(sys.argv[1])
+    stub = gateway_pb2_grpc.GatewayStub(channel)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        payload = json.loads(line)
+        timeout = payload.get("timeout", DEFAULT_TIMEOUT)
+        if "batch" in payload:
+            response = batch(
+                stub,
+                payload["method"],
+                payload["batch"],
+                payload.get("concurrency", 32),
+                timeout,
+            )
+        else:
+            response = call(stub, payload["method"], payload["request"], timeout)
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    channel.close()
+
+
+if __name__ == "__main__":
+    main()
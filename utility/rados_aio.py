@@ -0,0 +1,70 @@
+"""
+Helpers shared by the scripts issuing asynchronous librados operations,
+generate_omap_entries.py and generate_frag_objs.py.
+
+The scripts are copied to the client nodes along with this module and import
+it from their own directory.
+"""
+
+import threading
+import time
+
+
+class AioWindow(object):
+    """Bounded number of asynchronous operations in flight along with their latency."""
+
+    def __init__(self, size):
+        self.size = size
+        self.slots = threading.Semaphore(size)
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+
+    def submit(self, aio_fn, *args, **kwargs):
+        """Issue the operation once a slot is available."""
+        release = kwargs.pop("release", None)
+        self.slots.acquire()
+        start = time.time()
+
+        def oncomplete(completion):
+            try:
+                with self.lock:
+                    self.latencies.append(time.time() - start)
+                    if completion.get_return_value() < 0:
+                        self.errors += 1
+                if release:
+                    release()
+            finally:
+                self.slots.release()
+
+        try:
+            aio_fn(*args, oncomplete=oncomplete, **kwargs)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def wait(self):
+        """Block until all the operations in flight are completed."""
+        for _ in range(self.size):
+            self.slots.acquire()
+        for _ in range(self.size):
+            self.slots.release()
+
+
+def summary(latencies, errors, elapsed):
+    """Returns the throughput and the latency percentiles of the operations."""
+    latencies = sorted(latencies)
+    ops = len(latencies)
+
+    def percentile(p):
+        return latencies[min(ops - 1, int(ops * p))] * 1000 if ops else 0
+
+    return {
+        "ops": ops,
+        "errors": errors,
+        "elapsed": elapsed,
+        "ops_per_sec": ops / elapsed if elapsed else 0,
+        "p50_ms": percentile(0.5),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1] * 1000 if ops else 0,
+    }
@@ -0,0 +1,197 @@
+"""
+Module used to write or read many objects of a pool from a single process.
+
+Objects are written or read using the asynchronous librados calls with a
+bounded number of operations in flight, instead of launching one `rados`
+process per object. The result is printed as a single JSON document holding
+the md5 checksum of every object along with the throughput statistics.
+
+The manifest is a JSON list of objects, either names or [name, offset] pairs.
+Written objects hold the static data used by PoolFunctions.prepare_static_data,
+"hello world" repeated 4 times and padded with zeros up to the given size.
+
+The script exits with UNAVAILABLE when librados cannot be used on the node,
+i.e. the python bindings are missing or the cluster connection fails, for the
+caller to fall back to the rados CLI. Any other failure is an IO failure.
+"""
+
+# !/usr/bin/env python
+from __future__ import print_function
+
+import hashlib
+import json
+import threading
+import time
+
+from docopt import docopt
+
+try:
+    from rados import Rados
+except ImportError:
+    Rados = None
+
+doc = """
+Usage:
+  rados_bulk_io.py put --pool <pool_name> --manifest <file> --size <bytes> [--concurrency <num>]
+  rados_bulk_io.py get --pool <pool_name> [--manifest <file>] [--count <num>] [--concurrency <num>]
+
+Options:
+  --pool <name>           Name of the pool holding the objects
+  --manifest <file>       JSON list of object names or [name, offset] pairs,
+                          all the objects of the pool are read when omitted
+  --size <bytes>          Size of the data written to each object
+  --count <num>           Maximum number of objects to be read
+  --concurrency <num>     Number of operations in flight [default: 16]
+
+"""
+
+STATIC_DATA = b"hello world" * 4
+UNAVAILABLE = 2
+
+
+class BulkIO(object):
+    """Bounded window of asynchronous librados operations."""
+
+    def __init__(self, ioctx, concurrency):
+        self.ioctx = ioctx
+        self.concurrency = concurrency
+        self.window = threading.Semaphore(concurrency)
+        self.lock = threading.Lock()
+        self.checksums = dict()
+        self.errors = dict()
+        self.bytes = 0
+
+    def _done(self, name, completion, data=None, md5=None):
+        try:
+            ret = completion.get_return_value()
+            with self.lock:
+                if ret < 0:
+                    self.errors[name] = ret
+                else:
+                    if data is not None:
+                        md5 = hashlib.md5(data).hexdigest()
+                        self.bytes += len(data)
+                    self.checksums[name] = md5
+        finally:
+            self.window.release()
+
+    def put(self, name, data, offset, md5):
+        self.window.acquire()
+
+        def oncomplete(completion):
+            self._done(name, completion, md5=md5)
+
+        if offset:
+            self.ioctx.aio_write(name, data, offset, oncomplete=oncomplete)
+        else:
+            self.ioctx.aio_write_full(name, data, oncomplete=oncomplete)
+        with self.lock:
+            self.bytes += len(data)
+
+    def _failed(self, name, err):
+        with self.lock:
+            self.errors[name] = str(err)
+        self.window.release()
+
+    def get(self, name):
+        """Reads the object, the read is chained to the completion of its stat."""
+        self.window.acquire()
+
+        def onread(completion, data):
+            self._done(name, completion, data=data or b"")
+
+        def onstat(completion, size, mtime):
+            if completion.get_return_value() < 0:
+                self._done(name, completion)
+                return
+            try:
+                self.ioctx.aio_read(name, size, 0, onread)
+            except Exception as err:
+                self._failed(name, err)
+
+        try:
+            self.ioctx.aio_stat(name, onstat)
+        except Exception as err:
+            self._failed(name, err)
+
+    def wait(self):
+        """Blocks until all the operations in flight are completed."""
+        self.ioctx.aio_flush()
+        for _ in range(self.concurrency):
+            self.window.acquire()
+        for _ in range(self.concurrency):
+            self.window.release()
+
+
+def load_manifest(path):
+    with open(path) as manifest:
+        objects = json.load(manifest)
+
+    return [obj if isinstance(obj, list) else [obj, 0] for obj in objects]
+
+
+def run(args):
+    pool = args["--pool"]
+    concurrency = int(args["--concurrency"])
+    start = time.time()
+
+    if Rados is None:
+        print("librados python bindings are not available")
+        return UNAVAILABLE
+
+    cluster = Rados(conffile="")
+    try:
+        cluster.connect()
+    except Exception as err:
+        print(f"Could not connect to the cluster with librados: {err}")
+        return UNAVAILABLE
+
+    try:
+        with cluster.open_ioctx(pool) as ioctx:
+            bulk = BulkIO(ioctx, concurrency)
+            if args["put"]:
+                size = int(args["--size"])
+                data = STATIC_DATA[:size].ljust(size, b"\0")
+                md5 = hashlib.md5(data).hexdigest()
+                for name, offset in load_manifest(args["--manifest"]):
+                    bulk.put(name, data, int(offset), md5)
+            else:
+                if args["--manifest"]:
+                    names = [name for name, _ in load_manifest(args["--manifest"])]
+                else:
+                    names = [obj.key for obj in ioctx.list_objects()]
+                if args["--count"]:
+                    names = names[: int(args["--count"])]
+                for name in names:
+                    bulk.get(name)
+            bulk.wait()
+    finally:
+        cluster.shutdown()
+
+    elapsed = max(time.time() - start, 1e-6)
+    ops = len(bulk.checksums) + len(bulk.errors)
+    print(
+        json.dumps(
+            {
+                "op": "put" if args["put"] else "get",
+                "objects": bulk.checksums,
+                "errors": bulk.errors,
+                "bytes": bulk.bytes,
+                "elapsed": elapsed,
+                "ops_per_sec": ops / elapsed,
+                "mb_per_sec": bulk.bytes / elapsed / (1024 * 1024),
+            }
+        )
+    )
+    return 1 if bulk.errors else 0
+
+
+if __name__ == "__main__":
+    args = docopt(doc)
+    try:
+        exit(run(args))
+    except Exception as err:
+        print(
+            f"Exception hit while performing bulk IO on the given pool.\n error : {err} "
+        )
+        exit(1)
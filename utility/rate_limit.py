@@ -0,0 +1,54 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket rate limiter.
+
+    Tokens are added at `rate` per second up to `capacity`. Every call to
+    acquire consumes tokens and blocks until enough of them are available,
+    which allows short bursts while bounding the sustained request rate.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        Args:
+            rate: number of tokens added per second
+            capacity: maximum number of tokens, i.e. the allowed burst
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """
+        Consume the given number of tokens, waiting until they are available.
+
+        Args:
+            tokens: number of tokens to consume
+
+        Returns:
+            time spent waiting in seconds
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+
+                delay = (tokens - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
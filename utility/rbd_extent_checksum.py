@@ -0,0 +1,145 @@
+"""
+Module used to checksum an RBD image in fixed size extents from librbd.
+
+Only the extents holding allocated data, as reported by `rbd diff`, are read.
+The extents are read using the asynchronous librbd calls with a bounded number
+of reads in flight, instead of exporting the whole image to a file. The result
+is printed as a single JSON document holding the md5 checksum of every extent
+along with the throughput statistics.
+
+Extents which are not allocated or only hold zeros are left out of the result,
+so that images having the same data but a different allocation, like a sparse
+secondary of a thick provisioned primary, have the same checksums.
+"""
+
+# !/usr/bin/env python
+from __future__ import print_function
+
+import hashlib
+import json
+import threading
+import time
+
+import rbd
+from docopt import docopt
+from rados import Rados
+
+doc = """
+Usage:
+  rbd_extent_checksum.py --image <image_spec> [options]
+
+Options:
+  --image <image_spec>    Image specification, pool[/namespace]/image
+  --snap <name>           Snapshot of the image to be read
+  --extent-size <bytes>   Size of the checksummed extents [default: 4194304]
+  --concurrency <num>     Number of reads in flight [default: 16]
+  --cluster <name>        Name of the cluster [default: ceph]
+
+"""
+
+
+class ExtentReader(object):
+    """Bounded window of asynchronous librbd reads."""
+
+    def __init__(self, image, extent_size, concurrency):
+        self.image = image
+        self.concurrency = concurrency
+        self.window = threading.Semaphore(concurrency)
+        self.lock = threading.Lock()
+        self.zeros = bytes(extent_size)
+        self.checksums = dict()
+        self.errors = dict()
+        self.bytes = 0
+
+    def _done(self, offset, completion, data):
+        try:
+            ret = completion.get_return_value()
+            with self.lock:
+                if ret < 0:
+                    self.errors[offset] = ret
+                    return
+                data = data or b""
+                self.bytes += len(data)
+                if data != self.zeros[: len(data)]:
+                    self.checksums[offset] = hashlib.md5(data).hexdigest()
+        finally:
+            self.window.release()
+
+    def read(self, offset, length):
+        self.window.acquire()
+        self.image.aio_read(offset, length, lambda c, data: self._done(offset, c, data))
+
+    def wait(self):
+        """Blocks until all the reads in flight are completed."""
+        for _ in range(self.concurrency):
+            self.window.acquire()
+        for _ in range(self.concurrency):
+            self.window.release()
+
+
+def allocated_extents(image, size, extent_size):
+    """Returns the offsets of the extents overlapping the allocated data."""
+    extents = set()
+
+    def _diff(offset, length, exists):
+        if exists:
+            first = offset // extent_size
+            last = (offset + length - 1) // extent_size
+            extents.update(range(first, last + 1))
+        return 0
+
+    image.diff_iterate(0, size, None, _diff)
+    return sorted(index * extent_size for index in extents)
+
+
+def open_image(ioctx, spec, snap):
+    """Opens the image of the pool[/namespace]/image spec as read only."""
+    parts = spec.split("/")
+    if len(parts) == 3:
+        ioctx.set_namespace(parts[1])
+    return rbd.Image(ioctx, parts[-1], snapshot=snap, read_only=True)
+
+
+def run(args):
+    spec = args["--image"]
+    extent_size = int(args["--extent-size"])
+    concurrency = int(args["--concurrency"])
+    start = time.time()
+
+    conffile = f"/etc/ceph/{args['--cluster']}.conf"
+    with Rados(conffile=conffile, clustername=args["--cluster"]) as cluster:
+        with cluster.open_ioctx(spec.split("/")[0]) as ioctx:
+            with open_image(ioctx, spec, args["--snap"]) as image:
+                size = image.size()
+                extents = allocated_extents(image, size, extent_size)
+                reader = ExtentReader(image, extent_size, concurrency)
+                for offset in extents:
+                    reader.read(offset, min(extent_size, size - offset))
+                reader.wait()
+
+    elapsed = max(time.time() - start, 1e-6)
+    print(
+        json.dumps(
+            {
+                "image": spec,
+                "size": size,
+                "extent_size": extent_size,
+                "allocated_extents": len(extents),
+                "extents": {str(k): v for k, v in sorted(reader.checksums.items())},
+                "errors": {str(k): v for k, v in reader.errors.items()},
+                "bytes": reader.bytes,
+                "elapsed": elapsed,
+                "mb_per_sec": reader.bytes / elapsed / (1024 * 1024),
+            }
+        )
+    )
+    return 1 if reader.errors else 0
+
+
+if __name__ == "__main__":
+    args = docopt(doc)
+    try:
+        exit(run(args))
+    except Exception as err:
+        print(f"Exception hit while checksumming the given image.\n error : {err} ")
+        exit(1)
@@ -89,7 +89,14 @@ from functools import partial
 import xmltodict
 from docopt import docopt
 from rp_utils.preproc import PreProcClient
-from rp_utils.reportportalV1 import Launch, Launches, ReportPortalV1, RpLog
+from rp_utils.reportportalV1 import (
+    LOG_UPLOAD_WORKERS,
+    Launch,
+    Launches,
+    ReportPortalV1,
+    RpLog,
+    RpLogBatch,
+)
 from rp_utils.xunit_xml import TestCase, TestSuite, XunitXML
 from utils import create_run_dir, generate_unique_id, tfacon
 
@@ -238,16 +245,33 @@ def upload_logs(config_file, payload_dir):
         )
         return 1
     return_obj = {}
-    with ThreadPoolExecutor() as executor:
+    workers = rportal.config.get("upload_workers", LOG_UPLOAD_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
         log.info("Processing xunit files concurrently")
-        log.info(dir(rportal.service))
         launch = Launch(rportal)
-        log.info(dir(preproc))
         launch.start()
         log.info(result_file_list)
-        list(
-            executor.map(partial(process_xml_file, preproc, rportal), result_file_list)
+        rplog = RpLogBatch(rportal)
+        xunit_xmls = list(
+            executor.map(partial(parse_xml_file, preproc, rportal), result_file_list)
         )
+
+        # Test suites of all the xunit files are uploaded concurrently
+        log.info("Processing test suites concurrently")
+        suites = [
+            (xunit_xml, testsuite)
+            for xunit_xml in xunit_xmls
+            for testsuite in get_testsuites(xunit_xml)
+        ]
+        for future in [
+            executor.submit(process_testsuite, xunit_xml, testsuite, rplog)
+            for xunit_xml, testsuite in suites
+        ]:
+            future.result()
+
+        failed = rplog.close()
+        if failed:
+            log.error("%s log messages failed to upload", failed)
         launch.finish()
     return_obj["launches"] = rportal.launches.list
     log.info("RETURN OBJECT: %s", return_obj)
@@ -257,7 +281,7 @@ def upload_logs(config_file, payload_dir):
     return return_obj
 
 
-def process_xml_file(preproc, rportal, fqpath):
+def parse_xml_file(preproc, rportal, fqpath):
     with open(fqpath) as xmlfd:
         log.info("Processing fqpath %s", fqpath)
         filename = os.path.basename(fqpath)
@@ -266,18 +290,18 @@ def process_xml_file(preproc, rportal, fqpath):
 
         log.info("Parsing XML...")
         xml_data = xmltodict.parse(xmlfd.read())
-        xunit_xml = XunitXML(
+        return XunitXML(
             rportal, name=filename_base, configs=preproc._configs, xml_data=xml_data
         )
-        process(xunit_xml, rportal)
 
 
-def process(xmlObj, rportal):
-    """Process xUnit XML data"""
-    # override env var with config provided vars
-    rp_host_url = os.environ.get("RP_HOST_URL", None)
-    log.info("rp_host_url: %s", rp_host_url)
+def process_xml_file(preproc, rportal, fqpath):
+    xunit_xml = parse_xml_file(preproc, rportal, fqpath)
+    process(xunit_xml, rportal)
 
+
+def get_testsuites(xmlObj):
+    """Get the test suites of the xUnit XML data"""
     # check for multiple testsuites in xUnit
     if xmlObj.xml_data.get("testsuites"):
         # get test suites list
@@ -289,37 +313,60 @@ def process(xmlObj, rportal):
         )
     else:
         testsuites = [xmlObj.xml_data.get("testsuite")]
-    rplog = RpLog(rportal)
+
+    return testsuites
+
+
+def process(xmlObj, rportal):
+    """Process xUnit XML data"""
+    # override env var with config provided vars
+    rp_host_url = os.environ.get("RP_HOST_URL", None)
+    log.info("rp_host_url: %s", rp_host_url)
+
+    testsuites = get_testsuites(xmlObj)
+    rplog = RpLogBatch(rportal)
     # create testsuite(s)
     log.info("Processing %s testsuite(s)", len(testsuites))
     for testsuite in testsuites:
-        testcases = testsuite.get("testcase")
-        if not testcases:
-            log.info(
-                "Found empty test suite Name: %s. Skipping this test suite"
-                % testsuite.get("@name")
-            )
-            continue
-        elif not isinstance(testcases, list):
-            testcases = [testcases]
-
-        tsuite = TestSuite(xmlObj.rportal, xmlObj.name, testsuite)
-        tsuite.start()
-
-        # create all testcases
-        log.info("Starting testcases")
-        for testcase in testcases:
-            process_testcase(xmlObj, testcase, tsuite)
-        log.info("\nFinished testcases")
-        fqpath = os.path.join(xmlObj._configs.payload_dir, "attachments")
-        if os.path.exists(f"{fqpath}/{tsuite.xml_name}/{tsuite.xml_name}.tar.gz"):
-            rplog.add_attachment(
-                tsuite.item_id, f"{fqpath}/{tsuite.xml_name}/{tsuite.xml_name}.tar.gz"
-            )
-        tsuite.finish()
+        process_testsuite(xmlObj, testsuite, rplog)
+    rplog.close()
+
 
+def process_testsuite(xmlObj, testsuite, rplog):
+    """Upload a test suite along with its test cases
 
-def process_testcase(xunit_xml, testcase, tsuite):
+    Args:
+        xmlObj (XunitXML): xUnit XML data holding the test suite
+        testsuite (dict): test suite to be uploaded
+        rplog (RpLogBatch): batch uploading the error logs of the test cases
+    """
+    testcases = testsuite.get("testcase")
+    if not testcases:
+        log.info(
+            "Found empty test suite Name: %s. Skipping this test suite"
+            % testsuite.get("@name")
+        )
+        return
+    elif not isinstance(testcases, list):
+        testcases = [testcases]
+
+    tsuite = TestSuite(xmlObj.rportal, xmlObj.name, testsuite)
+    tsuite.start()
+
+    # create all testcases
+    log.info("Starting testcases")
+    for testcase in testcases:
+        process_testcase(xmlObj, testcase, tsuite, rplog)
+    log.info("\nFinished testcases")
+    fqpath = os.path.join(xmlObj._configs.payload_dir, "attachments")
+    if os.path.exists(f"{fqpath}/{tsuite.xml_name}/{tsuite.xml_name}.tar.gz"):
+        RpLog(xmlObj.rportal).add_attachment(
+            tsuite.item_id, f"{fqpath}/{tsuite.xml_name}/{tsuite.xml_name}.tar.gz"
+        )
+    tsuite.finish()
+
+
+def process_testcase(xunit_xml, testcase, tsuite, rplog=None):
     # Skip testcases which has empty name
     if testcase.get("@name") == "" or not testcase.get("@name"):
         log.info("Skipping testcase because name is empty: %s", testcase)
@@ -340,14 +387,11 @@ def process_testcase(xunit_xml, testcase, tsuite):
         with open(
             f"{fqpath}/{tsuite.xml_name}/{tcase.tc_name.replace(' ', '_')}_0.err", "r"
         ) as file:
-            log_entries = list(generate_log_events(file))
-            for i in log_entries:
-                timestamp = int(
-                    datetime.datetime.strptime(
-                        i["date"], "%Y-%m-%d %H:%M:%S,%f"
-                    ).strftime("%s")
-                )
-                tcase.rplog.add_message(
+            for i in generate_log_events(file):
+                timestamp = datetime.datetime.strptime(
+                    i["date"], "%Y-%m-%d %H:%M:%S,%f"
+                ).timestamp()
+                (rplog or tcase.rplog).add_message(
                     message=i["text"],
                     level="ERROR",
                     test_item_id=tcase.test_item_id,
@@ -357,6 +401,7 @@ def process_testcase(xunit_xml, testcase, tsuite):
 
 
 def generate_log_events(file_handler):
+    """Yield each log event of the file once, along with its continuation lines"""
     log_events = {}
     for line in file_handler:
         try:
@@ -372,6 +417,7 @@ def generate_log_events(file_handler):
                 log_events["text"] += line
         except Exception:
             log.error(f"Unable to parse the below Line : {line}")
+    if log_events:
         yield log_events
 
 
@@ -3,18 +3,35 @@ import logging
 import os
 import posixpath
 import re
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
 from mimetypes import guess_type
 from zipfile import ZipFile
 
 import requests
 import urllib3
 from reportportal_client import ReportPortalService
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 log = logging.getLogger(__name__)
 
+# Number of log messages sent in a single request
+LOG_BATCH_SIZE = 50
+
+# Maximum size of the messages sent in a single request
+LOG_BATCH_PAYLOAD = 8 * 1024 * 1024
+
+# Number of requests uploading the log messages at the same time
+LOG_UPLOAD_WORKERS = 8
+
+# Retries of a failed request, waiting backoff * 2 ^ (retry - 1) seconds in between
+API_RETRIES = 5
+API_RETRY_BACKOFF = 2
+
 
 class ReportPortalV1:
     """ReportPortal class to assist with RP API calls"""
@@ -41,6 +58,9 @@ class ReportPortalV1:
         self._project = project
         self._merge_launches = merge_launches
         self._launches = Launches(self)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.launch_uuid = None
 
     @property
     def rpuid(self):
@@ -106,6 +126,34 @@ class ReportPortalV1:
 
         return self._service
 
+    @property
+    def session(self):
+        """Get the HTTP session shared by the bulk API calls
+
+        The connections are pooled and the requests failing with a connection
+        error or a transient server error are retried with an exponential backoff.
+        """
+        with self._session_lock:
+            if self._session is None:
+                workers = self.config.get("upload_workers", LOG_UPLOAD_WORKERS)
+                retry = Retry(
+                    total=API_RETRIES,
+                    backoff_factor=API_RETRY_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=None,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=workers, max_retries=retry
+                )
+                session = requests.Session()
+                session.headers["Authorization"] = "bearer {0}".format(self.api_token)
+                session.verify = False
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+
+        return self._session
+
     @property
     def launches(self):
         """launch list attr getter"""
@@ -408,6 +456,7 @@ class Launch:
             description=self.description,
         )
         log.debug("Started launch with uuid %s ", self._launch_uuid)
+        self._rportal.launch_uuid = self._launch_uuid
 
         return self._launch_uuid
 
@@ -529,3 +578,102 @@ class RpLog:
             message += msg_txt[-10000:]
             return message
         return msg_txt
+
+
+class RpLogBatch:
+    """Upload log messages to ReportPortal in batches.
+
+    Messages are deduplicated and grouped into multi-message requests sent
+    concurrently over the pooled session of the ReportPortal instance, instead
+    of one request per message. `flush` has to be called once all the messages
+    are added.
+    """
+
+    def __init__(self, rportal, batch_size=None, workers=None):
+        """Create a log batch
+
+        Args:
+            rportal (obj): A ReportPortal class instance
+            batch_size (int): number of messages sent in a single request
+            workers (int): number of requests sent at the same time
+        """
+        self._rportal = rportal
+        self.batch_size = batch_size or rportal.config.get(
+            "log_batch_size", LOG_BATCH_SIZE
+        )
+        workers = workers or rportal.config.get("upload_workers", LOG_UPLOAD_WORKERS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rp-log"
+        )
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._entries = []
+        self._payload = 0
+        self._futures = []
+        self.failed = 0
+
+    def add_message(
+        self, message="N/A", level="INFO", msg_time=None, test_item_id=None
+    ):
+        """Queue a message, skipping the ones already logged for the item"""
+        if msg_time is None:
+            msg_time = str(int(time.time() * 1000))
+
+        key = (test_item_id, level, msg_time, message)
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen.add(key)
+
+            self._entries.append(
+                {
+                    "launchUuid": self._rportal.launch_uuid,
+                    "itemUuid": test_item_id,
+                    "time": msg_time,
+                    "message": message,
+                    "level": level,
+                }
+            )
+            self._payload += len(message)
+            if (
+                len(self._entries) >= self.batch_size
+                or self._payload >= LOG_BATCH_PAYLOAD
+            ):
+                self._submit()
+
+    def _submit(self):
+        entries, self._entries, self._payload = self._entries, [], 0
+        self._futures.append(self._executor.submit(self._post, entries))
+
+    def _post(self, entries):
+        url = posixpath.join(
+            self._rportal.endpoint, "api/v1/", self._rportal.project, "log"
+        )
+        files = [("json_request_part", (None, json.dumps(entries), "application/json"))]
+        try:
+            response = self._rportal.session.post(url, files=files)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            log.error("Failed to upload %s log messages: %s", len(entries), e)
+            with self._lock:
+                self.failed += len(entries)
+
+    def flush(self):
+        """Upload the queued messages and wait for all the requests
+
+        Returns:
+            number of messages which failed to upload
+        """
+        with self._lock:
+            if self._entries:
+                self._submit()
+            futures, self._futures = self._futures, []
+
+        wait(futures)
+        return self.failed
+
+    def close(self):
+        """Flush the queued messages and stop the upload workers"""
+        failed = self.flush()
+        self._executor.shutdown()
+        return failed
@@ -6,12 +6,15 @@ then upload all the collected logs to magna/directory(run_dir) provided
   Typical usage example:
 
   python sosreport.py --ip x.x.x.x --username abc --password abcd --directory /tmp/cephci-run-ysfyu
+  python sosreport.py --ip x.x.x.x --username abc --password abcd --directory /tmp/cephci-run-ysfyu \
+        --profile ceph --workers 16
   python sosreport.py -h
 """
 
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import paramiko
 from docopt import docopt
@@ -21,6 +24,7 @@ Standard script to collect all the logs from ceph cluster
 
     Usage:
         sosreport.py --ip <str> --username <str> --password <str> --directory <str>
+                     [--profile <name>] [--workers <num>]
         sosreport.py (-h | --help)
 
     Options:
@@ -29,11 +33,29 @@ Standard script to collect all the logs from ceph cluster
         --username <str>   Username to be used to access the system other than root
         --password <str>   password of given username
         --directory <str>  directory/folder
+        --profile <name>   sos plugins to be collected, full or ceph [default: full]
+        --workers <num>    Number of nodes generating reports at once [default: 8]
 """
 
+# Maximum number of nodes generating sosreports at the same time.
+SOSREPORT_WORKERS = 8
+
+# sos report options of the supported collection profiles, the ceph profile only
+# runs the plugins relevant to a ceph cluster and completes in a fraction of time.
+SOSREPORT_PROFILES = {
+    "full": "-a --all-logs",
+    "ceph": "--all-logs --only-plugins ceph_common,ceph_mon,ceph_mgr,ceph_osd,"
+    "ceph_mds,ceph_rgw,ceph_iscsi,ceph_ansible,podman,systemd,logs,block,networking",
+}
+
 
 def generate_sosreport_in_node(
-    nodeip: str, uname: str, pword: str, directory: str, results: list
+    nodeip: str,
+    uname: str,
+    pword: str,
+    directory: str,
+    results: list,
+    profile: str = "full",
 ) -> None:
     """Generate sosreport in the given node and copy report to directory provided
 
@@ -43,6 +65,7 @@ def generate_sosreport_in_node(
        pword               password for accessing host through given user
        directory           directory to store all the logs
        results             host IP address for which this operation are failed
+       profile             sos plugins to be collected, refer SOSREPORT_PROFILES
 
     Returns:
         None
@@ -52,9 +75,10 @@ def generate_sosreport_in_node(
         ssh_d = paramiko.SSHClient()
         ssh_d.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         ssh_d.connect(nodeip, username=uname, password=pword)
-        ssh_d.exec_command("sudo yum -y install sos")
+        _, stdout, _ = ssh_d.exec_command("sudo yum -y install sos")
+        stdout.channel.recv_exit_status()
         stdin, stdout, stderr = ssh_d.exec_command(
-            "sudo sos report -a --all-logs --batch"
+            f"sudo sos report {SOSREPORT_PROFILES[profile]} --batch"
         )
         rc = stdout.channel.recv_exit_status()
         sosreport = re.search(r"sosreport-.*.tar.xz", stdout.read().decode())
@@ -63,34 +87,47 @@ def generate_sosreport_in_node(
             results.append(nodeip)
             return
         source_file = f"/var/tmp/{sosreport.group()}"
-        ssh_d.exec_command(f"sudo chown {uname} {source_file}")
         directory_path = os.path.join(directory, "sosreports")
-        dir_exist = os.path.exists(directory_path)
-        if not dir_exist:
-            os.makedirs(directory_path)
+        _, stdout, _ = ssh_d.exec_command(f"sudo chown {uname} {source_file}")
+        stdout.channel.recv_exit_status()
+        os.makedirs(directory_path, exist_ok=True)
         ftp_client = ssh_d.open_sftp()
         ftp_client.get(f"{source_file}", f"{directory_path}/{sosreport.group()}")
         ftp_client.close()
         print(
             f"Successfully generated sosreport for node {nodeip} :{sosreport.group()}"
         )
-        ssh_d.exec_command(f"sudo rm -rf {source_file}")
+        _, stdout, _ = ssh_d.exec_command(f"sudo rm -rf {source_file}")
+        stdout.channel.recv_exit_status()
         ssh_d.close()
-    except Exception:
+    except Exception as e:
+        print(f"Failed to collect sosreport from {nodeip}: {e}")
         results.append(nodeip)
 
 
-def run(installer_ip: str, uname: str, pword: str, directory: str) -> int:
+def run(
+    installer_ip: str,
+    uname: str,
+    pword: str,
+    directory: str,
+    profile: str = "full",
+    workers: int = SOSREPORT_WORKERS,
+) -> int:
     """Standard script to collect all the logs from ceph cluster
 
     Through installer node get all other nodes in the cluster, generate sosreport for all the nodes obtained.
     then upload all the collected logs to given directory
 
+    The reports are generated on up to `workers` nodes at the same time and each
+    report is downloaded as soon as its node completes.
+
     Args:
        installer_ip   installer IP address
        uname          username to be used to access the system other than root
        pword          password for installer node
        directory      directory/folder name ex:
+       profile        sos plugins to be collected, refer SOSREPORT_PROFILES
+       workers        number of nodes generating reports at the same time
 
     Returns:
         0 on success or 1 for failures
@@ -111,10 +148,28 @@ def run(installer_ip: str, uname: str, pword: str, directory: str) -> int:
     )
     nodes = stdout.read().decode().split("\n")
 
+    ssh_install.close()
+    if profile not in SOSREPORT_PROFILES:
+        raise AssertionError(f"Unknown sosreport profile {profile}")
+
+    nodes = [nodeip for nodeip in nodes if nodeip]
     print(f"Host that are obtained from given host: {nodes}")
-    for nodeip in nodes:
-        if nodeip:
-            generate_sosreport_in_node(nodeip, uname, pword, directory, results)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(nodes)))) as executor:
+        futures = {
+            executor.submit(
+                generate_sosreport_in_node,
+                nodeip,
+                uname,
+                pword,
+                directory,
+                results,
+                profile,
+            ): nodeip
+            for nodeip in nodes
+        }
+        for future in as_completed(futures):
+            future.result()
+            print(f"Completed sosreport collection of {futures[future]}")
     print(f"\n\nFailed to collect logs from nodes :{results}")
     return 1 if results else 0
 
@@ -125,5 +180,7 @@ if __name__ == "__main__":
     username = arguments["--username"]
     password = arguments["--password"]
     directory = arguments["--directory"]
-    rc = run(installer_ip, username, password, directory)
+    profile = arguments["--profile"]
+    workers = int(arguments["--workers"])
+    rc = run(installer_ip, username, password, directory, profile, workers)
     sys.exit(rc)
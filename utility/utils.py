@@ -28,6 +28,7 @@ from jinja_markdown import MarkdownExtension
 from packaging.version import InvalidVersion, Version
 
 from cli.exceptions import ConfigError
+from utility.http_cache import MANIFEST_TTL, cached_get
 from utility.log import Log
 
 log = Log(__name__)
@@ -1287,6 +1288,9 @@ def write_to_file(data, abs_path):
         log.error(f"IO error hit during opening the file. Error : {err}")
 
 
+_cephci_config = dict()
+
+
 def get_cephci_config():
     """
     Receives the data from ~/.cephci.yaml.
@@ -1298,8 +1302,12 @@ def get_cephci_config():
     home_dir = os.path.expanduser("~")
     cfg_file = os.path.join(home_dir, ".cephci.yaml")
     try:
-        with open(cfg_file, "r") as yml:
-            cfg = yaml.safe_load(yml)
+        # the file is parsed again only once modified
+        stat = os.stat(cfg_file)
+        key = (cfg_file, stat.st_mtime_ns, stat.st_size)
+        if _cephci_config.get("key") != key:
+            with open(cfg_file, "r") as yml:
+                _cephci_config.update(key=key, cfg=yaml.safe_load(yml))
     except IOError:
         log.error(
             "Please create ~/.cephci.yaml from the cephci.yaml.template. "
@@ -1307,7 +1315,8 @@ def get_cephci_config():
         )
         raise
 
-    return cfg
+    # callers are free to modify their copy
+    return deepcopy(_cephci_config["cfg"])
 
 
 def get_run_status(results_list):
@@ -1552,7 +1561,7 @@ def get_build_details(product: str, release: str, build_type: str) -> dict[str,
 
         _url += f"{release}"
 
-        release_details = requests.get(_url, verify=False)
+        release_details = cached_get(_url, ttl=MANIFEST_TTL)
         build_details = yaml.safe_load(release_details.text)
 
         return build_details[build_type]